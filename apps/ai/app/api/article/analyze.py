@@ -2,12 +2,13 @@
 
 import structlog
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.models.article_schemas import ArticleAnalyzeRequest, ArticleAnalyzeResponse
-from app.services.article.article_analyzer import analyze_article
+from app.services.article.article_analyzer import analyze_article, analyze_article_stream
 from app.core.rate_limiter import limiter
 from app.core.exceptions import AIServiceError
+from app.core.streaming import stream_events
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -59,3 +60,29 @@ async def article_analyze(request: Request, body: ArticleAnalyzeRequest) -> Arti
             message=f"Article analysis failed: {str(e)}",
             status_code=500,
         )
+
+
+@router.post("/article/analyze/stream")
+@limiter.limit(get_article_limit)
+async def article_analyze_stream(request: Request, body: ArticleAnalyzeRequest) -> StreamingResponse:
+    """
+    Streaming variant of /article/analyze: one event per sentence/expression as it is
+    generated, then a "complete" event with the full result. NDJSON by default,
+    SSE when the client sends `Accept: text/event-stream`.
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+
+    logger.info(
+        "article_analyze_stream_start",
+        request_id=request_id,
+        text_length=len(body.text),
+        has_title=bool(body.title),
+        has_source=bool(body.source),
+    )
+
+    events = analyze_article_stream(
+        text=body.text,
+        title=body.title,
+        source=body.source,
+    )
+    return stream_events(request, events, error_message="Article analysis failed")
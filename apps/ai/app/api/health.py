@@ -1,12 +1,25 @@
 """Health check endpoint"""
 
-import httpx
+import asyncio
+
 import structlog
 from fastapi import APIRouter, Request
 
 from app import __version__
 from app.config import get_settings
 from app.models import HealthResponse, ServiceStatus
+from app.services.shared.clients import get_stt_http_client
+from app.services.shared.concurrency import get_llm_limiter
+from app.services.shared.llm_cache import get_llm_cache
+from app.services.shared.translation_memory import get_translation_memory
+from app.services.shared.llm_service import llm_singleflight
+from app.services.shared.stt.backends import parse_backend_urls, peek_stt_backend_pool
+from app.services.shared.stt.local_provider import peek_local_whisper_pool
+from app.services.shared.stt.result_cache import get_stt_result_cache
+from app.services.video.stt_jobs import peek_stt_job_runner
+from app.services.video.transcript_cache import get_video_transcript_cache
+from app.services.video.youtube_info_cache import get_youtube_info_cache
+from app.services.shared.retry_policy import get_token_budget
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -23,20 +36,25 @@ async def health_check(request: Request) -> HealthResponse:
     settings = get_settings()
 
     openai_ok = bool(settings.openai_api_key)
-    stt_api_ok = False
-
-    # Check STT API availability (server reachable = ok)
-    try:
-        async with httpx.AsyncClient(timeout=settings.timeout_health) as client:
-            response = await client.get(f"{settings.stt_api_url}/")
+    # Check STT API availability (any backend reachable = ok)
+    async def probe(url: str) -> bool:
+        try:
+            response = await get_stt_http_client().get(
+                f"{url}/",
+                timeout=settings.timeout_health,
+            )
             # Any response means server is reachable (even 404)
-            stt_api_ok = response.status_code < 500
-    except Exception as e:
-        logger.warning(
-            "stt_health_check_failed",
-            request_id=request_id,
-            error=str(e)
-        )
+            return response.status_code < 500
+        except Exception as e:
+            logger.warning(
+                "stt_health_check_failed",
+                request_id=request_id,
+                url=url,
+                error=str(e)
+            )
+            return False
+
+    stt_api_ok = any(await asyncio.gather(*(probe(url) for url in parse_backend_urls(settings.stt_api_url))))
 
     services = ServiceStatus(openai=openai_ok, stt_api=stt_api_ok)
 
@@ -56,3 +74,34 @@ async def health_check(request: Request) -> HealthResponse:
         version=__version__,
         services=services
     )
+
+
+@router.get("/health/stats")
+async def health_stats() -> dict:
+    """
+    Internal runtime counters (caches, limiters)
+
+    Not listed in PUBLIC_PATHS, so it requires the internal API key when configured.
+    """
+    llm_cache = get_llm_cache()
+    translation_memory = get_translation_memory()
+    stt_result_cache = get_stt_result_cache()
+    video_transcript_cache = get_video_transcript_cache()
+    youtube_info_cache = get_youtube_info_cache()
+    stt_backends = peek_stt_backend_pool()
+    local_stt = peek_local_whisper_pool()
+    stt_jobs = peek_stt_job_runner()
+
+    return {
+        "llm_cache": llm_cache.snapshot() if llm_cache else None,
+        "translation_memory": translation_memory.snapshot() if translation_memory else None,
+        "stt_result_cache": stt_result_cache.snapshot() if stt_result_cache else None,
+        "video_transcript_cache": video_transcript_cache.snapshot() if video_transcript_cache else None,
+        "youtube_info_cache": youtube_info_cache.snapshot() if youtube_info_cache else None,
+        "stt_backends": stt_backends.snapshot() if stt_backends else None,
+        "local_stt": local_stt.snapshot() if local_stt else None,
+        "stt_jobs": stt_jobs.snapshot() if stt_jobs else None,
+        "llm_singleflight": llm_singleflight.snapshot(),
+        "llm_limiter": get_llm_limiter().snapshot(),
+        "openai_token_budget": get_token_budget().snapshot(),
+    }
@@ -3,7 +3,7 @@
 from fastapi import APIRouter
 
 from . import health
-from .video import analyze, stt, translate
+from .video import analyze, stt, stt_jobs, translate
 from .study import analyze as study_analyze
 from .article import analyze as article_analyze
 from .article import parse_sentence as article_parse
@@ -16,6 +16,7 @@ router.include_router(health.router, tags=["health"])
 
 # STT endpoints (root level for backward compatibility)
 router.include_router(stt.router, tags=["stt"])
+router.include_router(stt_jobs.router, tags=["stt"])
 
 # API v1 endpoints
 router.include_router(analyze.router, prefix="/api/v1", tags=["analyze"])
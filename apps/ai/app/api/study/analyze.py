@@ -2,12 +2,13 @@
 
 import structlog
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.models.study_schemas import StudyAnalyzeRequest, StudyAnalyzeResponse
-from app.services.study.article_analyzer import analyze_article
+from app.services.study.article_analyzer import analyze_article, analyze_article_stream
 from app.core.rate_limiter import limiter
 from app.core.exceptions import AIServiceError
+from app.core.streaming import stream_events
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -59,3 +60,29 @@ async def study_analyze(request: Request, body: StudyAnalyzeRequest) -> StudyAna
             message=f"Article analysis failed: {str(e)}",
             status_code=500,
         )
+
+
+@router.post("/study/analyze/stream")
+@limiter.limit(get_study_limit)
+async def study_analyze_stream(request: Request, body: StudyAnalyzeRequest) -> StreamingResponse:
+    """
+    Streaming variant of /study/analyze: one event per sentence/expression as it is
+    generated, then a "complete" event with the full result. NDJSON by default,
+    SSE when the client sends `Accept: text/event-stream`.
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+
+    logger.info(
+        "study_analyze_stream_start",
+        request_id=request_id,
+        text_length=len(body.text),
+        target_language=body.target_language,
+        has_title=bool(body.title),
+    )
+
+    events = analyze_article_stream(
+        text=body.text,
+        target_language=body.target_language,
+        title=body.title,
+    )
+    return stream_events(request, events, error_message="Study analysis failed")
@@ -2,10 +2,12 @@
 
 import structlog
 from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 
 from app.models import AnalyzeRequest, AnalyzeResponse
 from app.services import LLMService
 from app.core.rate_limiter import limiter, get_analyze_limit
+from app.core.streaming import stream_events
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -54,3 +56,32 @@ async def analyze_video(request: Request, body: AnalyzeRequest) -> AnalyzeRespon
     )
 
     return AnalyzeResponse(success=True, data=result)
+
+
+@router.post("/analyze/stream")
+@limiter.limit(get_analyze_limit)
+async def analyze_video_stream(request: Request, body: AnalyzeRequest) -> StreamingResponse:
+    """
+    Streaming variant of /analyze
+
+    Emits keyword/highlight events as the model produces them and a final
+    "complete" event carrying the full analysis. NDJSON by default, SSE when
+    the client sends `Accept: text/event-stream`.
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+
+    logger.info(
+        "analyze_stream_start",
+        request_id=request_id,
+        title=body.metadata.title[:50],
+        has_transcript=bool(body.transcript),
+        segments_count=len(body.segments) if body.segments else 0
+    )
+
+    llm_service = LLMService()
+    events = llm_service.analyze_stream(
+        metadata=body.metadata,
+        transcript=body.transcript,
+        segments=body.segments
+    )
+    return stream_events(request, events, error_message="Video analysis failed")
@@ -1,12 +1,13 @@
 """STT proxy endpoint"""
 
 import structlog
-from fastapi import APIRouter, File, Form, UploadFile, Request
+from fastapi import APIRouter, Request
 
-from app.services import STTClient, YouTubeAudioDownloader
+from app.services import STTClient
+from app.services.video.video_stt import transcribe_youtube_video
 from app.models import STTResponse
 from app.core.rate_limiter import limiter, get_stt_limit
-from app.core.exceptions import AIServiceError, ErrorCode
+from app.core.uploads import read_audio_upload
 from app.config import get_settings
 
 logger = structlog.get_logger()
@@ -14,21 +15,39 @@ router = APIRouter()
 settings = get_settings()
 
 
-@router.post("/stt/transcribe", response_model=STTResponse)
+# The upload is parsed by read_audio_upload, so the body is documented by hand
+AUDIO_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["audio"],
+                    "properties": {
+                        "audio": {"type": "string", "format": "binary"},
+                        "language": {"type": "string", "default": "auto"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+@router.post("/stt/transcribe", response_model=STTResponse, openapi_extra=AUDIO_UPLOAD_OPENAPI)
 @limiter.limit(get_stt_limit)
-async def transcribe(
-    request: Request,
-    audio: UploadFile = File(...),
-    language: str = Form(default="auto")
-) -> STTResponse:
+async def transcribe(request: Request) -> STTResponse:
     """
     Transcribe audio using external STT API
 
     This is a proxy endpoint to the external WhisperX API.
     Returns flat response structure for compatibility.
 
-    Args:
-        request: FastAPI request object (for rate limiting)
+    The upload is never read into memory: it is spooled to disk while the
+    size limit is enforced, then streamed to the STT backend.
+
+    Form fields:
         audio: Audio file (webm, mp3, wav, m4a, ogg, flac)
         language: Language hint ("auto" for auto-detection)
 
@@ -42,23 +61,25 @@ async def transcribe(
     """
     request_id = getattr(request.state, "request_id", "unknown")
 
+    audio, fields = await read_audio_upload(
+        request, max_bytes=settings.max_file_size_mb * 1024 * 1024
+    )
+    language = fields.get("language") or "auto"
+
     logger.info(
         "stt_request_received",
         request_id=request_id,
         filename=audio.filename,
         content_type=audio.content_type,
+        size=audio.size,
         language=language
     )
 
-    audio_data = await audio.read()
-    stt_client = STTClient()
-
-    result = await stt_client.transcribe(
-        audio_data=audio_data,
-        filename=audio.filename or "audio.webm",
-        language=language,
-        content_type=audio.content_type
-    )
+    try:
+        stt_client = STTClient()
+        result = await stt_client.transcribe_source(audio, language=language)
+    finally:
+        audio.close()
 
     logger.info(
         "stt_request_complete",
@@ -72,19 +93,15 @@ async def transcribe(
 
 
 # Backward compatible endpoint
-@router.post("/whisperX/transcribe", response_model=STTResponse)
+@router.post("/whisperX/transcribe", response_model=STTResponse, openapi_extra=AUDIO_UPLOAD_OPENAPI)
 @limiter.limit(get_stt_limit)
-async def transcribe_legacy(
-    request: Request,
-    audio: UploadFile = File(...),
-    language: str = Form(default="auto")
-) -> STTResponse:
+async def transcribe_legacy(request: Request) -> STTResponse:
     """
     Legacy endpoint for backward compatibility
 
     Same as /stt/transcribe but with old path
     """
-    return await transcribe(request=request, audio=audio, language=language)
+    return await transcribe(request=request)
 
 
 @router.post("/stt/video/{video_id}", response_model=STTResponse)
@@ -124,55 +141,4 @@ async def transcribe_video(
         language=language
     )
 
-    # Download audio from YouTube
-    downloader = YouTubeAudioDownloader()
-    audio_data, duration = await downloader.download_audio(video_id)
-
-    if audio_data is None:
-        if duration and not downloader.is_within_limit(duration):
-            duration_minutes = duration / 60
-            max_minutes = downloader.max_duration_minutes
-            raise AIServiceError(
-                code=ErrorCode.AUDIO_TOO_LONG,
-                message=f"영상 길이({int(duration_minutes)}분)가 최대 허용 시간({max_minutes}분)을 초과했습니다. 더 짧은 영상을 시도해주세요!",
-                status_code=422,
-                details={
-                    "video_id": video_id,
-                    "duration_minutes": round(duration_minutes, 1),
-                    "max_duration_minutes": max_minutes
-                }
-            )
-        raise AIServiceError(
-            code=ErrorCode.STT_ERROR,
-            message=f"영상 오디오를 다운로드할 수 없습니다. 영상이 비공개이거나 접근이 제한되었을 수 있습니다.",
-            status_code=400,
-            details={"video_id": video_id}
-        )
-
-    logger.info(
-        "stt_video_audio_downloaded",
-        request_id=request_id,
-        video_id=video_id,
-        size_mb=round(len(audio_data) / 1024 / 1024, 2),
-        duration=duration
-    )
-
-    # Transcribe using STT
-    stt_client = STTClient()
-    result = await stt_client.transcribe(
-        audio_data=audio_data,
-        filename=f"{video_id}.m4a",
-        language=language,
-        content_type="audio/mp4"
-    )
-
-    logger.info(
-        "stt_video_request_complete",
-        request_id=request_id,
-        video_id=video_id,
-        text_length=len(result.text),
-        language=result.language,
-        segments_count=len(result.segments)
-    )
-
-    return result
+    return await transcribe_youtube_video(video_id, language, request_id=request_id)
@@ -0,0 +1,101 @@
+"""Asynchronous STT job endpoints"""
+
+import json
+
+import structlog
+from fastapi import APIRouter, Request
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode, ValidationError
+from app.core.rate_limiter import limiter, get_stt_limit
+from app.core.uploads import read_audio_upload
+from app.models import STTJobRequest, STTJobResponse
+from app.services.video.stt_jobs import STTJob, get_stt_job_runner
+from .stt import AUDIO_UPLOAD_OPENAPI
+
+logger = structlog.get_logger()
+router = APIRouter()
+settings = get_settings()
+
+
+# Either an upload (multipart) or a video id (JSON)
+STT_JOB_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            **AUDIO_UPLOAD_OPENAPI["requestBody"]["content"],
+            "application/json": {"schema": STTJobRequest.model_json_schema(by_alias=True)},
+        },
+    }
+}
+
+
+def _to_response(job: STTJob) -> STTJobResponse:
+    return STTJobResponse(
+        job_id=job.id,
+        status=job.status,
+        stage=job.stage,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+@router.post("/stt/jobs", response_model=STTJobResponse, status_code=202, openapi_extra=STT_JOB_OPENAPI)
+@limiter.limit(get_stt_limit)
+async def create_job(request: Request) -> STTJobResponse:
+    """
+    Queue a transcription and return its job id without waiting for it
+
+    multipart/form-data: `audio` file and optional `language`, as in
+    /stt/transcribe. application/json: {"videoId": "...", "language": "auto"}
+    to download and transcribe a YouTube video, as in /stt/video/{video_id}.
+
+    Poll GET /stt/jobs/{job_id} for progress and the result.
+
+    Raises:
+        ValidationError: If the file or body is invalid
+        STTError: 503 if the job queue is full
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+    runner = get_stt_job_runner()
+
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        audio, fields = await read_audio_upload(
+            request, max_bytes=settings.max_file_size_mb * 1024 * 1024
+        )
+        try:
+            job = await runner.submit_upload(audio, language=fields.get("language") or "auto")
+        finally:
+            audio.close()
+    else:
+        try:
+            body = json.loads(await request.body() or b"null")
+        except ValueError:
+            raise ValidationError(ErrorCode.INVALID_REQUEST, "요청 본문이 올바른 JSON이 아닙니다")
+        # A pydantic ValidationError is turned into a 400 by the exception handler
+        payload = STTJobRequest.model_validate(body)
+        job = await runner.submit_video(payload.video_id, language=payload.language)
+
+    logger.info("stt_job_created", request_id=request_id, job_id=job.id, kind=job.kind)
+    return _to_response(job)
+
+
+@router.get("/stt/jobs/{job_id}", response_model=STTJobResponse)
+async def get_job(job_id: str) -> STTJobResponse:
+    """
+    Status of a job; `result` is set once it succeeded, `error` once it failed
+
+    Raises:
+        AIServiceError: 404 if there is no such job (or it has expired)
+    """
+    job = await get_stt_job_runner().get(job_id)
+    if job is None:
+        raise AIServiceError(
+            code=ErrorCode.JOB_NOT_FOUND,
+            message="STT 작업을 찾을 수 없습니다",
+            status_code=404,
+            details={"job_id": job_id},
+        )
+    return _to_response(job)
@@ -2,7 +2,10 @@
 
 import time
 import logging
+from typing import AsyncIterator
+
 from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 
 from app.models.video_schemas import (
     TranslateRequest,
@@ -11,7 +14,13 @@ from app.models.video_schemas import (
     TranslationMeta,
     TranslatedSegment,
 )
-from app.services.shared.translation import translate_segments
+from app.services.shared.translation import (
+    TranslationStats,
+    iter_translation_events,
+    translate_segments,
+    translate_segments_multi,
+)
+from app.core.streaming import stream_events
 from app.core.rate_limiter import limiter
 from app.core.exceptions import AIServiceError, ErrorCode
 from app.config import get_settings
@@ -22,6 +31,106 @@ router = APIRouter()
 settings = get_settings()
 
 
+def _check_total_length(body: TranslateRequest) -> None:
+    # 총 텍스트 길이 체크
+    total_text_length = sum(len(seg.text) for seg in body.segments)
+    max_transcript_length = settings.max_transcript_length
+
+    if total_text_length > max_transcript_length:
+        raise AIServiceError(
+            code=ErrorCode.TRANSCRIPT_TOO_LONG,
+            message=f"자막 텍스트가 너무 많아요! AI가 읽기 힘들어해요. (현재: {total_text_length:,}자, 최대: {max_transcript_length:,}자)",
+            status_code=400,
+            details={
+                "total_text_length": total_text_length,
+                "max_transcript_length": max_transcript_length,
+            }
+        )
+
+
+def _build_meta(translated_count: int, processing_time: float, stats: TranslationStats) -> TranslationMeta:
+    logger.info(
+        "Translation completed",
+        extra={
+            "translated_count": translated_count,
+            "processing_time": round(processing_time, 2),
+            "units": stats.units,
+            "merged": stats.merged,
+            "duplicates": stats.duplicates,
+            "memory_hits": stats.memory_hits,
+            "batch_plan": stats.batch_plan.summary() if stats.batch_plan else None,
+            "missing_ids": stats.missing_ids,
+            "duplicate_ids": stats.duplicate_ids,
+            "out_of_range_ids": stats.out_of_range_ids,
+            "retranslated": stats.retranslated,
+            "untranslated": stats.untranslated,
+        }
+    )
+    return TranslationMeta(
+        translatedCount=translated_count,
+        processingTime=round(processing_time, 3),
+        unitCount=stats.units,
+        mergedCount=stats.merged,
+        duplicateCount=stats.duplicates,
+        memoryHits=stats.memory_hits,
+        memoryMisses=stats.memory_misses,
+        memoryHitRate=round(stats.memory_hit_rate, 4),
+        batchCount=len(stats.batch_plan) if stats.batch_plan else 0,
+        untranslatedCount=stats.untranslated,
+        retranslatedCount=stats.retranslated,
+    )
+
+
+def _to_response_segments(translated: list[dict]) -> list[TranslatedSegment]:
+    return [
+        TranslatedSegment(
+            start=seg["start"],
+            end=seg["end"],
+            originalText=seg["original_text"],
+            translatedText=seg["translated_text"],
+        )
+        for seg in translated
+    ]
+
+
+async def _translate_multi(body: TranslateRequest, segments: list[dict], start_time: float) -> TranslateResponse:
+    """targetLanguages: all languages through one shared pipeline"""
+    stats: dict[str, TranslationStats] = {}
+    translated = await translate_segments_multi(
+        segments=segments,
+        source_language=body.source_language,
+        target_languages=body.target_languages,
+        stats=stats,
+        wire_format=body.wire_format,
+        merge_fragments=body.merge_fragments,
+    )
+
+    processing_time = time.time() - start_time
+    translations = {
+        language: _to_response_segments(items)
+        for language, items in translated.items()
+    }
+    meta = _build_meta(
+        len(segments),
+        processing_time,
+        TranslationStats.combine([stats[language] for language in body.target_languages]),
+    )
+    meta.target_languages = body.target_languages
+    meta.per_language = {
+        language: _build_meta(len(segments), processing_time, stats[language])
+        for language in body.target_languages
+    }
+
+    return TranslateResponse(
+        success=True,
+        data=TranslationData(
+            segments=translations[body.target_languages[0]],
+            translations=translations,
+        ),
+        meta=meta,
+    )
+
+
 @router.post("/translate", response_model=TranslateResponse)
 @limiter.limit("30/minute")
 async def translate(
@@ -31,9 +140,14 @@ async def translate(
     """
     Translate segments from source language to target language.
 
+    - targetLanguages: every language shares one pre-pass and batch budget;
+      data.translations holds each language's segments
+    - Repeated texts are translated once; with mergeFragments, fragments
+      are translated as sentences and split back over their timings
     - Batch processing with context preservation
     - Concurrent batch execution for performance
-    - Falls back to original text on error
+    - Ids the model drops are re-requested once; segments that still fail
+      keep their original text and are counted in meta.untranslatedCount
     """
     start_time = time.time()
 
@@ -43,23 +157,12 @@ async def translate(
             "segments_count": len(body.segments),
             "source_language": body.source_language,
             "target_language": body.target_language,
+            "wire_format": body.wire_format,
+            "merge_fragments": body.merge_fragments,
         }
     )
 
-    # 총 텍스트 길이 체크
-    total_text_length = sum(len(seg.text) for seg in body.segments)
-    max_transcript_length = settings.max_transcript_length
-
-    if total_text_length > max_transcript_length:
-        raise AIServiceError(
-            code=ErrorCode.TRANSCRIPT_TOO_LONG,
-            message=f"자막 텍스트가 너무 많아요! AI가 읽기 힘들어해요. (현재: {total_text_length:,}자, 최대: {max_transcript_length:,}자)",
-            status_code=400,
-            details={
-                "total_text_length": total_text_length,
-                "max_transcript_length": max_transcript_length,
-            }
-        )
+    _check_total_length(body)
 
     try:
         # Convert request segments to translation format
@@ -68,41 +171,29 @@ async def translate(
             for seg in body.segments
         ]
 
+        if body.target_languages:
+            return await _translate_multi(body, segments, start_time)
+
         # Perform translation
+        stats = TranslationStats()
         translated = await translate_segments(
             segments=segments,
             source_language=body.source_language,
             target_language=body.target_language,
+            stats=stats,
+            wire_format=body.wire_format,
+            merge_fragments=body.merge_fragments,
         )
 
         processing_time = time.time() - start_time
 
         # Build response
-        translated_segments = [
-            TranslatedSegment(
-                start=seg["start"],
-                end=seg["end"],
-                originalText=seg["original_text"],
-                translatedText=seg["translated_text"],
-            )
-            for seg in translated
-        ]
-
-        logger.info(
-            "Translation completed",
-            extra={
-                "translated_count": len(translated_segments),
-                "processing_time": round(processing_time, 2),
-            }
-        )
+        translated_segments = _to_response_segments(translated)
 
         return TranslateResponse(
             success=True,
             data=TranslationData(segments=translated_segments),
-            meta=TranslationMeta(
-                translatedCount=len(translated_segments),
-                processingTime=round(processing_time, 3),
-            ),
+            meta=_build_meta(len(translated_segments), processing_time, stats),
         )
 
     except Exception as e:
@@ -112,3 +203,79 @@ async def translate(
             message=f"번역 처리 중 오류가 발생했습니다: {str(e)}",
             status_code=500,
         )
+
+
+@router.post("/translate/stream")
+@limiter.limit("30/minute")
+async def translate_stream(
+    request: Request,
+    body: TranslateRequest,
+) -> StreamingResponse:
+    """
+    Streaming variant of /translate. NDJSON by default, SSE when the client
+    sends `Accept: text/event-stream`.
+
+    - "segment": {"index", "data": TranslatedSegment} in timeline order, as
+      soon as every earlier segment is translated
+    - "progress": {"data": {completedBatches, totalBatches, emittedSegments,
+      totalSegments}} after each batch
+    - "complete": {"meta": TranslationMeta} last
+    """
+    logger.info(
+        "Translation stream request",
+        extra={
+            "segments_count": len(body.segments),
+            "source_language": body.source_language,
+            "target_language": body.target_language,
+            "wire_format": body.wire_format,
+            "merge_fragments": body.merge_fragments,
+        }
+    )
+
+    # Validated before the response starts so it is still a regular 400
+    _check_total_length(body)
+    if body.target_languages:
+        raise AIServiceError(
+            code=ErrorCode.INVALID_REQUEST,
+            message="스트리밍 번역은 targetLanguage 하나만 지원합니다",
+            status_code=400,
+        )
+
+    async def events() -> AsyncIterator[dict]:
+        start_time = time.time()
+        stats = TranslationStats()
+        translated_count = 0
+
+        async for event in iter_translation_events(
+            segments=[
+                {"start": seg.start, "end": seg.end, "text": seg.text}
+                for seg in body.segments
+            ],
+            source_language=body.source_language,
+            target_language=body.target_language,
+            stats=stats,
+            wire_format=body.wire_format,
+            merge_fragments=body.merge_fragments,
+        ):
+            if event["type"] == "segment":
+                translated_count += 1
+                yield {
+                    "type": "segment",
+                    "index": event["index"],
+                    "data": _to_response_segments([event["segment"]])[0].model_dump(by_alias=True),
+                }
+            else:
+                yield {
+                    "type": "progress",
+                    "data": {
+                        "completedBatches": event["completed_batches"],
+                        "totalBatches": event["total_batches"],
+                        "emittedSegments": event["emitted_segments"],
+                        "totalSegments": event["total_segments"],
+                    },
+                }
+
+        meta = _build_meta(translated_count, time.time() - start_time, stats)
+        yield {"type": "complete", "meta": meta.model_dump(by_alias=True)}
+
+    return stream_events(request, events(), error_message="번역 처리 중 오류가 발생했습니다")
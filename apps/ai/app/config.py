@@ -16,7 +16,7 @@ class Settings(BaseSettings):
     internal_api_key: str = ""  # Empty = disabled (development mode)
 
     # External STT API
-    stt_api_url: str = "http://work.soundmind.life:12321"
+    stt_api_url: str = "http://work.soundmind.life:12321"  # Comma-separated for several backends
     stt_max_duration_minutes: int = 120
 
     # File limits
@@ -25,11 +25,29 @@ class Settings(BaseSettings):
     # Rate Limiting
     rate_limit_analyze: int = 30  # requests per minute per IP
     rate_limit_stt: int = 10  # requests per minute per IP
-    max_concurrent_requests: int = 10
+    max_concurrent_requests: int = 10  # Initial process-wide OpenAI concurrency (adapts at runtime)
+    llm_concurrency_min: int = 2
+    llm_concurrency_max: int = 50
+    llm_latency_target: float = 20.0  # seconds; slower calls shrink the concurrency limit
+
+    # HTTP connection pools (process-wide, owned by the app lifespan)
+    openai_max_connections: int = 100
+    openai_max_keepalive_connections: int = 20
+    stt_max_connections: int = 20
+    stt_max_keepalive_connections: int = 5
+    http_keepalive_expiry: float = 30.0  # seconds an idle connection is kept
+
+    # STT backend load balancing (when STT_API_URL lists several backends)
+    stt_backend_max_failures: int = 3  # Consecutive failures before a backend is ejected
+    stt_backend_ejection_seconds: float = 30.0  # Doubled for each ejection in a row
+    stt_backend_max_ejection_seconds: float = 300.0
 
     # Retry settings
     retry_max_attempts: int = 3
     retry_base_delay: float = 1.0  # seconds
+    retry_max_delay: float = 30.0  # longest single wait honoured from Retry-After
+    retry_deadline: float = 60.0  # total seconds one LLM request may spend waiting and retrying
+    openai_tokens_per_minute: int = 0  # 0 = learn from x-ratelimit-limit-tokens headers
 
     # Timeouts (seconds)
     timeout_analyze: int = 30
@@ -41,13 +59,90 @@ class Settings(BaseSettings):
     llm_temperature_article: float = 0.3
     llm_temperature_parsing: float = 0.2
 
+    # LLM response cache (TTL in seconds, 0 disables caching for that feature)
+    llm_cache_enabled: bool = True
+    llm_cache_max_bytes: int = 64 * 1024 * 1024
+    llm_cache_sqlite_path: str = ""  # Empty = memory tier only
+    llm_cache_sqlite_max_entries: int = 50000
+    llm_cache_ttl_video: int = 6 * 3600
+    llm_cache_ttl_article: int = 7 * 24 * 3600
+    llm_cache_ttl_parsing: int = 7 * 24 * 3600
+    llm_cache_ttl_translation: int = 7 * 24 * 3600
+
     # Translation batch settings
-    translation_batch_size: int = 10
+    translation_batch_size: int = 40  # Max segments per batch
+    translation_batch_token_target: int = 1500  # Estimated prompt+completion tokens per batch, 0 = fixed-size batches
     translation_context_size: int = 2
     translation_concurrent_batches: int = 3
-
-    # STT provider
+    translation_fanout_concurrent_batches: int = 8  # Shared by all languages of a multi-target request
+    translation_max_target_languages: int = 8
+    translation_wire_format: str = "json"  # "json" or "compact" ("id|text" lines), per-request override
+    translation_merge_fragments: bool = False  # Join STT fragments into sentences before translating, per-request override
+    translation_merge_max_chars: int = 200
+    translation_merge_max_gap: float = 1.0  # Seconds of silence that always ends a merged sentence
+
+    # Translation memory (segment-level, shared across requests)
+    translation_memory_enabled: bool = True
+    translation_memory_max_bytes: int = 32 * 1024 * 1024
+    translation_memory_sqlite_path: str = ""  # Empty = memory tier only
+    translation_memory_sqlite_max_entries: int = 500000
+    translation_memory_ttl: int = 30 * 24 * 3600
+
+    # STT provider: "whisperx" (external API) or "local" (faster-whisper on CPU, optional dependency)
     stt_provider: str = "whisperx"
+    stt_local_model: str = "small"  # Model size or path to a converted CTranslate2 model
+    stt_local_compute_type: str = "int8"
+    stt_local_workers: int = 2  # Processes, each with its own copy of the model
+    stt_local_cpu_threads: int = 4  # Per worker; workers x threads should not exceed the cores
+    stt_local_queue_size: int = 8  # Jobs waiting beyond the running ones, then 503
+    stt_local_beam_size: int = 5
+    stt_local_model_dir: str = ""  # Download/cache directory, empty = Hugging Face default
+
+    # Chunked STT: long audio is split at silences and transcribed in parallel
+    stt_chunking_enabled: bool = False
+    stt_chunk_seconds: int = 600
+    stt_chunk_overlap_seconds: float = 2.0  # Added on both sides of a cut that found no silence
+    stt_chunk_search_seconds: float = 30.0  # How far before the target a silence may move the cut
+    stt_chunk_parallelism: int = 4
+
+    # Transcode to 16 kHz mono Opus before sending audio for STT (requires ffmpeg)
+    stt_transcode_enabled: bool = False
+    stt_transcode_bitrate_kbps: int = 24
+
+    # STT result cache (keyed by audio content hash, provider and language hint)
+    stt_cache_enabled: bool = True
+    stt_cache_max_bytes: int = 32 * 1024 * 1024
+    stt_cache_sqlite_path: str = ""  # Empty = memory tier only
+    stt_cache_sqlite_max_entries: int = 20000
+    stt_cache_ttl: int = 7 * 24 * 3600
+
+    # /stt/video transcripts per (video id, language), and short-lived download failures
+    stt_video_cache_enabled: bool = True
+    stt_video_cache_max_bytes: int = 32 * 1024 * 1024
+    stt_video_cache_sqlite_path: str = ""  # Empty = memory tier only
+    stt_video_cache_sqlite_max_entries: int = 20000
+    stt_video_cache_ttl: int = 7 * 24 * 3600
+    stt_video_failure_ttl: int = 10 * 60  # Private/removed/too-long videos fail fast for this long
+
+    # yt-dlp extraction results per video id (memory only; media URLs expire after a few hours)
+    youtube_info_cache_enabled: bool = True
+    youtube_info_cache_max_entries: int = 256
+    youtube_info_cache_ttl: int = 30 * 60
+
+    # Stream YouTube audio into the STT upload as it downloads (no temp file, bounded memory)
+    youtube_stream_enabled: bool = False
+    youtube_stream_range_bytes: int = 10 * 1024 * 1024  # Per HTTP range request, as yt-dlp does for YouTube
+    youtube_stream_buffer_bytes: int = 4 * 1024 * 1024  # Read-ahead held in memory
+
+    # Asynchronous STT jobs (POST /stt/jobs), kept in SQLite so they survive restarts
+    stt_job_db_path: str = "/tmp/wigvu/stt_jobs.db"
+    stt_job_files_dir: str = "/tmp/wigvu/stt_jobs"  # Uploaded files waiting for their job
+    stt_job_workers: int = 2  # Jobs running at once, per process
+    stt_job_queue_size: int = 100  # Queued jobs beyond this are rejected with 503
+    stt_job_max_attempts: int = 2  # Runs of a job whose worker died before it is failed
+    stt_job_ttl: int = 24 * 3600  # Finished jobs are deleted after this long
+    stt_job_lease_seconds: int = 60  # A job not renewed for this long is picked up again
+    stt_job_sweep_interval: int = 3600  # How often expired jobs are deleted while running
 
     # CORS
     cors_origins: str = ""  # Comma-separated origins, empty = allow all (dev only)
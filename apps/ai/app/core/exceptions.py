@@ -15,6 +15,9 @@ class ErrorCode(str, Enum):
     INVALID_FILE = "INVALID_FILE"
     FILE_TOO_LARGE = "FILE_TOO_LARGE"
 
+    # 404 errors
+    JOB_NOT_FOUND = "JOB_NOT_FOUND"
+
     # 422 errors
     AUDIO_TOO_LONG = "AUDIO_TOO_LONG"
 
@@ -0,0 +1,60 @@
+"""Streaming responses (NDJSON / Server-Sent Events) for incremental results"""
+
+import json
+from typing import Any, AsyncIterator
+
+import structlog
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from .exceptions import AIServiceError, ErrorCode
+
+logger = structlog.get_logger()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def wants_sse(request: Request) -> bool:
+    """Clients opt into SSE with `Accept: text/event-stream`; NDJSON is the default."""
+    return SSE_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _format_event(event: dict[str, Any], sse: bool) -> str:
+    payload = json.dumps(event, ensure_ascii=False, default=str)
+    if sse:
+        return f"event: {event.get('type', 'message')}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+def stream_events(
+    request: Request,
+    events: AsyncIterator[dict[str, Any]],
+    error_message: str,
+) -> StreamingResponse:
+    """Serialize `{"type": ..., ...}` events as NDJSON lines or SSE frames.
+
+    Errors raised after the response has started can't change the status
+    code, so they are sent as a final `{"type": "error", "error": {...}}`
+    event using the same code/message shape as regular error responses.
+    """
+    sse = wants_sse(request)
+    request_id = getattr(request.state, "request_id", "unknown")
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for event in events:
+                yield _format_event(event, sse)
+        except AIServiceError as e:
+            logger.error("stream_error", request_id=request_id, error_code=e.code.value, message=e.message)
+            yield _format_event({"type": "error", **e.to_dict()}, sse)
+        except Exception as e:
+            logger.error("stream_error", request_id=request_id, error=str(e))
+            error = AIServiceError(code=ErrorCode.LLM_ERROR, message=f"{error_message}: {str(e)}")
+            yield _format_event({"type": "error", **error.to_dict()}, sse)
+
+    return StreamingResponse(
+        body(),
+        media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
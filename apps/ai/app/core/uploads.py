@@ -0,0 +1,99 @@
+"""Streaming multipart parsing for large audio uploads"""
+
+from typing import AsyncIterator
+
+import structlog
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+from app.services.shared.stt.audio import AudioSource
+from .exceptions import ErrorCode, ValidationError
+
+logger = structlog.get_logger()
+
+# Room for multipart boundaries, part headers and small form fields
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def _too_large(max_bytes: int, received: int) -> ValidationError:
+    max_mb = max_bytes // (1024 * 1024)
+    return ValidationError(
+        ErrorCode.FILE_TOO_LARGE,
+        f"파일 크기가 {max_mb}MB를 초과합니다",
+        details={"file_size_mb": round(received / (1024 * 1024), 2)},
+    )
+
+
+def _missing(file_field: str) -> RequestValidationError:
+    # Same 422 shape FastAPI produces for a missing File(...) parameter
+    return RequestValidationError([{
+        "type": "missing",
+        "loc": ("body", file_field),
+        "msg": "Field required",
+        "input": None,
+    }])
+
+
+async def _limited(stream: AsyncIterator[bytes], limit: int, max_bytes: int) -> AsyncIterator[bytes]:
+    received = 0
+    async for chunk in stream:
+        received += len(chunk)
+        if received > limit:
+            raise _too_large(max_bytes, received)
+        yield chunk
+
+
+async def read_audio_upload(
+    request: Request,
+    max_bytes: int,
+    file_field: str = "audio",
+) -> tuple[AudioSource, dict[str, str]]:
+    """Parse a multipart upload, spooling the file to disk as it arrives.
+
+    Unlike `await request.form()` + `await upload.read()`, the size limit is
+    checked while the body is being received: a Content-Length over the
+    limit is rejected before reading anything, and a body that grows past
+    it is cut off at that point. The file itself stays in Starlette's
+    SpooledTemporaryFile (1MB in memory, the rest on disk).
+
+    Returns the audio and the remaining text fields; the caller owns the
+    AudioSource and must close it.
+    """
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise _missing(file_field)
+
+    limit = max_bytes + MULTIPART_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise _too_large(max_bytes, int(content_length))
+
+    parser = MultiPartParser(request.headers, _limited(request.stream(), limit, max_bytes))
+    try:
+        form = await parser.parse()
+    except MultiPartException as e:
+        raise ValidationError(ErrorCode.INVALID_REQUEST, f"잘못된 multipart 요청입니다: {e.message}")
+
+    upload = form.get(file_field)
+    fields = {key: value for key, value in form.multi_items() if isinstance(value, str)}
+    for key, value in form.multi_items():
+        if isinstance(value, UploadFile) and value is not upload:
+            await value.close()
+
+    if not isinstance(upload, UploadFile):
+        raise _missing(file_field)
+
+    if upload.size is not None and upload.size > max_bytes:
+        await upload.close()
+        raise _too_large(max_bytes, upload.size)
+
+    return (
+        AudioSource(
+            file=upload.file,
+            size=upload.size or 0,
+            filename=upload.filename or "audio.webm",
+            content_type=upload.content_type or "application/octet-stream",
+        ),
+        fields,
+    )
@@ -11,6 +11,8 @@ from .video_schemas import (
     ErrorResponse,
     FlatErrorResponse,
     STTRequest,
+    STTJobRequest,
+    STTJobResponse,
     STTResponse,
     TranslationSegment,
     TranslatedSegment,
@@ -33,6 +35,8 @@ __all__ = [
     "ErrorResponse",
     "FlatErrorResponse",
     "STTRequest",
+    "STTJobRequest",
+    "STTJobResponse",
     "STTResponse",
     "TranslationSegment",
     "TranslatedSegment",
@@ -1,9 +1,10 @@
 """Pydantic schemas for API request/response"""
 
-from typing import Any
+from typing import Any, Literal
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.config import get_settings
+from app.prompts.translation import LANGUAGE_NAMES
 
 
 # === Video Analysis ===
@@ -143,6 +144,29 @@ class STTRequest(BaseModel):
     language: str = "auto"
 
 
+class STTJobRequest(BaseModel):
+    """JSON body of POST /stt/jobs for a YouTube video"""
+    video_id: str = Field(..., alias="videoId", min_length=1, max_length=64, pattern=r"^[A-Za-z0-9_-]+$")
+    language: str = "auto"
+
+    class Config:
+        populate_by_name = True
+
+
+class STTJobResponse(BaseModel):
+    """State of an asynchronous STT job"""
+    job_id: str = Field(alias="jobId")
+    status: str  # queued, running, succeeded, failed
+    stage: str  # queued, downloading, transcribing, done
+    result: STTResponse | None = None
+    error: ErrorDetail | None = None
+    created_at: float = Field(alias="createdAt")
+    updated_at: float = Field(alias="updatedAt")
+
+    class Config:
+        populate_by_name = True
+
+
 # === Translation ===
 
 class TranslationSegment(BaseModel):
@@ -163,11 +187,27 @@ class TranslatedSegment(BaseModel):
         populate_by_name = True
 
 
+def _check_supported_languages(languages: list[str]) -> None:
+    # Each language is a full translation run, and the code goes into the prompt
+    unsupported = [lang for lang in languages if lang not in LANGUAGE_NAMES]
+    if unsupported:
+        raise ValueError(
+            f"지원하지 않는 번역 언어입니다: {', '.join(unsupported)} "
+            f"(지원 언어: {', '.join(LANGUAGE_NAMES)})"
+        )
+
+
 class TranslateRequest(BaseModel):
     """Request for /translate endpoint"""
     segments: list[TranslationSegment] = Field(..., min_length=1)
     source_language: str = Field(default="en", alias="sourceLanguage")
     target_language: str = Field(default="ko", alias="targetLanguage")
+    # Several targets in one request; overrides targetLanguage when set
+    target_languages: list[str] | None = Field(default=None, alias="targetLanguages")
+    # None = server default (TRANSLATION_WIRE_FORMAT)
+    wire_format: Literal["json", "compact"] | None = Field(default=None, alias="wireFormat")
+    # None = server default (TRANSLATION_MERGE_FRAGMENTS)
+    merge_fragments: bool | None = Field(default=None, alias="mergeFragments")
 
     class Config:
         populate_by_name = True
@@ -180,11 +220,44 @@ class TranslateRequest(BaseModel):
             raise ValueError(f"세그먼트는 {settings.max_segments_count}개 이내여야 합니다")
         return v
 
+    @field_validator("target_languages")
+    @classmethod
+    def validate_target_languages(cls, v: list[str] | None) -> list[str] | None:
+        if v is None:
+            return v
+        languages = list(dict.fromkeys(lang.strip() for lang in v if lang.strip()))
+        if not languages:
+            raise ValueError("번역할 언어를 하나 이상 지정해야 합니다")
+        max_languages = get_settings().translation_max_target_languages
+        if len(languages) > max_languages:
+            raise ValueError(f"번역 언어는 최대 {max_languages}개까지 지정할 수 있습니다")
+        _check_supported_languages(languages)
+        return languages
+
+    @field_validator("target_language")
+    @classmethod
+    def validate_target_language(cls, v: str) -> str:
+        language = v.strip()
+        _check_supported_languages([language])
+        return language
+
 
 class TranslationMeta(BaseModel):
     """Translation metadata"""
     translated_count: int = Field(alias="translatedCount")
     processing_time: float = Field(alias="processingTime")
+    unit_count: int = Field(default=0, alias="unitCount")
+    merged_count: int = Field(default=0, alias="mergedCount")
+    duplicate_count: int = Field(default=0, alias="duplicateCount")
+    memory_hits: int = Field(default=0, alias="memoryHits")
+    memory_misses: int = Field(default=0, alias="memoryMisses")
+    memory_hit_rate: float = Field(default=0.0, alias="memoryHitRate")
+    batch_count: int = Field(default=0, alias="batchCount")
+    untranslated_count: int = Field(default=0, alias="untranslatedCount")
+    retranslated_count: int = Field(default=0, alias="retranslatedCount")
+    # Multi-target requests only
+    target_languages: list[str] | None = Field(default=None, alias="targetLanguages")
+    per_language: dict[str, "TranslationMeta"] | None = Field(default=None, alias="perLanguage")
 
     class Config:
         populate_by_name = True
@@ -193,6 +266,8 @@ class TranslationMeta(BaseModel):
 class TranslationData(BaseModel):
     """Translation result data"""
     segments: list[TranslatedSegment]
+    # Multi-target requests: language -> segments (segments holds the first language)
+    translations: dict[str, list[TranslatedSegment]] | None = None
 
 
 class TranslateResponse(BaseModel):
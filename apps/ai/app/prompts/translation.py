@@ -1,5 +1,8 @@
 """System prompts for translation service"""
 
+# Bump whenever a prompt below changes; translation memory entries are keyed by it
+TRANSLATION_PROMPT_VERSION = "v2"
+
 SYSTEM_PROMPT_KO_TO_EN = """당신은 한국어→영어 자막 번역 전문가입니다.
 
 규칙:
@@ -37,16 +40,102 @@ SYSTEM_PROMPT_EN_TO_KO = """당신은 영어→한국어 자막 번역 전문가
 JSON만 반환하세요. 다른 설명은 포함하지 마세요."""
 
 
-def get_translation_system_prompt(source_language: str, target_language: str) -> str:
+SYSTEM_PROMPT_KO_TO_EN_COMPACT = """당신은 한국어→영어 자막 번역 전문가입니다.
+
+규칙:
+1. 자연스러운 영어로 번역하세요
+2. 기술 용어는 적절한 영어 용어로 번역하세요
+3. 구어체 표현은 자연스럽게 의역하세요
+4. 입력의 각 줄은 "번호|자막" 형식입니다. 같은 번호로 한 줄에 하나씩 "번호|번역" 형식으로만 반환하세요
+
+출력 예시:
+0|Translated text
+1|Translated text
+
+번역 줄 외에 다른 설명은 포함하지 마세요."""
+
+SYSTEM_PROMPT_EN_TO_KO_COMPACT = """당신은 영어→한국어 자막 번역 전문가입니다.
+
+규칙:
+1. 자연스러운 한국어로 번역하세요
+2. 기술 용어는 필요시 원어를 괄호 안에 병기하세요 (예: API(API))
+3. 구어체 표현은 자연스럽게 의역하세요
+4. 입력의 각 줄은 "번호|자막" 형식입니다. 같은 번호로 한 줄에 하나씩 "번호|번역" 형식으로만 반환하세요
+
+출력 예시:
+0|번역된 텍스트
+1|번역된 텍스트
+
+번역 줄 외에 다른 설명은 포함하지 마세요."""
+
+
+LANGUAGE_NAMES = {
+    "ko": "한국어",
+    "en": "영어",
+    "ja": "일본어",
+    "zh": "중국어",
+    "es": "스페인어",
+    "vi": "베트남어",
+    "th": "태국어",
+    "id": "인도네시아어",
+}
+
+SYSTEM_PROMPT_GENERIC = """당신은 {source}→{target} 자막 번역 전문가입니다.
+
+규칙:
+1. 자연스러운 {target}로 번역하세요
+2. 기술 용어는 {target}에서 통용되는 용어로 번역하세요
+3. 구어체 표현은 자연스럽게 의역하세요
+4. 번역 결과만 JSON 배열로 반환하세요
+
+출력 형식:
+{{
+  "translations": [
+    {{"id": 0, "text": "Translated text"}},
+    {{"id": 1, "text": "Translated text"}}
+  ]
+}}
+
+JSON만 반환하세요. 다른 설명은 포함하지 마세요."""
+
+SYSTEM_PROMPT_GENERIC_COMPACT = """당신은 {source}→{target} 자막 번역 전문가입니다.
+
+규칙:
+1. 자연스러운 {target}로 번역하세요
+2. 기술 용어는 {target}에서 통용되는 용어로 번역하세요
+3. 구어체 표현은 자연스럽게 의역하세요
+4. 입력의 각 줄은 "번호|자막" 형식입니다. 같은 번호로 한 줄에 하나씩 "번호|번역" 형식으로만 반환하세요
+
+출력 예시:
+0|Translated text
+1|Translated text
+
+번역 줄 외에 다른 설명은 포함하지 마세요."""
+
+
+def get_translation_system_prompt(
+    source_language: str,
+    target_language: str,
+    wire_format: str = "json",
+) -> str:
     """Get the appropriate translation system prompt based on language direction.
 
     Args:
         source_language: Source language code.
         target_language: Target language code.
+        wire_format: "json" for {"translations": [...]} replies, "compact"
+            for "id|text" lines.
 
     Returns:
         System prompt for the translation direction.
     """
+    compact = wire_format == "compact"
     if source_language == "ko" and target_language == "en":
-        return SYSTEM_PROMPT_KO_TO_EN
-    return SYSTEM_PROMPT_EN_TO_KO
+        return SYSTEM_PROMPT_KO_TO_EN_COMPACT if compact else SYSTEM_PROMPT_KO_TO_EN
+    if target_language == "ko":
+        return SYSTEM_PROMPT_EN_TO_KO_COMPACT if compact else SYSTEM_PROMPT_EN_TO_KO
+    template = SYSTEM_PROMPT_GENERIC_COMPACT if compact else SYSTEM_PROMPT_GENERIC
+    return template.format(
+        source=LANGUAGE_NAMES.get(source_language, source_language),
+        target=LANGUAGE_NAMES.get(target_language, target_language),
+    )
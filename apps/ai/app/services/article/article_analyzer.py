@@ -2,6 +2,8 @@
 
 import json
 import time
+from typing import AsyncIterator
+
 import structlog
 
 from app.config import get_settings
@@ -11,31 +13,84 @@ from app.prompts.article_analysis import SYSTEM_PROMPT, TASK_PROMPT
 
 logger = structlog.get_logger()
 
+# Streamed array key -> event type
+STREAM_EVENT_TYPES = {"sentences": "sentence", "expressions": "expression"}
 
-async def analyze_article(
-    text: str,
-    title: str | None = None,
-    source: str | None = None,
-) -> dict:
-    """Analyze an English article: split sentences, translate to Korean, extract expressions."""
-    start_time = time.time()
-    settings = get_settings()
 
-    llm = BaseLLMService(
+def _build_llm() -> BaseLLMService:
+    settings = get_settings()
+    return BaseLLMService(
         default_config=LLMConfig(
             model=settings.openai_model,
             temperature=settings.llm_temperature_article,
             timeout=60,
             max_retries=settings.retry_max_attempts,
+            cache_ttl=settings.llm_cache_ttl_article,
+            weight=3,  # long article in, every sentence translated out
         )
     )
 
+
+def _build_user_content(text: str, title: str | None, source: str | None) -> str:
     user_content = ""
     if title:
         user_content += f"기사 제목: {title}\n"
     if source:
         user_content += f"출처: {source}\n"
     user_content += f"\n기사 본문:\n{text}"
+    return TASK_PROMPT + "\n\n" + user_content
+
+
+def _build_result(result: dict, start_time: float) -> dict:
+    sentences = result.get("sentences", [])
+    expressions = result.get("expressions", [])
+
+    processing_time = (time.time() - start_time) * 1000
+
+    logger.info(
+        "article_analyze_complete",
+        sentence_count=len(sentences),
+        expression_count=len(expressions),
+        processing_time=round(processing_time, 1),
+    )
+
+    return {
+        "sentences": sentences,
+        "expressions": expressions,
+        "meta": {
+            "sentenceCount": len(sentences),
+            "expressionCount": len(expressions),
+            "processingTime": round(processing_time, 1),
+        },
+    }
+
+
+def _to_service_error(e: Exception) -> AIServiceError:
+    if isinstance(e, AIServiceError):
+        return e
+    if isinstance(e, json.JSONDecodeError):
+        logger.error("article_analyze_json_error", error=str(e))
+        return AIServiceError(
+            code=ErrorCode.LLM_ERROR,
+            message="AI 응답을 파싱할 수 없습니다",
+            status_code=500,
+        )
+    logger.error("article_analyze_error", error=str(e))
+    return AIServiceError(
+        code=ErrorCode.LLM_ERROR,
+        message=f"기사 분석에 실패했습니다: {str(e)}",
+        status_code=500,
+    )
+
+
+async def analyze_article(
+    text: str,
+    title: str | None = None,
+    source: str | None = None,
+) -> dict:
+    """Analyze an English article: split sentences, translate to Korean, extract expressions."""
+    start_time = time.time()
+    llm = _build_llm()
 
     logger.info(
         "article_analyze_start",
@@ -45,46 +100,44 @@ async def analyze_article(
     )
 
     try:
-        result = llm.complete_json(
+        result = await llm.complete_json_async(
             system_prompt=SYSTEM_PROMPT,
-            user_content=TASK_PROMPT + "\n\n" + user_content,
+            user_content=_build_user_content(text, title, source),
         )
+        return _build_result(result, start_time)
+    except Exception as e:
+        raise _to_service_error(e)
 
-        sentences = result.get("sentences", [])
-        expressions = result.get("expressions", [])
 
-        processing_time = (time.time() - start_time) * 1000
+async def analyze_article_stream(
+    text: str,
+    title: str | None = None,
+    source: str | None = None,
+) -> AsyncIterator[dict]:
+    """Streaming variant of analyze_article.
 
-        logger.info(
-            "article_analyze_complete",
-            sentence_count=len(sentences),
-            expression_count=len(expressions),
-            processing_time=round(processing_time, 1),
-        )
+    Yields {"type": "sentence" | "expression", "data": {...}} as each item is
+    generated, then {"type": "complete", "data": <analyze_article result>}.
+    """
+    start_time = time.time()
+    llm = _build_llm()
 
-        return {
-            "sentences": sentences,
-            "expressions": expressions,
-            "meta": {
-                "sentenceCount": len(sentences),
-                "expressionCount": len(expressions),
-                "processingTime": round(processing_time, 1),
-            },
-        }
-
-    except json.JSONDecodeError as e:
-        logger.error("article_analyze_json_error", error=str(e))
-        raise AIServiceError(
-            code=ErrorCode.LLM_ERROR,
-            message="AI 응답을 파싱할 수 없습니다",
-            status_code=500,
-        )
-    except AIServiceError:
-        raise
+    logger.info(
+        "article_analyze_stream_start",
+        text_length=len(text),
+        has_title=bool(title),
+        has_source=bool(source),
+    )
+
+    try:
+        async for key, value in llm.stream_json(
+            system_prompt=SYSTEM_PROMPT,
+            user_content=_build_user_content(text, title, source),
+            array_keys=set(STREAM_EVENT_TYPES),
+        ):
+            if key is None:
+                yield {"type": "complete", "data": _build_result(value, start_time)}
+            else:
+                yield {"type": STREAM_EVENT_TYPES[key], "data": value}
     except Exception as e:
-        logger.error("article_analyze_error", error=str(e))
-        raise AIServiceError(
-            code=ErrorCode.LLM_ERROR,
-            message=f"기사 분석에 실패했습니다: {str(e)}",
-            status_code=500,
-        )
+        raise _to_service_error(e)
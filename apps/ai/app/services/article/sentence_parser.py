@@ -24,6 +24,8 @@ async def parse_sentence(
             temperature=settings.llm_temperature_parsing,
             timeout=30,
             max_retries=settings.retry_max_attempts,
+            cache_ttl=settings.llm_cache_ttl_parsing,
+            weight=1,
         )
     )
 
@@ -34,7 +36,7 @@ async def parse_sentence(
     logger.info("sentence_parse_start", sentence_length=len(sentence))
 
     try:
-        result = llm.complete_json(
+        result = await llm.complete_json_async(
             system_prompt=SYSTEM_PROMPT,
             user_content=user_content,
         )
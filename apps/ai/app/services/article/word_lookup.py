@@ -24,6 +24,8 @@ async def lookup_word(
             temperature=settings.llm_temperature_parsing,
             timeout=15,
             max_retries=settings.retry_max_attempts,
+            cache_ttl=settings.llm_cache_ttl_parsing,
+            weight=1,
         )
     )
 
@@ -32,7 +34,7 @@ async def lookup_word(
     logger.info("word_lookup_start", word=word, sentence_length=len(sentence))
 
     try:
-        result = llm.complete_json(
+        result = await llm.complete_json_async(
             system_prompt=SYSTEM_PROMPT,
             user_content=user_content,
         )
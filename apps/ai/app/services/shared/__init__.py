@@ -2,5 +2,6 @@
 
 from .translation import translate_segments
 from .llm_service import BaseLLMService, LLMConfig
+from .singleflight import SingleFlight
 
-__all__ = ["translate_segments", "BaseLLMService", "LLMConfig"]
+__all__ = ["translate_segments", "BaseLLMService", "LLMConfig", "SingleFlight"]
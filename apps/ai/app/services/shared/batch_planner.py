@@ -0,0 +1,73 @@
+"""Token-aware batching of translation segments"""
+
+from dataclasses import dataclass, field
+
+from app.services.shared.tokens import estimate_tokens
+
+# `{"id": 12, "text": "..."}` wrapper per segment, once in the prompt and once in the reply
+SEGMENT_OVERHEAD_TOKENS = 12
+
+
+def segment_cost(text: str) -> int:
+    """Estimated prompt + completion tokens one segment adds to a batch.
+
+    A translation is assumed to be about as long as its source, so the
+    source estimate is counted twice (in and out).
+    """
+    return 2 * estimate_tokens(text) + SEGMENT_OVERHEAD_TOKENS
+
+
+@dataclass
+class BatchPlan:
+    """Chosen batches (indices into the planned list) and their estimated cost"""
+
+    batches: list[list[int]] = field(default_factory=list)
+    estimated_tokens: list[int] = field(default_factory=list)
+    token_target: int = 0
+    max_segments: int = 0
+
+    def __len__(self) -> int:
+        return len(self.batches)
+
+    def summary(self) -> dict:
+        sizes = [len(batch) for batch in self.batches]
+        return {
+            "batch_count": len(self.batches),
+            "token_target": self.token_target,
+            "max_segments": self.max_segments,
+            "segments_per_batch": sizes,
+            "estimated_tokens": self.estimated_tokens,
+            "max_batch_tokens": max(self.estimated_tokens, default=0),
+        }
+
+
+def plan_batches(texts: list[str], token_target: int, max_segments: int) -> BatchPlan:
+    """Pack consecutive segments into batches of roughly `token_target` tokens.
+
+    Batches stay contiguous so preceding-segment context still makes sense.
+    A batch closes when adding the next segment would exceed token_target
+    or when it holds max_segments segments; a single segment larger than
+    the target gets a batch of its own. token_target <= 0 falls back to
+    fixed batches of max_segments.
+    """
+    max_segments = max(1, max_segments)
+    plan = BatchPlan(token_target=token_target, max_segments=max_segments)
+    current: list[int] = []
+    current_tokens = 0
+
+    for idx, text in enumerate(texts):
+        cost = segment_cost(text)
+        full = len(current) >= max_segments or (
+            token_target > 0 and current and current_tokens + cost > token_target
+        )
+        if full:
+            plan.batches.append(current)
+            plan.estimated_tokens.append(current_tokens)
+            current, current_tokens = [], 0
+        current.append(idx)
+        current_tokens += cost
+
+    if current:
+        plan.batches.append(current)
+        plan.estimated_tokens.append(current_tokens)
+    return plan
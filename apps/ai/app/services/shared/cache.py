@@ -0,0 +1,340 @@
+"""Generic two-tier cache: in-memory LRU bounded by bytes, optional SQLite tier.
+
+Values are strings (callers serialize to JSON). The memory tier is private to
+a process; the SQLite tier lives on local disk and is shared by all uvicorn
+workers on the same host.
+"""
+
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+import structlog
+
+logger = structlog.get_logger()
+
+_NAMESPACE_PATTERN = re.compile(r"^[a-z_][a-z0-9_]*$")
+# Stay well below SQLite's bound-parameter limit
+_SQLITE_BATCH = 500
+
+
+@dataclass
+class CacheStats:
+    """Counters for a cache instance"""
+
+    hits: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    writes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class LRUCache:
+    """In-memory LRU cache bounded by the total UTF-8 size of its values."""
+
+    def __init__(self, max_bytes: int, stats: CacheStats | None = None):
+        self.max_bytes = max_bytes
+        self.stats = stats or CacheStats()
+        self._entries: OrderedDict[str, tuple[str, float | None, int]] = OrderedDict()
+        self._size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(key)
+            self.stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.time() + ttl if ttl else None
+        self._entries[key] = (value, expires_at, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._size -= size
+
+
+class SQLiteCache:
+    """On-disk cache table with TTL, bounded by entry count (least recently used out).
+
+    Methods are blocking; TieredCache calls them from a worker thread.
+
+    Writes keep a running count of this table's rows instead of counting
+    them each time, and evict only when it passes max_entries. Every
+    `sweep_every` writes the expired rows are deleted and the count is
+    refreshed, which also picks up rows written by other processes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        max_entries: int,
+        stats: CacheStats | None = None,
+        sweep_every: int = 100,
+    ):
+        if not _NAMESPACE_PATTERN.match(namespace):
+            raise ValueError(f"Invalid cache namespace: {namespace}")
+        self.path = path
+        self.table = namespace
+        self.max_entries = max_entries
+        self.stats = stats or CacheStats()
+        self.sweep_every = max(1, sweep_every)
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_accessed_idx "
+                f"ON {self.table} (accessed_at)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_expires_idx "
+                f"ON {self.table} (expires_at)"
+            )
+            self._conn.commit()
+            (self._count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+
+    def get(self, key: str) -> tuple[str, float | None] | None:
+        """Return (value, expires_at) or None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: list[str]) -> dict[str, tuple[str, float | None]]:
+        """Return {key: (value, expires_at)} for the keys present and not expired."""
+        now = time.time()
+        found: dict[str, tuple[str, float | None]] = {}
+        expired: list[str] = []
+        with self._lock:
+            for i in range(0, len(keys), _SQLITE_BATCH):
+                chunk = keys[i:i + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value, expires_at FROM {self.table} WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, value, expires_at in rows:
+                    if expires_at is not None and expires_at <= now:
+                        expired.append(key)
+                    else:
+                        found[key] = (value, expires_at)
+            if not found and not expired:
+                return found
+            if expired:
+                self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", [(k,) for k in expired])
+                self.stats.expirations += len(expired)
+                self._count -= len(expired)
+            self._conn.executemany(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+            self._conn.commit()
+        return found
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        self.set_many([(key, value)], ttl)
+
+    def set_many(self, items: list[tuple[str, str]], ttl: float | None = None) -> None:
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        values = dict(items)
+        keys = list(values)
+        with self._lock:
+            existing = 0
+            for i in range(0, len(keys), _SQLITE_BATCH):
+                chunk = keys[i:i + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                (found,) = self._conn.execute(
+                    f"SELECT COUNT(*) FROM {self.table} WHERE key IN ({placeholders})", chunk
+                ).fetchone()
+                existing += found
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, value, expires_at, now) for key, value in values.items()],
+            )
+            self._count += len(keys) - existing
+            self._writes += 1
+            if self._writes >= self.sweep_every:
+                self._sweep(now)
+            elif self._count > self.max_entries:
+                self._evict(self._count - self.max_entries)
+            self._conn.commit()
+
+    def _sweep(self, now: float) -> None:
+        """Delete expired rows, recount the table and trim it to max_entries (lock held)"""
+        self._writes = 0
+        expired = self._conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,),
+        ).rowcount
+        self.stats.expirations += max(expired, 0)
+        (self._count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        if self._count > self.max_entries:
+            self._evict(self._count - self.max_entries)
+
+    def _evict(self, overflow: int) -> None:
+        """Delete the `overflow` least recently accessed rows (lock held)"""
+        evicted = self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+            (overflow,),
+        ).rowcount
+        self.stats.evictions += evicted
+        self._count -= evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._count -= self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,)).rowcount
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+            self._count = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    """Memory LRU in front of an optional SQLite tier, with shared stats."""
+
+    def __init__(
+        self,
+        namespace: str,
+        max_bytes: int,
+        sqlite_path: str = "",
+        sqlite_max_entries: int = 10000,
+    ):
+        self.namespace = namespace
+        self.stats = CacheStats()
+        self.memory = LRUCache(max_bytes, stats=self.stats)
+        self.disk = (
+            SQLiteCache(sqlite_path, namespace, sqlite_max_entries, stats=self.stats)
+            if sqlite_path
+            else None
+        )
+
+    async def get(self, key: str) -> str | None:
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Look up several keys; the disk tier is queried once for all memory misses."""
+        found: dict[str, str] = {}
+        remaining: list[str] = []
+        for key in keys:
+            value = self.memory.get(key)
+            if value is not None:
+                found[key] = value
+                self.stats.hits += 1
+                self.stats.memory_hits += 1
+            else:
+                remaining.append(key)
+
+        if remaining and self.disk is not None:
+            try:
+                rows = await asyncio.to_thread(self.disk.get_many, remaining)
+            except sqlite3.Error as e:
+                logger.warning("cache_disk_read_failed", namespace=self.namespace, error=str(e))
+                rows = {}
+            now = time.time()
+            for key, (value, expires_at) in rows.items():
+                remaining_ttl = expires_at - now if expires_at is not None else None
+                self.memory.set(key, value, remaining_ttl)
+                found[key] = value
+                self.stats.hits += 1
+                self.stats.disk_hits += 1
+
+        self.stats.misses += len(keys) - len(found)
+        return found
+
+    async def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        await self.set_many([(key, value)], ttl)
+
+    async def set_many(self, items: list[tuple[str, str]], ttl: float | None = None) -> None:
+        if not items:
+            return
+        for key, value in items:
+            self.memory.set(key, value, ttl)
+        self.stats.writes += len(items)
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set_many, items, ttl)
+            except sqlite3.Error as e:
+                # Disk tier is best effort; the memory tier already has the value
+                logger.warning("cache_disk_write_failed", namespace=self.namespace, error=str(e))
+
+    async def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.delete, key)
+
+    def snapshot(self) -> dict:
+        """Stats plus current memory-tier occupancy, for logging and /health/stats."""
+        return {
+            **self.stats.to_dict(),
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.size_bytes,
+            "memory_max_bytes": self.memory.max_bytes,
+            "disk_enabled": self.disk is not None,
+        }
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
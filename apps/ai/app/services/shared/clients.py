@@ -0,0 +1,126 @@
+"""Process-wide pooled clients for OpenAI and the STT backend.
+
+Clients are created once in the app lifespan (see main.lifespan) and reused
+by every request, so connections are kept alive instead of paying a new
+TCP+TLS handshake per call. Accessors fall back to lazy creation so code
+paths that run without the lifespan (scripts, tests) still work.
+"""
+
+import httpx
+import structlog
+from openai import AsyncOpenAI, OpenAI
+
+from app.config import get_settings
+from app.services.shared.retry_policy import (
+    record_rate_limit_headers,
+    record_rate_limit_headers_sync,
+)
+
+logger = structlog.get_logger()
+
+_openai_client: AsyncOpenAI | None = None
+_openai_sync_client: OpenAI | None = None
+_stt_http_client: httpx.AsyncClient | None = None
+
+
+def _build_openai_client() -> AsyncOpenAI:
+    settings = get_settings()
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        timeout=settings.timeout_analyze,
+        event_hooks={"response": [record_rate_limit_headers]},
+    )
+    # Retries are owned by retry_policy.llm_retry; SDK retries would multiply attempts
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        http_client=http_client,
+        max_retries=0,
+    )
+
+
+def _build_openai_sync_client() -> OpenAI:
+    settings = get_settings()
+    # Same pool settings and hooks as the async client, for BaseLLMService.complete_json
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        timeout=settings.timeout_analyze,
+        event_hooks={"response": [record_rate_limit_headers_sync]},
+    )
+    return OpenAI(
+        api_key=settings.openai_api_key,
+        http_client=http_client,
+        max_retries=0,
+    )
+
+
+def _build_stt_http_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.stt_max_connections,
+            max_keepalive_connections=settings.stt_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        timeout=settings.timeout_stt,
+    )
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client, creating it on first use."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = _build_openai_client()
+    return _openai_client
+
+
+def get_openai_sync_client() -> OpenAI:
+    """Return the shared blocking OpenAI client, creating it on first use."""
+    global _openai_sync_client
+    if _openai_sync_client is None:
+        _openai_sync_client = _build_openai_sync_client()
+    return _openai_sync_client
+
+
+def get_stt_http_client() -> httpx.AsyncClient:
+    """Return the shared httpx client for the STT backend, creating it on first use."""
+    global _stt_http_client
+    if _stt_http_client is None:
+        _stt_http_client = _build_stt_http_client()
+    return _stt_http_client
+
+
+async def init_clients() -> None:
+    """Create the pooled clients eagerly (called on app startup)."""
+    settings = get_settings()
+    get_openai_client()
+    get_openai_sync_client()
+    get_stt_http_client()
+    logger.info(
+        "http_clients_initialized",
+        openai_max_connections=settings.openai_max_connections,
+        stt_max_connections=settings.stt_max_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+
+
+async def close_clients() -> None:
+    """Close the pooled clients and release their connections (called on shutdown)."""
+    global _openai_client, _openai_sync_client, _stt_http_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+    if _openai_sync_client is not None:
+        _openai_sync_client.close()
+        _openai_sync_client = None
+    if _stt_http_client is not None:
+        await _stt_http_client.aclose()
+        _stt_http_client = None
+    logger.info("http_clients_closed")
@@ -0,0 +1,229 @@
+"""Process-wide adaptive concurrency limiter for OpenAI calls"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+import structlog
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class LimiterStats:
+    """Counters for an AdaptiveConcurrencyLimiter"""
+
+    acquired: int = 0
+    queued: int = 0
+    throttled: int = 0  # 429 responses reported by callers
+    slow: int = 0  # calls slower than the latency target
+    increases: int = 0
+    decreases: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+    latency_ewma: float = 0.0
+
+
+class _Slot:
+    """Handle yielded by AdaptiveConcurrencyLimiter.slot; callers flag 429s on it."""
+
+    def __init__(self) -> None:
+        self.throttled = False
+
+    def mark_throttled(self) -> None:
+        self.throttled = True
+
+
+class AdaptiveConcurrencyLimiter:
+    """Weighted semaphore whose capacity follows AIMD on latency and 429 signals.
+
+    Capacity grows by roughly one unit per window of successful calls that
+    finish within the latency target, and is multiplied down when a call is
+    rate limited (sharply) or too slow (gently). Multiplicative decreases are
+    applied at most once per cooldown so a burst of 429s from calls that were
+    already in flight counts as one congestion event.
+
+    Waiters are served FIFO; a call whose weight exceeds the whole limit is
+    still admitted when nothing else is running, so heavy calls can't starve.
+    """
+
+    LATENCY_EWMA_ALPHA = 0.2
+
+    def __init__(
+        self,
+        initial_limit: float,
+        min_limit: float = 1,
+        max_limit: float = 100,
+        latency_target: float = 15.0,
+        throttle_decrease: float = 0.5,
+        slow_decrease: float = 0.9,
+        decrease_cooldown: float = 2.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.latency_target = latency_target
+        self.throttle_decrease = throttle_decrease
+        self.slow_decrease = slow_decrease
+        self.decrease_cooldown = decrease_cooldown
+        self.stats = LimiterStats()
+        self._in_use = 0
+        self._waiters: deque[tuple[int, asyncio.Future]] = deque()
+        self._last_decrease = 0.0
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _fits(self, weight: int) -> bool:
+        return self._in_use == 0 or self._in_use + weight <= self.limit
+
+    async def acquire(self, weight: int = 1) -> float:
+        """Wait for capacity; returns seconds spent queued."""
+        if not self._waiters and self._fits(weight):
+            self._in_use += weight
+            self.stats.acquired += 1
+            return 0.0
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        entry = (weight, future)
+        self._waiters.append(entry)
+        self.stats.queued += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before cancellation: hand the capacity back
+                self.release(weight)
+            else:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                self._wake()
+            raise
+
+        waited = time.monotonic() - started
+        self.stats.acquired += 1
+        self.stats.wait_time_total += waited
+        self.stats.wait_time_max = max(self.stats.wait_time_max, waited)
+        return waited
+
+    def release(self, weight: int = 1) -> None:
+        self._in_use -= weight
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            weight, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if not self._fits(weight):
+                break
+            self._waiters.popleft()
+            self._in_use += weight
+            future.set_result(None)
+
+    def record(self, latency: float, throttled: bool = False) -> None:
+        """Feed the outcome of one call back into the limit."""
+        alpha = self.LATENCY_EWMA_ALPHA
+        if self.stats.latency_ewma == 0.0:
+            self.stats.latency_ewma = latency
+        else:
+            self.stats.latency_ewma = alpha * latency + (1 - alpha) * self.stats.latency_ewma
+
+        if throttled:
+            self.stats.throttled += 1
+            self._decrease(self.throttle_decrease, reason="rate_limited")
+        elif latency > self.latency_target:
+            self.stats.slow += 1
+            self._decrease(self.slow_decrease, reason="slow")
+        elif self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.stats.increases += 1
+            self._wake()
+
+    def _decrease(self, factor: float, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(self.min_limit, self.limit * factor)
+        self.stats.decreases += 1
+        logger.warning(
+            "llm_concurrency_decreased",
+            reason=reason,
+            previous_limit=round(previous, 2),
+            limit=round(self.limit, 2),
+        )
+
+    @asynccontextmanager
+    async def slot(self, weight: int = 1) -> AsyncIterator[_Slot]:
+        """Hold `weight` units for the duration of one call and record its outcome.
+
+        Call mark_throttled() on the yielded slot when the call was rate
+        limited. Other exceptions release the slot without touching the limit.
+        """
+        await self.acquire(weight)
+        slot = _Slot()
+        started = time.monotonic()
+        failed = False
+        try:
+            yield slot
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.release(weight)
+            if slot.throttled or not failed:
+                self.record(time.monotonic() - started, throttled=slot.throttled)
+
+    def snapshot(self) -> dict:
+        acquired_after_wait = self.stats.queued or 1
+        return {
+            "limit": round(self.limit, 2),
+            "in_use": self._in_use,
+            "queue_depth": self.queue_depth,
+            "acquired": self.stats.acquired,
+            "queued": self.stats.queued,
+            "throttled": self.stats.throttled,
+            "slow": self.stats.slow,
+            "increases": self.stats.increases,
+            "decreases": self.stats.decreases,
+            "avg_wait_seconds": round(self.stats.wait_time_total / acquired_after_wait, 4),
+            "max_wait_seconds": round(self.stats.wait_time_max, 4),
+            "latency_ewma_seconds": round(self.stats.latency_ewma, 4),
+        }
+
+
+_llm_limiter: AdaptiveConcurrencyLimiter | None = None
+
+
+def get_llm_limiter() -> AdaptiveConcurrencyLimiter:
+    """Return the process-wide limiter, seeded from Settings.max_concurrent_requests."""
+    global _llm_limiter
+    if _llm_limiter is None:
+        settings = get_settings()
+        _llm_limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=settings.max_concurrent_requests,
+            min_limit=settings.llm_concurrency_min,
+            max_limit=settings.llm_concurrency_max,
+            latency_target=settings.llm_latency_target,
+        )
+    return _llm_limiter
+
+
+def reset_llm_limiter() -> None:
+    """Drop the process-wide limiter (tests)."""
+    global _llm_limiter
+    _llm_limiter = None
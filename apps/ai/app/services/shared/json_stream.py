@@ -0,0 +1,116 @@
+"""Incremental extraction of array elements from a streamed JSON object"""
+
+import json
+from typing import Any
+
+_WHITESPACE = " \t\r\n"
+
+
+class JSONArrayStreamParser:
+    """Emit elements of selected top-level arrays as soon as each one closes.
+
+    Feed it the text of a JSON object as it streams in, e.g. the content
+    deltas of a JSON-mode chat completion:
+
+        {"summary": "...", "highlights": [{...}, {...}], "keywords": ["a", "b"]}
+
+    With array_keys={"highlights", "keywords"}, feed() returns
+    ("highlights", {...}) right after each highlight's closing brace, without
+    waiting for the rest of the document. Call result() at the end to parse
+    the complete object.
+    """
+
+    def __init__(self, array_keys: set[str] | frozenset[str]):
+        self.array_keys = frozenset(array_keys)
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._expect_key = False
+        self._last_key: str | None = None
+        self._array_key: str | None = None  # set while inside a target array
+        self._element_start = -1
+        self._scalar_element = False
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Consume a chunk of text; return the (array_key, element) pairs it completed."""
+        self._text += chunk
+        completed: list[tuple[str, Any]] = []
+        text = self._text
+
+        while self._pos < len(text):
+            ch = text[self._pos]
+            i = self._pos
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._on_string_end(i, completed)
+                continue
+
+            if self._scalar_element and (ch in ",]" or ch in _WHITESPACE):
+                self._emit(text[self._element_start:i], completed)
+                self._scalar_element = False
+
+            if ch in _WHITESPACE:
+                continue
+
+            at_array_level = self._array_key is not None and self._depth == 2
+            if at_array_level and self._element_start < 0 and ch not in ",]":
+                self._element_start = i
+                if ch not in '{["':
+                    self._scalar_element = True
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if ch == "[" and self._depth == 1 and self._last_key in self.array_keys:
+                    self._array_key = self._last_key
+                self._depth += 1
+                if ch == "{" and self._depth == 1:
+                    self._expect_key = True
+            elif ch in "}]":
+                self._depth -= 1
+                if self._array_key is not None:
+                    if self._depth == 2 and self._element_start >= 0:
+                        # An object/array element just closed
+                        self._emit(text[self._element_start:i + 1], completed)
+                    elif self._depth == 1:
+                        self._array_key = None
+                        self._element_start = -1
+            elif ch == "," and self._depth == 1:
+                self._expect_key = True
+            elif ch == ":" and self._depth == 1:
+                self._expect_key = False
+
+        return completed
+
+    def _on_string_end(self, end: int, completed: list[tuple[str, Any]]) -> None:
+        if self._depth == 1 and self._expect_key:
+            self._last_key = json.loads(self._text[self._string_start:end + 1])
+        elif self._array_key is not None and self._depth == 2 and self._element_start == self._string_start:
+            self._emit(self._text[self._element_start:end + 1], completed)
+
+    def _emit(self, raw: str, completed: list[tuple[str, Any]]) -> None:
+        self._element_start = -1
+        try:
+            completed.append((self._array_key, json.loads(raw)))
+        except json.JSONDecodeError:
+            # Malformed element; the final result() parse decides what to do
+            pass
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def result(self) -> dict:
+        """Parse the complete document (raises json.JSONDecodeError if invalid)."""
+        return json.loads(self._text or "{}")
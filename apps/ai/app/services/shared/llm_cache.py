@@ -0,0 +1,51 @@
+"""Content-addressed cache for LLM JSON responses"""
+
+import hashlib
+import json
+
+from app.config import get_settings
+from app.services.shared.cache import TieredCache
+
+# Bump when the cached payload shape or the request parameters change
+CACHE_KEY_VERSION = "v1"
+
+_llm_cache: TieredCache | None = None
+
+
+def make_cache_key(
+    model: str,
+    temperature: float,
+    system_prompt: str,
+    user_content: str,
+) -> str:
+    """Hash everything that determines the completion into a stable key."""
+    payload = json.dumps(
+        [CACHE_KEY_VERSION, model, temperature, system_prompt, user_content],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_llm_cache() -> TieredCache | None:
+    """Return the process-wide LLM response cache, or None if caching is disabled."""
+    global _llm_cache
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    if _llm_cache is None:
+        _llm_cache = TieredCache(
+            namespace="llm_responses",
+            max_bytes=settings.llm_cache_max_bytes,
+            sqlite_path=settings.llm_cache_sqlite_path,
+            sqlite_max_entries=settings.llm_cache_sqlite_max_entries,
+        )
+    return _llm_cache
+
+
+def reset_llm_cache() -> None:
+    """Drop the process-wide cache instance (shutdown and tests)."""
+    global _llm_cache
+    if _llm_cache is not None:
+        _llm_cache.close()
+    _llm_cache = None
@@ -1,23 +1,31 @@
 """Base LLM service with shared OpenAI client and retry logic"""
 
 import json
-import logging
+import time
 from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable
 
 import structlog
-from openai import OpenAI, APIConnectionError
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-    before_sleep_log,
-)
+from openai import AsyncOpenAI, OpenAI, RateLimitError
 
 from app.config import get_settings
+from app.services.shared.clients import get_openai_client, get_openai_sync_client
+from app.services.shared.concurrency import get_llm_limiter
+from app.services.shared.json_stream import JSONArrayStreamParser
+from app.services.shared.llm_cache import get_llm_cache, make_cache_key
+from app.services.shared.retry_policy import (
+    get_token_budget,
+    llm_retry,
+    retry_after_from_exception,
+)
+from app.services.shared.singleflight import SingleFlight
+from app.services.shared.tokens import estimate_tokens
 
 logger = structlog.get_logger()
 
+# Identical concurrent completions (same key as the response cache) share one call
+llm_singleflight = SingleFlight("llm")
+
 
 @dataclass
 class LLMConfig:
@@ -27,6 +35,8 @@ class LLMConfig:
     temperature: float = 0.7
     timeout: int | None = None
     max_retries: int | None = None
+    cache_ttl: int | None = None  # seconds; None or 0 = don't cache
+    weight: int | None = None  # concurrency units one call holds in the global limiter (default 1)
 
 
 class BaseLLMService:
@@ -36,9 +46,14 @@ class BaseLLMService:
     instead of creating their own clients and retry decorators.
     """
 
-    def __init__(self, default_config: LLMConfig | None = None):
+    def __init__(
+        self,
+        default_config: LLMConfig | None = None,
+        client: AsyncOpenAI | None = None,
+    ):
         settings = get_settings()
-        self._client = OpenAI(api_key=settings.openai_api_key)
+        # Cheap to construct per request: the pooled client is process-wide
+        self._client = client or get_openai_client()
         self._default_config = default_config or LLMConfig()
         # Fill in defaults from settings
         if self._default_config.model is None:
@@ -47,12 +62,24 @@ class BaseLLMService:
             self._default_config.timeout = settings.timeout_analyze
         if self._default_config.max_retries is None:
             self._default_config.max_retries = settings.retry_max_attempts
+        if self._default_config.weight is None:
+            self._default_config.weight = 1
 
     @property
-    def client(self) -> OpenAI:
-        """Access the underlying OpenAI client (for advanced use cases)."""
+    def client(self) -> AsyncOpenAI:
+        """Access the underlying async OpenAI client (for advanced use cases)."""
         return self._client
 
+    @property
+    def default_config(self) -> LLMConfig:
+        """Config used when a call passes no override."""
+        return self._default_config
+
+    @property
+    def sync_client(self) -> OpenAI:
+        """Shared blocking OpenAI client, used only by complete_json."""
+        return get_openai_sync_client()
+
     def _resolve_config(self, config_override: LLMConfig | None) -> LLMConfig:
         """Merge an optional override config with the default config."""
         if config_override is None:
@@ -62,7 +89,209 @@ class BaseLLMService:
             temperature=config_override.temperature,
             timeout=config_override.timeout if config_override.timeout is not None else self._default_config.timeout,
             max_retries=config_override.max_retries if config_override.max_retries is not None else self._default_config.max_retries,
+            cache_ttl=config_override.cache_ttl if config_override.cache_ttl is not None else self._default_config.cache_ttl,
+            weight=config_override.weight if config_override.weight is not None else self._default_config.weight,
+        )
+
+    def _build_messages(self, system_prompt: str, user_content: str) -> list[dict]:
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content},
+        ]
+
+    async def complete_json_async(
+        self,
+        system_prompt: str,
+        user_content: str,
+        config_override: LLMConfig | None = None,
+        validate: Callable[[dict], Any] | None = None,
+    ) -> dict:
+        """Async variant of complete_json backed by AsyncOpenAI.
+
+        Awaiting this does not block the event loop, so concurrent requests
+        (and concurrent translation batches) overlap while OpenAI is working.
+        Arguments, retry semantics and raised exceptions match complete_json.
+
+        When config.cache_ttl is set, responses are served from and stored in
+        the shared LLM response cache, keyed by model, temperature and prompts.
+        Concurrent calls with the same key are coalesced into one OpenAI call
+        whose result (or exception) is delivered to every caller. Each attempt
+        first waits for the process-wide token budget, then holds config.weight
+        units of the adaptive limiter; 429s are retried after Retry-After.
+
+        `validate`, if given, is called on the parsed response before it is
+        cached, as in complete_text_async.
+        """
+        def check(content: str) -> None:
+            result = json.loads(content)
+            if validate is not None:
+                validate(result)
+
+        content = await self._complete(
+            system_prompt, user_content, config_override, json_mode=True, validate=check
         )
+        # Each caller parses its own copy so shared results can't be mutated across requests
+        return json.loads(content)
+
+    async def complete_text_async(
+        self,
+        system_prompt: str,
+        user_content: str,
+        config_override: LLMConfig | None = None,
+        validate: Callable[[str], Any] | None = None,
+    ) -> str:
+        """Plain-text completion with the same caching, coalescing and limits
+        as complete_json_async.
+
+        `validate` is called on the response before it is cached; if it
+        raises, nothing is cached and the exception propagates.
+        """
+        return await self._complete(
+            system_prompt, user_content, config_override, json_mode=False, validate=validate
+        )
+
+    async def _complete(
+        self,
+        system_prompt: str,
+        user_content: str,
+        config_override: LLMConfig | None,
+        json_mode: bool,
+        validate: Callable[[str], Any] | None,
+    ) -> str:
+        config = self._resolve_config(config_override)
+        request_key = make_cache_key(config.model, config.temperature, system_prompt, user_content)
+        cache = get_llm_cache() if config.cache_ttl else None
+        if cache is not None:
+            cached = await cache.get(request_key)
+            if cached is not None:
+                logger.debug("llm_cache_hit", model=config.model)
+                return cached
+
+        limiter = get_llm_limiter()
+        budget = get_token_budget()
+        # Prompt plus a response of similar size
+        estimated_tokens = 2 * estimate_tokens(system_prompt + user_content)
+        extra_args = {"response_format": {"type": "json_object"}} if json_mode else {}
+
+        @llm_retry(config.max_retries)
+        async def _do_request() -> str:
+            await budget.acquire(estimated_tokens)
+            async with limiter.slot(config.weight) as slot:
+                try:
+                    response = await self._client.chat.completions.create(
+                        model=config.model,
+                        messages=self._build_messages(system_prompt, user_content),
+                        temperature=config.temperature,
+                        timeout=config.timeout,
+                        **extra_args,
+                    )
+                except RateLimitError as e:
+                    slot.mark_throttled()
+                    retry_after = retry_after_from_exception(e)
+                    if retry_after is not None:
+                        budget.pause_for(retry_after)
+                    raise
+            return response.choices[0].message.content or ("{}" if json_mode else "")
+
+        async def _fetch() -> str:
+            content = await _do_request()
+            if validate is not None:
+                validate(content)  # e.g. raise JSONDecodeError before caching bad output
+            if cache is not None:
+                await cache.set(request_key, content, ttl=config.cache_ttl)
+            return content
+
+        return await llm_singleflight.do(request_key, _fetch)
+
+    async def stream_json(
+        self,
+        system_prompt: str,
+        user_content: str,
+        array_keys: set[str],
+        config_override: LLMConfig | None = None,
+    ) -> AsyncIterator[tuple[str | None, Any]]:
+        """Stream a JSON-mode completion, yielding array elements as they close.
+
+        Yields (key, element) for every element of the top-level arrays named
+        in array_keys as soon as it is complete, then a final (None, result)
+        with the whole parsed object. Cache lookups, the token budget, the
+        adaptive limiter and retries apply as in complete_json_async, except
+        that retries only cover opening the stream and streams are not
+        coalesced. The limiter slot is held until the stream is consumed.
+
+        Raises:
+            Same as complete_json_async; json.JSONDecodeError is raised after
+            the last element if the full document turns out to be invalid.
+        """
+        config = self._resolve_config(config_override)
+        request_key = make_cache_key(config.model, config.temperature, system_prompt, user_content)
+        cache = get_llm_cache() if config.cache_ttl else None
+        if cache is not None:
+            cached = await cache.get(request_key)
+            if cached is not None:
+                logger.debug("llm_cache_hit", model=config.model, stream=True)
+                result = json.loads(cached)
+                for key, value in result.items():
+                    if key in array_keys and isinstance(value, list):
+                        for element in value:
+                            yield key, element
+                yield None, result
+                return
+
+        limiter = get_llm_limiter()
+        budget = get_token_budget()
+        estimated_tokens = 2 * estimate_tokens(system_prompt + user_content)
+
+        @llm_retry(config.max_retries)
+        async def _open_stream():
+            await budget.acquire(estimated_tokens)
+            await limiter.acquire(config.weight)
+            started = time.monotonic()
+            try:
+                return await self._client.chat.completions.create(
+                    model=config.model,
+                    messages=self._build_messages(system_prompt, user_content),
+                    temperature=config.temperature,
+                    response_format={"type": "json_object"},
+                    timeout=config.timeout,
+                    stream=True,
+                )
+            except RateLimitError as e:
+                limiter.release(config.weight)
+                limiter.record(time.monotonic() - started, throttled=True)
+                retry_after = retry_after_from_exception(e)
+                if retry_after is not None:
+                    budget.pause_for(retry_after)
+                raise
+            except BaseException:
+                limiter.release(config.weight)
+                raise
+
+        stream = await _open_stream()
+        started = time.monotonic()
+        parser = JSONArrayStreamParser(array_keys)
+        completed = False
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    for key, element in parser.feed(delta):
+                        yield key, element
+            completed = True
+        finally:
+            limiter.release(config.weight)
+            if completed:
+                limiter.record(time.monotonic() - started)
+            close = getattr(stream, "close", None)
+            if close is not None:
+                await close()
+
+        result = parser.result()
+        if cache is not None:
+            await cache.set(request_key, parser.text, ttl=config.cache_ttl)
+        yield None, result
 
     def complete_json(
         self,
@@ -72,6 +301,8 @@ class BaseLLMService:
     ) -> dict:
         """Call OpenAI chat completions API with JSON mode and retry logic.
 
+        This blocks the calling thread; async code must use complete_json_async.
+
         Args:
             system_prompt: The system message content.
             user_content: The user message content.
@@ -87,26 +318,12 @@ class BaseLLMService:
             json.JSONDecodeError: If the response cannot be parsed as JSON.
         """
         config = self._resolve_config(config_override)
-        settings = get_settings()
 
-        @retry(
-            stop=stop_after_attempt(config.max_retries),
-            wait=wait_exponential(
-                multiplier=settings.retry_base_delay,
-                min=settings.retry_base_delay,
-                max=settings.retry_base_delay * 4,
-            ),
-            retry=retry_if_exception_type((APIConnectionError,)),
-            before_sleep=before_sleep_log(logger, logging.WARNING),
-            reraise=True,
-        )
+        @llm_retry(config.max_retries)
         def _do_request() -> dict:
-            response = self._client.chat.completions.create(
+            response = self.sync_client.chat.completions.create(
                 model=config.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_content},
-                ],
+                messages=self._build_messages(system_prompt, user_content),
                 temperature=config.temperature,
                 response_format={"type": "json_object"},
                 timeout=config.timeout,
@@ -0,0 +1,281 @@
+"""Rate-limit aware retry policy and token budget for OpenAI calls.
+
+OpenAI reports throttling state on every response:
+  - retry-after / retry-after-ms on 429s
+  - x-ratelimit-{limit,remaining,reset}-{requests,tokens} on all responses
+
+The pooled OpenAI http client feeds those headers into a process-wide
+TokenBudget (see clients.py), which paces new calls against the
+tokens-per-minute budget and pauses everyone after a 429. The tenacity wait
+strategy here honours Retry-After instead of guessing with blind backoff.
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass
+
+import httpx
+import structlog
+from openai import APIConnectionError, RateLimitError
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_exponential,
+    retry_if_exception_type,
+    before_sleep_log,
+)
+from tenacity.wait import wait_base
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_reset_duration(value: str | None) -> float | None:
+    """Parse x-ratelimit-reset-* values such as "1s", "6m0s", "20ms" or "1h2m3.5s"."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(num + unit for num, unit in parts) != value:
+        return None
+    return sum(float(num) * _DURATION_UNITS[unit] for num, unit in parts)
+
+
+def parse_retry_after(headers: httpx.Headers | dict | None) -> float | None:
+    """Seconds to wait according to retry-after-ms / retry-after (seconds or HTTP date)."""
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _int_header(headers: httpx.Headers | dict, name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class RateLimitState:
+    """Rate-limit headers from one OpenAI response"""
+
+    limit_tokens: int | None = None
+    remaining_tokens: int | None = None
+    reset_tokens: float | None = None
+    remaining_requests: int | None = None
+    reset_requests: float | None = None
+
+    @classmethod
+    def from_headers(cls, headers: httpx.Headers | dict) -> "RateLimitState":
+        return cls(
+            limit_tokens=_int_header(headers, "x-ratelimit-limit-tokens"),
+            remaining_tokens=_int_header(headers, "x-ratelimit-remaining-tokens"),
+            reset_tokens=parse_reset_duration(headers.get("x-ratelimit-reset-tokens")),
+            remaining_requests=_int_header(headers, "x-ratelimit-remaining-requests"),
+            reset_requests=parse_reset_duration(headers.get("x-ratelimit-reset-requests")),
+        )
+
+
+class TokenBudget:
+    """Process-wide tokens-per-minute bucket, corrected by response headers.
+
+    Capacity comes from Settings.openai_tokens_per_minute or, when that is 0,
+    from the x-ratelimit-limit-tokens header of the first response. Until a
+    capacity is known only explicit pauses (429s, exhausted quotas) apply.
+    """
+
+    def __init__(self, tokens_per_minute: int = 0, max_wait: float = 60.0):
+        self.capacity = float(tokens_per_minute)
+        self.max_wait = max_wait
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self.waits = 0
+        self.wait_time_total = 0.0
+        self.pauses = 0
+
+    @property
+    def available(self) -> float:
+        self._refill(time.monotonic())
+        return self._available
+
+    def _refill(self, now: float) -> None:
+        if self.capacity:
+            rate = self.capacity / 60.0
+            self._available = min(self.capacity, self._available + (now - self._updated) * rate)
+        self._updated = now
+
+    def pause_for(self, seconds: float) -> None:
+        """Hold every new call for `seconds` (e.g. after a 429 with Retry-After)."""
+        until = time.monotonic() + seconds
+        if until > self._paused_until:
+            self._paused_until = until
+            self.pauses += 1
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait until `tokens` fit in the budget; returns seconds waited."""
+        waited = 0.0
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            delay = self._paused_until - now
+            if delay <= 0:
+                needed = min(tokens, self.capacity) if self.capacity else 0
+                if self._available >= needed:
+                    if self.capacity:
+                        self._available -= tokens
+                    break
+                delay = (needed - self._available) / (self.capacity / 60.0)
+            delay = min(delay, self.max_wait - waited)
+            if delay <= 0:
+                # Waited long enough; let the call through and let OpenAI decide
+                break
+            # Jitter so callers released together don't arrive together
+            delay += random.uniform(0, min(0.25, delay * 0.1))
+            await asyncio.sleep(delay)
+            waited += delay
+
+        if waited:
+            self.waits += 1
+            self.wait_time_total += waited
+        return waited
+
+    def observe(self, headers: httpx.Headers | dict, status_code: int = 200) -> None:
+        """Update the budget from an OpenAI response's headers."""
+        state = RateLimitState.from_headers(headers)
+        now = time.monotonic()
+        self._refill(now)
+
+        if state.limit_tokens and not self.capacity:
+            self.capacity = float(state.limit_tokens)
+            self._available = self.capacity
+        if state.remaining_tokens is not None and self.capacity:
+            # The server's view already includes other workers sharing the key
+            self._available = min(self._available, float(state.remaining_tokens))
+
+        if status_code == 429:
+            retry_after = parse_retry_after(headers)
+            self.pause_for(retry_after if retry_after is not None else get_settings().retry_base_delay)
+        elif state.remaining_requests == 0 and state.reset_requests:
+            self.pause_for(state.reset_requests)
+        elif state.remaining_tokens == 0 and state.reset_tokens:
+            self.pause_for(state.reset_tokens)
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            "tokens_per_minute": int(self.capacity),
+            "available_tokens": int(self.available),
+            "paused_for_seconds": round(max(0.0, self._paused_until - now), 3),
+            "pauses": self.pauses,
+            "waits": self.waits,
+            "wait_time_total_seconds": round(self.wait_time_total, 3),
+        }
+
+
+_token_budget: TokenBudget | None = None
+
+
+def get_token_budget() -> TokenBudget:
+    """Return the process-wide OpenAI token budget."""
+    global _token_budget
+    if _token_budget is None:
+        settings = get_settings()
+        _token_budget = TokenBudget(
+            tokens_per_minute=settings.openai_tokens_per_minute,
+            max_wait=settings.retry_deadline,
+        )
+    return _token_budget
+
+
+def reset_token_budget() -> None:
+    """Drop the process-wide budget (tests)."""
+    global _token_budget
+    _token_budget = None
+
+
+async def record_rate_limit_headers(response: httpx.Response) -> None:
+    """httpx response hook for the pooled OpenAI client."""
+    get_token_budget().observe(response.headers, response.status_code)
+
+
+def record_rate_limit_headers_sync(response: httpx.Response) -> None:
+    """The same hook for the blocking client behind BaseLLMService.complete_json."""
+    get_token_budget().observe(response.headers, response.status_code)
+
+
+def retry_after_from_exception(exc: BaseException | None) -> float | None:
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    return parse_retry_after(response.headers)
+
+
+class wait_retry_after(wait_base):
+    """Wait for the server's Retry-After when present, else fall back to backoff."""
+
+    def __init__(self, fallback: wait_base, max_wait: float):
+        self.fallback = fallback
+        self.max_wait = max_wait
+
+    def __call__(self, retry_state) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        delay = retry_after_from_exception(exc)
+        if delay is None:
+            return self.fallback(retry_state)
+        return min(delay + random.uniform(0, 0.25), self.max_wait)
+
+
+def llm_retry(max_attempts: int):
+    """Tenacity decorator for one logical OpenAI request.
+
+    Retries connection errors and 429s. Attempts are capped by max_attempts and
+    the whole request by Settings.retry_deadline, so nested callers must not
+    add retries of their own.
+    """
+    settings = get_settings()
+    return retry(
+        stop=stop_after_attempt(max_attempts) | stop_after_delay(settings.retry_deadline),
+        wait=wait_retry_after(
+            fallback=wait_exponential(
+                multiplier=settings.retry_base_delay,
+                min=settings.retry_base_delay,
+                max=settings.retry_base_delay * 4,
+            ),
+            max_wait=settings.retry_max_delay,
+        ),
+        retry=retry_if_exception_type((APIConnectionError, RateLimitError)),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
@@ -0,0 +1,81 @@
+"""Single-flight coalescing of identical in-flight async calls"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for a SingleFlight group"""
+
+    leaders: int = 0  # calls that actually executed
+    coalesced: int = 0  # calls that joined an in-flight execution
+    abandoned: int = 0  # executions cancelled because every waiter left
+
+
+@dataclass
+class SingleFlight:
+    """Run at most one execution per key; concurrent callers share its result.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task. Exceptions propagate to every waiter.
+    A waiter that is cancelled (e.g. client disconnect) only detaches itself;
+    the shared work is cancelled once no waiters remain, and the next caller
+    for that key starts a fresh execution.
+    """
+
+    name: str
+    stats: SingleFlightStats = field(default_factory=SingleFlightStats)
+    _calls: dict[str, _Call] = field(default_factory=dict)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.stats.leaders += 1
+        else:
+            self.stats.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+                # The task may take a while to unwind; new callers must not join it
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                self.stats.abandoned += 1
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception as retrieved when no waiter was left to see it
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def snapshot(self) -> dict:
+        return {
+            "leaders": self.stats.leaders,
+            "coalesced": self.stats.coalesced,
+            "abandoned": self.stats.abandoned,
+            "in_flight": self.in_flight,
+        }
@@ -1,6 +1,7 @@
 """STT provider abstraction"""
 
+from .audio import AudioSource, AudioStream, AudioStreamError
 from .base import STTProvider, STTResult
 from .factory import get_stt_provider
 
-__all__ = ["STTProvider", "STTResult", "get_stt_provider"]
+__all__ = ["AudioSource", "AudioStream", "AudioStreamError", "STTProvider", "STTResult", "get_stt_provider"]
@@ -0,0 +1,162 @@
+"""Audio payloads passed to STT providers without holding them in memory"""
+
+import asyncio
+import io
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, BinaryIO, Callable
+
+# Read size for streaming audio to the STT backend
+AUDIO_CHUNK_SIZE = 256 * 1024
+
+
+@dataclass
+class AudioSource:
+    """Seekable audio file (spooled upload, temp file or in-memory bytes).
+
+    Providers stream it with iter_chunks(); each call starts from the
+    beginning, so a retried request re-sends the whole file.
+    """
+
+    file: BinaryIO
+    size: int
+    filename: str = "audio.webm"
+    content_type: str = "application/octet-stream"
+    # Set when the file already lives on disk under a name ffmpeg can open
+    path: str | None = None
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        filename: str = "audio.webm",
+        content_type: str | None = None,
+    ) -> "AudioSource":
+        return cls(io.BytesIO(data), len(data), filename, content_type or "application/octet-stream")
+
+    @classmethod
+    def from_path(cls, path: str, filename: str | None = None, content_type: str | None = None) -> "AudioSource":
+        return cls(
+            open(path, "rb"),
+            os.path.getsize(path),
+            filename or os.path.basename(path),
+            content_type or "application/octet-stream",
+            path=path,
+        )
+
+    @property
+    def in_memory(self) -> bool:
+        return isinstance(self.file, io.BytesIO)
+
+    async def _read(self, size: int) -> bytes:
+        # Disk-backed reads go to a thread so they don't stall the event loop
+        if self.in_memory:
+            return self.file.read(size)
+        return await asyncio.to_thread(self.file.read, size)
+
+    async def iter_chunks(self, chunk_size: int = AUDIO_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """The file from the start, chunk_size bytes at a time"""
+        self.file.seek(0)
+        while chunk := await self._read(chunk_size):
+            yield chunk
+
+    async def read(self) -> bytes:
+        """Whole file as bytes, for providers that can't stream"""
+        self.file.seek(0)
+        return await self._read(-1)
+
+    async def save_to(self, path: str) -> None:
+        """Copy the file to `path` chunk by chunk"""
+        with open(path, "wb") as out:
+            async for chunk in self.iter_chunks():
+                await asyncio.to_thread(out.write, chunk)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class AudioStreamError(Exception):
+    """The source of an AudioStream failed while it was being read"""
+
+
+@dataclass
+class AudioStream:
+    """Audio that is read once, as it arrives (e.g. while still downloading).
+
+    Unlike AudioSource it can't be seeked or re-read, so it can't be hashed
+    or retried. `size` is None when the length isn't known up front.
+    """
+
+    chunks: AsyncIterator[bytes]
+    size: int | None = None
+    filename: str = "audio.webm"
+    content_type: str = "application/octet-stream"
+    consumed: bool = False
+    # Releases the source (connections, background tasks) whether or not it was read
+    on_close: Callable[[], Awaitable[None]] | None = None
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        if self.consumed:
+            raise RuntimeError("AudioStream can only be read once")
+        self.consumed = True
+        async for chunk in self.chunks:
+            yield chunk
+
+    async def spool(self, max_memory: int = 8 * 1024 * 1024) -> AudioSource:
+        """Collect the stream into a seekable AudioSource (in memory, then on disk)"""
+        out = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        try:
+            async for chunk in self.iter_chunks():
+                # May spill to disk, so off the event loop
+                await asyncio.to_thread(out.write, chunk)
+        except BaseException:
+            out.close()
+            raise
+        size = out.tell()
+        out.seek(0)
+        return AudioSource(out, size, self.filename, self.content_type)
+
+    async def aclose(self) -> None:
+        if self.on_close is not None:
+            await self.on_close()
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", " ").replace("\n", " ")
+
+
+def multipart_stream(
+    fields: dict[str, str],
+    file_field: str,
+    audio: "AudioSource | AudioStream",
+) -> tuple[dict[str, str], AsyncIterator[bytes]]:
+    """multipart/form-data body that streams the audio file.
+
+    Returns (headers, body). The Content-Length is computed up front from
+    the known file size, so the backend sees a regular (not chunked)
+    upload while the file is read one chunk at a time. A stream of unknown
+    size is sent with chunked transfer encoding instead.
+    """
+    boundary = uuid.uuid4().hex
+    head = b"".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{_quote(name)}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items()
+    )
+    head += (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{_quote(file_field)}"; '
+        f'filename="{_quote(audio.filename)}"\r\nContent-Type: {audio.content_type}\r\n\r\n'
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        async for chunk in audio.iter_chunks():
+            yield chunk
+        yield tail
+
+    headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    if audio.size is not None:
+        headers["Content-Length"] = str(len(head) + audio.size + len(tail))
+    return headers, body()
@@ -0,0 +1,166 @@
+"""Load balancing across several WhisperX backends.
+
+STT_API_URL may list several backends (comma-separated). Each request goes
+to the backend with the least outstanding work, counted as the bytes of
+audio it is currently transcribing, so one long file weighs more than a
+short clip. Failures are tracked passively from real requests: a backend
+that fails `max_failures` times in a row is ejected for a while (longer
+each time it is ejected again) and only gets traffic back afterwards, or
+when every backend is ejected.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+
+import structlog
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+
+_stt_backend_pool: "STTBackendPool | None" = None
+
+# Weight of the newest sample in the latency moving average
+LATENCY_EWMA_ALPHA = 0.3
+
+
+@dataclass
+class STTBackend:
+    """One WhisperX server and its live counters"""
+
+    url: str
+    outstanding: int = 0
+    outstanding_bytes: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    latency_ewma: float | None = None
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def snapshot(self, now: float) -> dict:
+        return {
+            "url": self.url,
+            "outstanding": self.outstanding,
+            "outstanding_mb": round(self.outstanding_bytes / 1024 / 1024, 2),
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejected": self.is_ejected(now),
+            "ejections": self.ejections,
+            "latency_ewma_seconds": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+        }
+
+
+class STTBackendPool:
+    """Least-outstanding-bytes selection with passive health checks"""
+
+    def __init__(
+        self,
+        urls: list[str],
+        max_failures: int = 3,
+        ejection_seconds: float = 30.0,
+        max_ejection_seconds: float = 300.0,
+    ):
+        if not urls:
+            raise ValueError("At least one STT backend URL is required")
+        self.backends = [STTBackend(url.rstrip("/")) for url in urls]
+        self.max_failures = max(1, max_failures)
+        self.ejection_seconds = ejection_seconds
+        self.max_ejection_seconds = max_ejection_seconds
+
+    def pick(self, exclude: set[str] | frozenset[str] = frozenset()) -> STTBackend:
+        """Backend with the least outstanding work, avoiding `exclude` and ejected ones when possible.
+
+        Ties go to the backend with fewer requests in flight, then lower
+        latency, then at random so equal backends share the load.
+        """
+        now = time.monotonic()
+        candidates = [b for b in self.backends if b.url not in exclude] or self.backends
+        healthy = [b for b in candidates if not b.is_ejected(now)]
+        if not healthy:
+            # Everything is ejected: try the one that comes back first rather than failing outright
+            return min(candidates, key=lambda b: b.ejected_until)
+        return min(
+            healthy,
+            key=lambda b: (
+                b.outstanding_bytes,
+                b.outstanding,
+                b.latency_ewma or 0.0,
+                random.random(),
+            ),
+        )
+
+    def begin(self, backend: STTBackend, size: int) -> None:
+        backend.outstanding += 1
+        backend.outstanding_bytes += size
+        backend.requests += 1
+
+    def release(self, backend: STTBackend, size: int) -> None:
+        """Release the request's share of the backend without judging it (cancelled, or the source failed)"""
+        backend.outstanding -= 1
+        backend.outstanding_bytes -= size
+
+    def end(self, backend: STTBackend, size: int, ok: bool, seconds: float) -> None:
+        """Release the request's share of the backend and record how it went"""
+        self.release(backend, size)
+        if ok:
+            backend.consecutive_failures = 0
+            backend.ejections = 0
+            backend.latency_ewma = (
+                seconds if backend.latency_ewma is None
+                else LATENCY_EWMA_ALPHA * seconds + (1 - LATENCY_EWMA_ALPHA) * backend.latency_ewma
+            )
+            return
+
+        backend.failures += 1
+        backend.consecutive_failures += 1
+        if backend.consecutive_failures >= self.max_failures:
+            # Twice as long for each ejection in a row; one success resets the streak above
+            duration = min(self.ejection_seconds * 2 ** backend.ejections, self.max_ejection_seconds)
+            backend.ejections += 1
+            backend.consecutive_failures = 0
+            backend.ejected_until = time.monotonic() + duration
+            logger.warning(
+                "stt_backend_ejected",
+                url=backend.url,
+                ejection_seconds=duration,
+                failures=backend.failures,
+            )
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {"backends": [b.snapshot(now) for b in self.backends]}
+
+
+def parse_backend_urls(value: str) -> list[str]:
+    """Comma-separated STT_API_URL → list of URLs"""
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+def get_stt_backend_pool() -> STTBackendPool:
+    """Return the process-wide backend pool, created from settings on first use."""
+    global _stt_backend_pool
+    if _stt_backend_pool is None:
+        settings = get_settings()
+        _stt_backend_pool = STTBackendPool(
+            parse_backend_urls(settings.stt_api_url),
+            max_failures=settings.stt_backend_max_failures,
+            ejection_seconds=settings.stt_backend_ejection_seconds,
+            max_ejection_seconds=settings.stt_backend_max_ejection_seconds,
+        )
+    return _stt_backend_pool
+
+
+def peek_stt_backend_pool() -> STTBackendPool | None:
+    """The pool if it has been created, without creating it (for stats)."""
+    return _stt_backend_pool
+
+
+def reset_stt_backend_pool() -> None:
+    """Drop the pool and its counters (shutdown and tests)."""
+    global _stt_backend_pool
+    _stt_backend_pool = None
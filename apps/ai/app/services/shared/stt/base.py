@@ -3,6 +3,8 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 
+from .audio import AudioSource, AudioStream
+
 
 @dataclass
 class STTResult:
@@ -35,3 +37,31 @@ class STTProvider(ABC):
             STTResult with transcription text, language, and segments.
         """
         ...
+
+    async def transcribe_source(
+        self,
+        audio: AudioSource,
+        language: str = "auto",
+    ) -> STTResult:
+        """Transcribe a (possibly disk-backed) audio file.
+
+        Providers that can stream the file to their backend override this;
+        the default reads it into memory and calls transcribe().
+        """
+        return await self.transcribe(await audio.read(), audio.filename, language)
+
+    async def transcribe_stream(
+        self,
+        audio: AudioStream,
+        language: str = "auto",
+    ) -> STTResult:
+        """Transcribe audio that is read once, as it arrives.
+
+        Providers that can send a stream as it is read override this; the
+        default collects it into a spooled file and calls transcribe_source().
+        """
+        source = await audio.spool()
+        try:
+            return await self.transcribe_source(source, language)
+        finally:
+            source.close()
@@ -0,0 +1,258 @@
+"""Chunked transcription: split long audio at silences and transcribe the pieces in parallel"""
+
+import asyncio
+import os
+import re
+import tempfile
+from collections import Counter
+from dataclasses import dataclass
+
+import structlog
+
+from .audio import AudioSource
+from .base import STTProvider, STTResult
+
+logger = structlog.get_logger()
+
+_DURATION = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_SILENCE_START = re.compile(r"silence_start: (-?\d+(?:\.\d+)?)")
+_SILENCE_END = re.compile(r"silence_end: (-?\d+(?:\.\d+)?)")
+
+
+class FFmpegError(RuntimeError):
+    """ffmpeg exited with an error"""
+
+
+@dataclass
+class AudioChunk:
+    """[start, end) of the source audio, in seconds"""
+
+    index: int
+    start: float
+    end: float
+
+
+async def _run_ffmpeg(*args: str) -> str:
+    """Run ffmpeg and return its stderr (where it logs durations and filter output)"""
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-nostdin", *args,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await process.communicate()
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    output = stderr.decode("utf-8", errors="replace")
+    if process.returncode != 0:
+        raise FFmpegError(output.strip().splitlines()[-1] if output.strip() else f"exit code {process.returncode}")
+    return output
+
+
+def parse_silencedetect(output: str) -> tuple[float, list[tuple[float, float]]]:
+    """Duration and (start, end) silences from `-af silencedetect` stderr"""
+    duration = 0.0
+    match = _DURATION.search(output)
+    if match:
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    silences: list[tuple[float, float]] = []
+    start: float | None = None
+    for line in output.splitlines():
+        if (found := _SILENCE_START.search(line)) is not None:
+            start = max(0.0, float(found.group(1)))
+        elif (found := _SILENCE_END.search(line)) is not None and start is not None:
+            silences.append((start, float(found.group(1))))
+            start = None
+    if start is not None and duration:
+        # Silence running to the end of the file
+        silences.append((start, duration))
+    return duration, silences
+
+
+async def probe_audio(path: str, noise_db: int, min_silence: float) -> tuple[float, list[tuple[float, float]]]:
+    """One decoding pass: total duration and the silent stretches"""
+    output = await _run_ffmpeg(
+        "-i", path,
+        "-vn", "-af", f"silencedetect=noise={noise_db}dB:d={min_silence}",
+        "-f", "null", "-",
+    )
+    return parse_silencedetect(output)
+
+
+def plan_chunks(
+    duration: float,
+    silences: list[tuple[float, float]],
+    chunk_seconds: float,
+    overlap_seconds: float,
+    search_seconds: float,
+) -> list[AudioChunk]:
+    """Cut points every ~chunk_seconds, moved to the middle of a nearby silence.
+
+    A cut looks for the silence closest to the target within the last
+    search_seconds before it; cutting there needs no overlap. Without a
+    silence the cut is hard and both sides get overlap_seconds extra audio
+    so a word split at the cut is heard whole by at least one chunk.
+    A remainder of up to 1.25 x chunk_seconds stays one chunk rather than
+    leaving a short tail.
+    """
+    chunks: list[AudioChunk] = []
+    position = 0.0
+    lead_in = 0.0  # Overlap owed to the next chunk's start
+
+    while duration - position > chunk_seconds * 1.25:
+        target = position + chunk_seconds
+        candidates = [
+            (start + end) / 2
+            for start, end in silences
+            if target - search_seconds <= (start + end) / 2 <= target and (start + end) / 2 > position
+        ]
+        if candidates:
+            cut, overlap = max(candidates), 0.0
+        else:
+            cut, overlap = target, overlap_seconds
+        chunks.append(AudioChunk(len(chunks), max(0.0, position - lead_in), min(duration, cut + overlap)))
+        position, lead_in = cut, overlap
+
+    chunks.append(AudioChunk(len(chunks), max(0.0, position - lead_in), duration))
+    return chunks
+
+
+async def extract_chunk(path: str, chunk: AudioChunk, dest: str) -> None:
+    """Decode [start, end) to 16 kHz mono WAV (what the model consumes anyway)"""
+    await _run_ffmpeg(
+        "-y", "-ss", f"{chunk.start:.3f}", "-t", f"{chunk.end - chunk.start:.3f}", "-i", path,
+        "-vn", "-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le", dest,
+    )
+
+
+def _shift(segment: dict, offset: float) -> dict:
+    shifted = {**segment}
+    for key in ("start", "end"):
+        if isinstance(shifted.get(key), (int, float)):
+            shifted[key] = round(shifted[key] + offset, 3)
+    if isinstance(shifted.get("words"), list):
+        shifted["words"] = [_shift(word, offset) for word in shifted["words"]]
+    return shifted
+
+
+def _same_text(a: dict, b: dict) -> bool:
+    return " ".join(a.get("text", "").split()).lower() == " ".join(b.get("text", "").split()).lower()
+
+
+def _midpoint(segment: dict) -> float:
+    return (segment.get("start", 0.0) + segment.get("end", 0.0)) / 2
+
+
+def stitch_segments(chunks: list[AudioChunk], results: list[list[dict]]) -> list[dict]:
+    """Shift each chunk's segments to source time and resolve the overlaps.
+
+    Where two chunks overlap, the seam is the middle of the overlap: the
+    earlier chunk keeps segments centred before it, the later chunk those
+    centred at or after it. A segment repeated on both sides of the seam
+    (same text, overlapping times) is kept once.
+    """
+    stitched: list[dict] = []
+    for position, (chunk, segments) in enumerate(zip(chunks, results)):
+        seam_before = (chunk.start + chunks[position - 1].end) / 2 if position else float("-inf")
+        seam_after = (chunks[position + 1].start + chunk.end) / 2 if position + 1 < len(chunks) else float("inf")
+
+        for segment in segments:
+            shifted = _shift(segment, chunk.start)
+            if not seam_before <= _midpoint(shifted) < seam_after:
+                continue
+            if stitched:
+                last = stitched[-1]
+                if _same_text(last, shifted) and shifted.get("start", 0.0) < last.get("end", 0.0):
+                    continue
+            stitched.append(shifted)
+    return stitched
+
+
+class ChunkedTranscriber:
+    """Transcribe long audio as parallel chunks through an STTProvider"""
+
+    def __init__(
+        self,
+        provider: STTProvider,
+        chunk_seconds: float,
+        overlap_seconds: float = 2.0,
+        search_seconds: float = 30.0,
+        parallelism: int = 4,
+        silence_noise_db: int = -35,
+        min_silence_seconds: float = 0.4,
+    ):
+        self.provider = provider
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.search_seconds = search_seconds
+        self.parallelism = max(1, parallelism)
+        self.silence_noise_db = silence_noise_db
+        self.min_silence_seconds = min_silence_seconds
+
+    async def transcribe(self, audio: AudioSource, language: str = "auto") -> STTResult:
+        """Split, transcribe chunks concurrently and stitch; short audio goes through as is."""
+        with tempfile.TemporaryDirectory(prefix="stt-chunks-") as workdir:
+            path = audio.path
+            if path is None:
+                path = os.path.join(workdir, "source" + os.path.splitext(audio.filename)[1])
+                await audio.save_to(path)
+
+            duration, silences = await probe_audio(path, self.silence_noise_db, self.min_silence_seconds)
+            chunks = plan_chunks(duration, silences, self.chunk_seconds, self.overlap_seconds, self.search_seconds)
+            if len(chunks) == 1:
+                return await self.provider.transcribe_source(audio, language)
+
+            logger.info(
+                "stt_chunked_start",
+                duration=round(duration, 1),
+                chunks=len(chunks),
+                silence_cuts=sum(1 for a, b in zip(chunks, chunks[1:]) if b.start >= a.end),
+                parallelism=self.parallelism,
+            )
+
+            slots = asyncio.Semaphore(self.parallelism)
+
+            async def run(chunk: AudioChunk) -> STTResult:
+                async with slots:
+                    dest = os.path.join(workdir, f"chunk-{chunk.index:04d}.wav")
+                    await extract_chunk(path, chunk, dest)
+                    piece = AudioSource.from_path(dest, content_type="audio/wav")
+                    try:
+                        return await self.provider.transcribe_source(piece, language)
+                    finally:
+                        piece.close()
+                        os.unlink(dest)
+
+            tasks = [asyncio.ensure_future(run(chunk)) for chunk in chunks]
+            try:
+                results = await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # Let cancelled chunks finish with their files before the workdir goes
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return self._merge(chunks, results, language)
+
+    @staticmethod
+    def _merge(chunks: list[AudioChunk], results: list[STTResult], language: str) -> STTResult:
+        segments = stitch_segments(chunks, [result.segments for result in results])
+
+        # Chunks detect language independently; the one covering the most audio wins
+        spoken = Counter()
+        for chunk, result in zip(chunks, results):
+            spoken[result.language] += chunk.end - chunk.start
+        detected = spoken.most_common(1)[0][0] if spoken else language
+        probabilities = [r.language_probability for r in results if r.language == detected]
+
+        return STTResult(
+            text=" ".join(seg.get("text", "").strip() for seg in segments).strip(),
+            language=detected,
+            language_probability=sum(probabilities) / len(probabilities) if probabilities else 1.0,
+            segments=segments,
+        )
@@ -2,6 +2,7 @@
 
 from app.config import get_settings
 from .base import STTProvider
+from .local_provider import LocalWhisperProvider
 from .whisperx_provider import WhisperXProvider
 
 
@@ -10,7 +11,8 @@ def get_stt_provider(provider_name: str | None = None) -> STTProvider:
 
     Args:
         provider_name: Name of the provider. If None, uses the configured default.
-            Currently supported: "whisperx".
+            Currently supported: "whisperx" (external HTTP API) and
+            "local" (faster-whisper on this host, optional dependency).
 
     Returns:
         An STTProvider instance.
@@ -24,5 +26,7 @@ def get_stt_provider(provider_name: str | None = None) -> STTProvider:
 
     if provider_name == "whisperx":
         return WhisperXProvider()
+    if provider_name == "local":
+        return LocalWhisperProvider()
 
     raise ValueError(f"Unknown STT provider: {provider_name}")
@@ -0,0 +1,269 @@
+"""Local CPU STT provider — faster-whisper (CTranslate2) in a process pool.
+
+faster-whisper is an optional dependency (`pip install faster-whisper`),
+needed only with STT_PROVIDER=local. Each worker process loads the model
+once, in the pool initializer, and then serves jobs; the pool is started
+with the app so the first request doesn't pay for model loading.
+"""
+
+import asyncio
+import importlib.util
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import structlog
+
+from app.config import get_settings
+from app.core.exceptions import STTError
+from .audio import AudioSource
+from .base import STTProvider, STTResult
+
+logger = structlog.get_logger()
+
+_local_whisper_pool: "LocalWhisperPool | None" = None
+
+# Set in each worker process by _init_worker
+_worker_model = None
+
+
+def _init_worker(model: str, compute_type: str, cpu_threads: int, download_root: str, ready) -> None:
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(
+        model,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        download_root=download_root or None,
+    )
+    ready.release()
+
+
+def _noop() -> None:
+    return None
+
+
+def _transcribe_file(path: str, language: str, beam_size: int) -> dict:
+    """Runs in a worker: transcribe the file at `path` with the preloaded model"""
+    started = time.perf_counter()
+    segments, info = _worker_model.transcribe(
+        path,
+        language=None if language == "auto" else language,
+        beam_size=beam_size,
+    )
+    # segments is a generator; decoding happens while it is consumed
+    items = [
+        {"start": round(seg.start, 3), "end": round(seg.end, 3), "text": seg.text.strip()}
+        for seg in segments
+    ]
+    return {
+        "text": " ".join(item["text"] for item in items).strip(),
+        "language": info.language,
+        "language_probability": info.language_probability,
+        "segments": items,
+        "duration": info.duration,
+        "processing_seconds": time.perf_counter() - started,
+    }
+
+
+class LocalWhisperPool:
+    """Process pool of preloaded models with a bounded number of pending jobs.
+
+    At most `workers` jobs run at once and `queue_size` more wait; further
+    requests are rejected with 503 instead of queueing without bound.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        compute_type: str = "int8",
+        workers: int = 2,
+        cpu_threads: int = 4,
+        queue_size: int = 8,
+        beam_size: int = 5,
+        download_root: str = "",
+    ):
+        self.model = model
+        self.compute_type = compute_type
+        self.workers = max(1, workers)
+        self.cpu_threads = cpu_threads
+        self.capacity = self.workers + max(0, queue_size)
+        self.beam_size = beam_size
+        self.download_root = download_root
+        self._executor: ProcessPoolExecutor | None = None
+        self._ready = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+        self.processing_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: workers must not inherit the event loop or CTranslate2 thread state
+            context = multiprocessing.get_context("spawn")
+            # Released by each worker once its model is loaded
+            self._ready = context.Semaphore(0)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.model, self.compute_type, self.cpu_threads, self.download_root, self._ready),
+            )
+        return self._executor
+
+    async def start(self, timeout: float = 600.0) -> None:
+        """Start every worker and wait until each has loaded the model"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        started = time.perf_counter()
+        # Jobs submitted while no worker is idle make the pool spawn one each
+        jobs = [loop.run_in_executor(executor, _noop) for _ in range(self.workers)]
+        ready = self._ready
+
+        def wait_all() -> bool:
+            deadline = time.monotonic() + timeout
+            return all(ready.acquire(timeout=max(0.0, deadline - time.monotonic())) for _ in range(self.workers))
+
+        # A worker whose initializer fails (e.g. unknown model) breaks the pool here
+        await asyncio.gather(*jobs)
+        loaded = await asyncio.to_thread(wait_all)
+        if not loaded:
+            raise RuntimeError(f"Local STT workers did not load {self.model} within {timeout}s")
+        logger.info(
+            "local_stt_pool_ready",
+            model=self.model,
+            compute_type=self.compute_type,
+            workers=self.workers,
+            cpu_threads=self.cpu_threads,
+            startup_seconds=round(time.perf_counter() - started, 2),
+        )
+
+    async def transcribe(self, path: str, language: str) -> dict:
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            raise STTError(
+                message="STT 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요",
+                unavailable=True,
+                details={"pending": self.pending, "capacity": self.capacity},
+            )
+
+        self.pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), _transcribe_file, path, language, self.beam_size
+            )
+        except BrokenProcessPool as e:
+            # A worker died (e.g. out of memory); the next job gets a fresh pool
+            self.failed += 1
+            self.close()
+            raise STTError(message="로컬 STT 워커가 종료되었습니다", unavailable=True, details={"error": str(e)})
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        self.audio_seconds += result["duration"]
+        self.processing_seconds += result["processing_seconds"]
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "model": self.model,
+            "workers": self.workers,
+            "cpu_threads": self.cpu_threads,
+            "pending": self.pending,
+            "capacity": self.capacity,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "audio_seconds": round(self.audio_seconds, 1),
+            "processing_seconds": round(self.processing_seconds, 1),
+            "real_time_factor": round(self.processing_seconds / self.audio_seconds, 4) if self.audio_seconds else None,
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def get_local_whisper_pool() -> LocalWhisperPool:
+    """Return the process-wide worker pool, created from settings on first use."""
+    global _local_whisper_pool
+    if _local_whisper_pool is None:
+        if importlib.util.find_spec("faster_whisper") is None:
+            raise RuntimeError("STT_PROVIDER=local requires faster-whisper (pip install faster-whisper)")
+        settings = get_settings()
+        _local_whisper_pool = LocalWhisperPool(
+            model=settings.stt_local_model,
+            compute_type=settings.stt_local_compute_type,
+            workers=settings.stt_local_workers,
+            cpu_threads=settings.stt_local_cpu_threads,
+            queue_size=settings.stt_local_queue_size,
+            beam_size=settings.stt_local_beam_size,
+            download_root=settings.stt_local_model_dir,
+        )
+    return _local_whisper_pool
+
+
+def peek_local_whisper_pool() -> LocalWhisperPool | None:
+    """The pool if it has been created, without creating it (for stats)."""
+    return _local_whisper_pool
+
+
+def reset_local_whisper_pool() -> None:
+    """Shut the workers down and drop the instance (shutdown and tests)."""
+    global _local_whisper_pool
+    if _local_whisper_pool is not None:
+        _local_whisper_pool.close()
+    _local_whisper_pool = None
+
+
+class LocalWhisperProvider(STTProvider):
+    """STTProvider that transcribes on this host's CPUs with faster-whisper."""
+
+    def __init__(self, pool: LocalWhisperPool | None = None):
+        self._pool = pool
+
+    @property
+    def pool(self) -> LocalWhisperPool:
+        """Injected pool, or the process-wide one."""
+        return self._pool or get_local_whisper_pool()
+
+    async def transcribe(
+        self,
+        audio_data: bytes,
+        filename: str = "audio.webm",
+        language: str = "auto",
+    ) -> STTResult:
+        return await self.transcribe_source(AudioSource.from_bytes(audio_data, filename), language)
+
+    async def transcribe_source(
+        self,
+        audio: AudioSource,
+        language: str = "auto",
+    ) -> STTResult:
+        """Transcribe in a worker process; the worker reads the file by path.
+
+        Raises STTError (503) when the job queue is full or a worker died.
+        """
+        if audio.path is not None:
+            result = await self.pool.transcribe(audio.path, language)
+        else:
+            suffix = os.path.splitext(audio.filename)[1]
+            with tempfile.NamedTemporaryFile(prefix="stt-local-", suffix=suffix) as f:
+                await audio.save_to(f.name)
+                result = await self.pool.transcribe(f.name, language)
+
+        return STTResult(
+            text=result["text"],
+            language=result["language"],
+            language_probability=result["language_probability"],
+            segments=result["segments"],
+        )
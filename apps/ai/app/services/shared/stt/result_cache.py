@@ -0,0 +1,105 @@
+"""STT results keyed by the audio content.
+
+The same file is often uploaded again (users retrying, gateway retries
+after a timeout). Results are stored under
+(SHA-256 of the audio, provider, language hint, cache version), so a
+re-upload costs one pass over the file instead of a transcription.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import asdict
+from typing import BinaryIO
+
+from app.config import get_settings
+from app.services.shared.cache import TieredCache
+from .audio import AudioSource
+from .base import STTResult
+
+# Bump when the stored STTResult layout changes
+STT_CACHE_VERSION = "v1"
+# Large reads keep the hash loop cheap; hashlib releases the GIL on each update
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_stt_result_cache: "STTResultCache | None" = None
+
+
+def _sha256_file(file: BinaryIO) -> str:
+    digest = hashlib.sha256()
+    file.seek(0)
+    while chunk := file.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+async def hash_audio(audio: AudioSource) -> str:
+    """Streaming SHA-256 of the audio file, computed off the event loop"""
+    return await asyncio.to_thread(_sha256_file, audio.file)
+
+
+def make_stt_cache_key(audio_hash: str, provider: str, language: str) -> str:
+    return json.dumps([STT_CACHE_VERSION, provider, language, audio_hash], separators=(",", ":"))
+
+
+class STTResultCache:
+    """STTResult lookups/stores on top of a TieredCache, plus hashing counters"""
+
+    def __init__(self, cache: TieredCache, ttl: int):
+        self.cache = cache
+        self.ttl = ttl
+        self.hashed_bytes = 0
+        self.hash_seconds = 0.0
+
+    async def make_key(self, audio: AudioSource, provider: str, language: str) -> str:
+        started = time.perf_counter()
+        audio_hash = await hash_audio(audio)
+        self.hash_seconds += time.perf_counter() - started
+        self.hashed_bytes += audio.size
+        return make_stt_cache_key(audio_hash, provider, language)
+
+    async def get(self, key: str) -> STTResult | None:
+        value = await self.cache.get(key)
+        return STTResult(**json.loads(value)) if value is not None else None
+
+    async def set(self, key: str, result: STTResult) -> None:
+        await self.cache.set(key, json.dumps(asdict(result), ensure_ascii=False), ttl=self.ttl)
+
+    def snapshot(self) -> dict:
+        return {
+            **self.cache.snapshot(),
+            "hashed_bytes": self.hashed_bytes,
+            "hash_seconds": round(self.hash_seconds, 3),
+        }
+
+    def close(self) -> None:
+        self.cache.close()
+
+
+def get_stt_result_cache() -> STTResultCache | None:
+    """Return the process-wide STT result cache, or None if disabled."""
+    global _stt_result_cache
+    settings = get_settings()
+    if not settings.stt_cache_enabled:
+        return None
+    if _stt_result_cache is None:
+        _stt_result_cache = STTResultCache(
+            TieredCache(
+                namespace="stt_results",
+                max_bytes=settings.stt_cache_max_bytes,
+                sqlite_path=settings.stt_cache_sqlite_path,
+                sqlite_max_entries=settings.stt_cache_sqlite_max_entries,
+            ),
+            ttl=settings.stt_cache_ttl,
+        )
+    return _stt_result_cache
+
+
+def reset_stt_result_cache() -> None:
+    """Drop the process-wide instance (shutdown and tests)."""
+    global _stt_result_cache
+    if _stt_result_cache is not None:
+        _stt_result_cache.close()
+    _stt_result_cache = None
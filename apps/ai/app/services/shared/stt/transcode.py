@@ -0,0 +1,218 @@
+"""Transcoding audio to compact 16 kHz mono Opus before it is sent for STT.
+
+Whisper-family models resample everything to 16 kHz mono, so a 128-160
+kbps stereo upload carries several times more bytes than the model uses.
+ffmpeg reads the source where it already is (its path, the spooled
+upload's file descriptor, or a pipe fed chunk by chunk for in-memory
+bytes) and its Opus output is collected in a spooled file, so the source
+is never copied and no decoded copy is ever written out.
+"""
+
+import asyncio
+import io
+import os
+import tempfile
+
+import structlog
+
+from .audio import AUDIO_CHUNK_SIZE, AudioSource, AudioStream, AudioStreamError
+from .base import STTProvider, STTResult
+from .chunking import FFmpegError
+
+logger = structlog.get_logger()
+
+# Opus output stays in memory up to this size, then spills to disk
+TRANSCODE_SPOOL_BYTES = 8 * 1024 * 1024
+SAMPLE_RATE = 16000
+# libopus defaults to its slowest, highest-quality search (10); at speech
+# bitrates level 1 is 2x faster and the recognizer doesn't notice
+OPUS_COMPRESSION_LEVEL = 1
+
+
+def _opus_command(source: str, bitrate_kbps: int) -> list[str]:
+    return [
+        # -xerror: a truncated or unseekable input fails instead of yielding empty output
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-xerror", "-i", source,
+        "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-c:a", "libopus", "-b:a", f"{bitrate_kbps}k", "-application", "voip",
+        "-compression_level", str(OPUS_COMPRESSION_LEVEL),
+        "-f", "ogg", "pipe:1",
+    ]
+
+
+def _ffmpeg_error(returncode: int, stderr: bytes) -> FFmpegError:
+    message = stderr.decode("utf-8", errors="replace").strip()
+    return FFmpegError(message.splitlines()[-1] if message else f"exit code {returncode}")
+
+
+async def _feed(stdin: asyncio.StreamWriter, audio: AudioSource | AudioStream) -> None:
+    try:
+        async for chunk in audio.iter_chunks():
+            stdin.write(chunk)
+            await stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # ffmpeg stopped reading (bad input); its exit code tells why
+        pass
+    finally:
+        stdin.close()
+
+
+async def _collect(stdout: asyncio.StreamReader, out) -> None:
+    while chunk := await stdout.read(AUDIO_CHUNK_SIZE):
+        out.write(chunk)
+
+
+def _source_fd(audio: AudioSource) -> int | None:
+    """Descriptor of a disk-backed file object (e.g. a spooled upload), if any"""
+    if audio.in_memory:
+        return None
+    try:
+        return audio.file.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+async def transcode_to_opus(audio: AudioSource, bitrate_kbps: int) -> AudioSource:
+    """Re-encode `audio` as 16 kHz mono Ogg/Opus at `bitrate_kbps`.
+
+    ffmpeg opens files on disk by path or through /dev/fd (it needs to
+    seek in MP4/M4A, whose index is often at the end); only in-memory
+    bytes are piped through stdin. Raises FileNotFoundError without
+    ffmpeg and FFmpegError when the input can't be decoded.
+    """
+    fd = None if audio.path else _source_fd(audio)
+    if audio.path:
+        source = audio.path
+    elif fd is not None:
+        source = f"/dev/fd/{fd}"
+    else:
+        source = "pipe:0"
+    piped = source == "pipe:0"
+
+    process = await asyncio.create_subprocess_exec(
+        *_opus_command(source, bitrate_kbps),
+        stdin=asyncio.subprocess.PIPE if piped else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        pass_fds=(fd,) if fd is not None else (),
+    )
+
+    out = tempfile.SpooledTemporaryFile(max_size=TRANSCODE_SPOOL_BYTES)
+    tasks = [asyncio.ensure_future(_collect(process.stdout, out)), asyncio.ensure_future(process.stderr.read())]
+    if piped:
+        tasks.append(asyncio.ensure_future(_feed(process.stdin, audio)))
+    try:
+        results = await asyncio.gather(*tasks)
+        await process.wait()
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        out.close()
+        raise
+
+    if process.returncode != 0:
+        out.close()
+        raise _ffmpeg_error(process.returncode, results[1])
+
+    size = out.tell()
+    out.seek(0)
+    stem = os.path.splitext(audio.filename)[0] or "audio"
+    return AudioSource(out, size, f"{stem}.ogg", "audio/ogg")
+
+
+async def _transcoded_chunks(
+    process: asyncio.subprocess.Process,
+    feeder: asyncio.Future,
+    stderr: asyncio.Future,
+):
+    while chunk := await process.stdout.read(AUDIO_CHUNK_SIZE):
+        yield chunk
+    # A source failure ends ffmpeg's input early; report it, not a short transcript
+    await feeder
+    returncode = await process.wait()
+    if returncode != 0:
+        raise AudioStreamError(f"ffmpeg: {_ffmpeg_error(returncode, await stderr)}")
+
+
+class TranscodingProvider(STTProvider):
+    """Wraps a provider so audio is transcoded to compact Opus before it is sent.
+
+    The original is sent instead when ffmpeg is missing, can't decode the
+    file, or the Opus version isn't smaller (already compact input).
+    """
+
+    def __init__(self, provider: STTProvider, bitrate_kbps: int = 24):
+        self.provider = provider
+        self.bitrate_kbps = bitrate_kbps
+
+    async def transcribe(
+        self,
+        audio_data: bytes,
+        filename: str = "audio.webm",
+        language: str = "auto",
+    ) -> STTResult:
+        return await self.transcribe_source(AudioSource.from_bytes(audio_data, filename), language)
+
+    async def transcribe_source(
+        self,
+        audio: AudioSource,
+        language: str = "auto",
+    ) -> STTResult:
+        try:
+            compact = await transcode_to_opus(audio, self.bitrate_kbps)
+        except (FileNotFoundError, FFmpegError) as e:
+            logger.warning("stt_transcode_failed", filename=audio.filename, error=str(e))
+            return await self.provider.transcribe_source(audio, language)
+
+        try:
+            logger.info(
+                "stt_transcoded",
+                filename=audio.filename,
+                original_size=audio.size,
+                transcoded_size=compact.size,
+            )
+            if compact.size >= audio.size:
+                return await self.provider.transcribe_source(audio, language)
+            return await self.provider.transcribe_source(compact, language)
+        finally:
+            compact.close()
+
+    async def transcribe_stream(
+        self,
+        audio: AudioStream,
+        language: str = "auto",
+    ) -> STTResult:
+        """Pipe the stream through ffmpeg and send the Opus output as it is encoded.
+
+        The original stream is sent when ffmpeg is missing. Once reading has
+        started there's no going back: a decode error fails the request with
+        AudioStreamError.
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *_opus_command("pipe:0", self.bitrate_kbps),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError as e:
+            logger.warning("stt_transcode_failed", filename=audio.filename, error=str(e))
+            return await self.provider.transcribe_stream(audio, language)
+
+        feeder = asyncio.ensure_future(_feed(process.stdin, audio))
+        stderr = asyncio.ensure_future(process.stderr.read())
+        stem = os.path.splitext(audio.filename)[0] or "audio"
+        compact = AudioStream(_transcoded_chunks(process, feeder, stderr), None, f"{stem}.ogg", "audio/ogg")
+        try:
+            return await self.provider.transcribe_stream(compact, language)
+        finally:
+            for task in (feeder, stderr):
+                task.cancel()
+                if task.done() and not task.cancelled():
+                    task.exception()  # Already reported through the stream, if at all
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
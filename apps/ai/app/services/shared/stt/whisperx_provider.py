@@ -1,6 +1,8 @@
 """WhisperX STT provider — calls external WhisperX HTTP API"""
 
+import asyncio
 import logging
+import time
 
 import httpx
 import structlog
@@ -13,6 +15,9 @@ from tenacity import (
 )
 
 from app.config import get_settings
+from app.services.shared.clients import get_stt_http_client
+from .audio import AudioSource, AudioStream, AudioStreamError, multipart_stream
+from .backends import STTBackendPool, get_stt_backend_pool
 from .base import STTProvider, STTResult
 
 logger = structlog.get_logger()
@@ -21,13 +26,28 @@ logger = structlog.get_logger()
 class WhisperXProvider(STTProvider):
     """STTProvider implementation that delegates to an external WhisperX API."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient | None = None,
+        backends: STTBackendPool | None = None,
+    ):
         settings = get_settings()
-        self.base_url = settings.stt_api_url
+        self._http_client = http_client
+        self._backends = backends
         self.timeout = settings.timeout_stt
         self.retry_max_attempts = settings.retry_max_attempts
         self.retry_base_delay = settings.retry_base_delay
 
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Injected client, or the process-wide pooled STT client."""
+        return self._http_client or get_stt_http_client()
+
+    @property
+    def backends(self) -> STTBackendPool:
+        """Injected backend pool, or the process-wide one from STT_API_URL."""
+        return self._backends or get_stt_backend_pool()
+
     async def transcribe(
         self,
         audio_data: bytes,
@@ -49,8 +69,60 @@ class WhisperXProvider(STTProvider):
             httpx.ConnectError: On connection failure (after retries).
             httpx.TimeoutException: On timeout (after retries).
         """
-        result = await self._transcribe_with_retry(audio_data, filename, language)
+        return await self.transcribe_source(
+            AudioSource.from_bytes(audio_data, filename, "audio/webm"), language
+        )
 
+    async def transcribe_source(
+        self,
+        audio: AudioSource,
+        language: str = "auto",
+    ) -> STTResult:
+        """Transcribe via external WhisperX API, streaming the file in the request body.
+
+        Raises the same errors as transcribe().
+        """
+        result = await self._transcribe_with_retry(audio, language)
+        return self._to_result(result, language)
+
+    async def transcribe_stream(
+        self,
+        audio: AudioStream,
+        language: str = "auto",
+    ) -> STTResult:
+        """Send the audio to the backend as it is read, in a single attempt.
+
+        A stream can't be replayed, so nothing is retried here. Raises the
+        same errors as transcribe(), or AudioStreamError from the source.
+        """
+        backends = self.backends
+        backend = backends.pick()
+        headers, body = multipart_stream({"language": language}, "audio", audio)
+
+        # Unknown size weighs nothing; the backend is still counted as busy
+        size = audio.size or 0
+        backends.begin(backend, size)
+        started = time.perf_counter()
+        try:
+            response = await self.http_client.post(
+                f"{backend.url}/whisperX/transcribe",
+                content=body,
+                headers=headers,
+                timeout=self.timeout,
+            )
+        except (asyncio.CancelledError, AudioStreamError):
+            # Cancelled, or the source failed: nothing learned about the backend
+            backends.release(backend, size)
+            raise
+        except BaseException:
+            backends.end(backend, size, False, time.perf_counter() - started)
+            raise
+        backends.end(backend, size, response.status_code < 500, time.perf_counter() - started)
+        response.raise_for_status()
+        return self._to_result(response.json(), language)
+
+    @staticmethod
+    def _to_result(result: dict, language: str) -> STTResult:
         return STTResult(
             text=result.get("text", ""),
             language=result.get("language", language),
@@ -60,8 +132,7 @@ class WhisperXProvider(STTProvider):
 
     async def _transcribe_with_retry(
         self,
-        audio_data: bytes,
-        filename: str,
+        audio: AudioSource,
         language: str,
     ) -> dict:
         """Execute transcription with retry logic."""
@@ -82,16 +153,33 @@ class WhisperXProvider(STTProvider):
             reraise=True,
         )
         async def _do_request() -> dict:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                files = {"audio": (filename, audio_data, "audio/webm")}
-                data = {"language": language}
-
-                response = await client.post(
-                    f"{self.base_url}/whisperX/transcribe",
-                    files=files,
-                    data=data,
+            # Retries go to another backend when there is one
+            backend = backends.pick(exclude=tried)
+            tried.add(backend.url)
+            # A fresh body per attempt: the file is re-read from the start
+            headers, body = multipart_stream({"language": language}, "audio", audio)
+
+            backends.begin(backend, audio.size)
+            started = time.perf_counter()
+            try:
+                response = await self.http_client.post(
+                    f"{backend.url}/whisperX/transcribe",
+                    content=body,
+                    headers=headers,
+                    timeout=self.timeout,
                 )
-                response.raise_for_status()
-                return response.json()
-
+            except asyncio.CancelledError:
+                # The caller gave up (sibling chunk failed, client left, shutdown): not the backend's fault
+                backends.release(backend, audio.size)
+                raise
+            except BaseException:
+                backends.end(backend, audio.size, False, time.perf_counter() - started)
+                raise
+            # A 4xx is about the request, not the backend's health
+            backends.end(backend, audio.size, response.status_code < 500, time.perf_counter() - started)
+            response.raise_for_status()
+            return response.json()
+
+        backends = self.backends
+        tried: set[str] = set()
         return await _do_request()
@@ -0,0 +1,15 @@
+"""Cheap token estimates for budgeting (no tokenizer dependency)"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text for OpenAI chat models.
+
+    ASCII text averages about four characters per token; Hangul, kana and
+    CJK characters are closer to one token each, so they are counted
+    individually. Errs on the high side for mixed text.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    other_chars = len(text) - ascii_chars
+    return ascii_chars // 4 + other_chars + 1
@@ -3,19 +3,28 @@
 import json
 import logging
 import asyncio
-from typing import TypedDict
+from collections import deque
+from dataclasses import dataclass, fields, replace
+from typing import AsyncIterator, TypedDict
 from openai import APIConnectionError, RateLimitError, APIStatusError
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-    before_sleep_log,
-)
 
 from app.config import get_settings
 from app.core.exceptions import AIServiceError, ErrorCode
+from app.services.shared.batch_planner import BatchPlan, plan_batches
 from app.services.shared.llm_service import BaseLLMService, LLMConfig
+from app.services.shared.translation_memory import get_translation_memory
+from app.services.shared.translation_units import TranslationUnits, build_units
+from app.services.shared.translation_wire import (
+    CompactFormatError,
+    IncompleteReplyError,
+    ReplyIssues,
+    WireFormat,
+    encode_compact,
+    encode_json,
+    parse_compact,
+    parse_json_translations,
+    require_complete,
+)
 from app.prompts.translation import get_translation_system_prompt
 
 logger = logging.getLogger(__name__)
@@ -34,76 +43,378 @@ class TranslatedSegmentOutput(TypedDict):
     translated_text: str
 
 
+class _FairWindow:
+    """Batch slots shared by several target languages, handed out evenly.
+
+    A plain Semaphore serves waiters FIFO, and each language queues all its
+    batches at once, so languages would finish one after another. Here a
+    freed slot goes to the waiting language with the fewest batches in
+    flight (then the fewest started), so every language makes progress
+    from the start.
+    """
+
+    def __init__(self, size: int):
+        self._free = max(1, size)
+        self._in_use: dict[str, int] = {}
+        self._granted: dict[str, int] = {}
+        self._waiters: dict[str, deque[asyncio.Future]] = {}
+
+    def lane(self, key: str) -> "_FairLane":
+        self._in_use.setdefault(key, 0)
+        self._granted.setdefault(key, 0)
+        self._waiters.setdefault(key, deque())
+        return _FairLane(self, key)
+
+    async def acquire(self, key: str) -> None:
+        if self._free > 0 and not any(self._waiters.values()):
+            self._free -= 1
+            self._in_use[key] += 1
+            self._granted[key] += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[key].append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before cancellation: hand the slot back
+                self.release(key)
+            else:
+                self._waiters[key].remove(future)
+            raise
+
+    def release(self, key: str) -> None:
+        self._in_use[key] -= 1
+        waiting = [k for k, queue in self._waiters.items() if queue]
+        if not waiting:
+            self._free += 1
+            return
+        chosen = min(waiting, key=lambda k: (self._in_use[k], self._granted[k]))
+        self._in_use[chosen] += 1
+        self._granted[chosen] += 1
+        self._waiters[chosen].popleft().set_result(None)
+
+
+class _FairLane:
+    """One language's view of a _FairWindow, used as `async with window:`"""
+
+    def __init__(self, window: _FairWindow, key: str):
+        self._window = window
+        self._key = key
+
+    async def __aenter__(self) -> None:
+        await self._window.acquire(self._key)
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._window.release(self._key)
+
+
+@dataclass
+class TranslationStats:
+    """Per-request counters filled in by translate_segments"""
+
+    # Pre-pass: units actually translated, segments merged into a
+    # neighbour's sentence, repeated texts translated once
+    units: int = 0
+    merged: int = 0
+    duplicates: int = 0
+    memory_hits: int = 0
+    memory_misses: int = 0
+    batch_plan: BatchPlan | None = None
+    # Reconciliation of model replies against the requested ids
+    missing_ids: int = 0
+    duplicate_ids: int = 0
+    out_of_range_ids: int = 0
+    followup_requests: int = 0
+    retranslated: int = 0
+    untranslated: int = 0
+
+    @property
+    def memory_hit_rate(self) -> float:
+        total = self.memory_hits + self.memory_misses
+        return self.memory_hits / total if total else 0.0
+
+    @classmethod
+    def combine(cls, stats: list["TranslationStats"]) -> "TranslationStats":
+        """Counters summed over several runs (e.g. the languages of one request)"""
+        combined = cls(batch_plan=BatchPlan())
+        for item in stats:
+            for f in fields(cls):
+                if f.name != "batch_plan":
+                    setattr(combined, f.name, getattr(combined, f.name) + getattr(item, f.name))
+            if item.batch_plan:
+                combined.batch_plan.batches.extend(item.batch_plan.batches)
+                combined.batch_plan.estimated_tokens.extend(item.batch_plan.estimated_tokens)
+                combined.batch_plan.token_target = item.batch_plan.token_target
+                combined.batch_plan.max_segments = item.batch_plan.max_segments
+        return combined
+
+
 def chunk_array(array: list, size: int) -> list[list]:
     """Split array into chunks of specified size"""
     return [array[i:i + size] for i in range(0, len(array), size)]
 
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=1, max=10),
-    retry=retry_if_exception_type((APIConnectionError, RateLimitError)),
-    before_sleep=before_sleep_log(logger, logging.WARNING),
-)
-async def translate_batch(
+def build_batch_prompt(texts: list[str], context_text: str, wire_format: WireFormat) -> str:
+    """User message for one batch in the given wire format"""
+    body = encode_compact(texts) if wire_format == "compact" else encode_json(texts)
+    if context_text:
+        return f'이전 문맥: "{context_text}"\n\n번역할 자막:\n{body}'
+    return f"번역할 자막:\n{body}"
+
+
+async def _request_compact(
     llm: BaseLLMService,
-    segments: list[SegmentInput],
+    texts: list[str],
     source_language: str,
     target_language: str,
-    context_text: str = "",
-) -> list[str]:
-    """Translate a single batch of segments"""
-    segments_json = [{"id": idx, "text": seg["text"]} for idx, seg in enumerate(segments)]
-
-    prompt = (
-        f'이전 문맥: "{context_text}"\n\n번역할 자막:\n{json.dumps(segments_json, ensure_ascii=False, indent=2)}'
-        if context_text
-        else f'번역할 자막:\n{json.dumps(segments_json, ensure_ascii=False, indent=2)}'
-    )
-
-    system_prompt = get_translation_system_prompt(source_language, target_language)
-
+    context_text: str,
+    issues: ReplyIssues,
+    config_override: LLMConfig | None = None,
+) -> dict[int, str] | None:
+    """Ask for "id|text" lines; None if the reply can't be read that way."""
     try:
-        result = llm.complete_json(
-            system_prompt=system_prompt,
-            user_content=prompt,
+        content = await llm.complete_text_async(
+            system_prompt=get_translation_system_prompt(source_language, target_language, "compact"),
+            user_content=build_batch_prompt(texts, context_text, "compact"),
+            config_override=config_override,
+            # Unreadable and incomplete replies are not cached
+            validate=lambda reply: require_complete(reply, parse_compact(reply, len(texts)), len(texts)),
         )
+    except CompactFormatError as e:
+        logger.warning(f"Compact translation reply unusable, retrying with JSON: {e}")
+        return None
+    except IncompleteReplyError as e:
+        content = e.reply
+    return parse_compact(content, len(texts), issues)
 
-        translations = result.get("translations", [])
 
-        # Sort by id and extract text
-        return [
-            next(
-                (t["text"] for t in translations if t["id"] == idx),
-                segments[idx]["text"]  # Fallback to original
+async def _request_translations(
+    llm: BaseLLMService,
+    texts: list[str],
+    source_language: str,
+    target_language: str,
+    context_text: str,
+    wire_format: WireFormat,
+    issues: ReplyIssues,
+    config_override: LLMConfig | None = None,
+) -> dict[int, str]:
+    """One translation request; {} if the reply or the API call failed.
+
+    Connection and rate-limit errors that survive BaseLLMService's retries
+    are re-raised.
+    """
+    try:
+        translations = None
+        if wire_format == "compact":
+            translations = await _request_compact(
+                llm, texts, source_language, target_language, context_text, issues, config_override
             )
-            for idx in range(len(segments))
-        ]
+        if translations is None:
+            try:
+                result = await llm.complete_json_async(
+                    system_prompt=get_translation_system_prompt(source_language, target_language),
+                    user_content=build_batch_prompt(texts, context_text, "json"),
+                    config_override=config_override,
+                    # Incomplete replies are used below but not cached
+                    validate=lambda reply: require_complete(
+                        reply, parse_json_translations(reply, len(texts)), len(texts)
+                    ),
+                )
+            except IncompleteReplyError as e:
+                result = e.reply
+            translations = parse_json_translations(result, len(texts), issues)
+        return translations
 
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse translation response: {e}")
-        return [seg["text"] for seg in segments]
+        return {}
     except (APIConnectionError, RateLimitError):
         raise
     except APIStatusError as e:
         logger.error(f"OpenAI API error: {e}")
-        return [seg["text"] for seg in segments]
+        return {}
+
+
+async def reconcile_batch(
+    llm: BaseLLMService,
+    segments: list[SegmentInput],
+    source_language: str,
+    target_language: str,
+    context_text: str = "",
+    wire_format: WireFormat = "json",
+    stats: TranslationStats | None = None,
+) -> list[str | None]:
+    """Translate a batch and re-request only the ids the model dropped.
+
+    The reply is indexed by id; missing, duplicate and out-of-range ids are
+    counted in `stats`. Only complete replies are stored in the response
+    cache, so a later request with the same batch doesn't get the same gaps
+    back. Missing segments (or the whole batch, if the reply was unusable)
+    are sent once more in follow-up calls of at most half the batch, which
+    bypass the cache entirely. Returns one translation per segment, None
+    where the segment is still untranslated.
+    """
+    stats = stats if stats is not None else TranslationStats()
+    settings = get_settings()
+    texts = [seg["text"] for seg in segments]
+    issues = ReplyIssues()
+
+    translations = await _request_translations(
+        llm, texts, source_language, target_language, context_text, wire_format, issues
+    )
+    missing = [idx for idx in range(len(texts)) if idx not in translations]
+    stats.missing_ids += len(missing)
+    stats.duplicate_ids += len(issues.duplicate_ids)
+    stats.out_of_range_ids += len(issues.out_of_range_ids)
+
+    if missing:
+        logger.warning(
+            f"Translation reply incomplete: missing={len(missing)}/{len(texts)}, "
+            f"duplicate={issues.duplicate_ids}, out_of_range={issues.out_of_range_ids}, "
+            f"malformed={issues.malformed_items}; re-requesting missing segments"
+        )
+        no_cache = replace(llm.default_config, cache_ttl=0)
+        followup_size = max(1, len(texts) // 2)
+
+        async def followup(indices: list[int]) -> None:
+            sub_texts = [texts[idx] for idx in indices]
+            first = indices[0]
+            context = (
+                " ".join(texts[max(0, first - settings.translation_context_size):first])
+                if first > 0
+                else context_text
+            )
+            sub_translations = await _request_translations(
+                llm, sub_texts, source_language, target_language, context, wire_format,
+                ReplyIssues(), no_cache,
+            )
+            for pos, idx in enumerate(indices):
+                if pos in sub_translations:
+                    translations[idx] = sub_translations[pos]
+                    stats.retranslated += 1
+
+        followups = chunk_array(missing, followup_size)
+        stats.followup_requests += len(followups)
+        await asyncio.gather(*(followup(indices) for indices in followups))
+
+    result = [translations.get(idx) for idx in range(len(texts))]
+    stats.untranslated += sum(1 for text in result if text is None)
+    return result
+
+
+async def translate_batch(
+    llm: BaseLLMService,
+    segments: list[SegmentInput],
+    source_language: str,
+    target_language: str,
+    context_text: str = "",
+    wire_format: WireFormat = "json",
+    stats: TranslationStats | None = None,
+) -> list[str]:
+    """Translate a single batch of segments
+
+    wire_format selects the prompt/response protocol (see translation_wire);
+    a compact reply that can't be parsed is re-requested with JSON. Ids the
+    model drops are re-requested once (see reconcile_batch); segments that
+    still have no translation keep their original text.
+
+    Retries (including 429 handling) happen inside BaseLLMService; connection
+    and rate-limit errors that survive them are re-raised.
+    """
+    translations = await reconcile_batch(
+        llm, segments, source_language, target_language, context_text, wire_format, stats
+    )
+    return [
+        text if text is not None else seg["text"]
+        for seg, text in zip(segments, translations)
+    ]
+
+
+def build_context(segments: list[SegmentInput], start: int, context_size: int) -> str:
+    """Source text of the `context_size` segments preceding `start`"""
+    if start <= 0 or context_size <= 0:
+        return ""
+    return " ".join(seg["text"] for seg in segments[max(0, start - context_size):start])
+
+
+def _build_units(segments: list[SegmentInput], merge_fragments: bool | None) -> TranslationUnits:
+    settings = get_settings()
+    return build_units(
+        segments,
+        merge=settings.translation_merge_fragments if merge_fragments is None else merge_fragments,
+        max_chars=settings.translation_merge_max_chars,
+        max_gap=settings.translation_merge_max_gap,
+    )
 
 
 async def translate_segments(
     segments: list[SegmentInput],
     source_language: str = "en",
     target_language: str = "ko",
+    stats: TranslationStats | None = None,
+    wire_format: WireFormat | None = None,
+    merge_fragments: bool | None = None,
 ) -> list[TranslatedSegmentOutput]:
     """
     Translate all segments with batch processing.
 
-    - Processes segments in batches for efficiency
-    - Maintains context across batches
-    - Concurrent batch processing
+    - Identical texts within the request are translated once; with
+      merge_fragments, adjacent fragments are first joined into sentences
+      and the translation is spread back over their original timings
+    - Lines found in the translation memory are not sent to the LLM; new
+      translations are written back
+    - Remaining lines are packed into batches by estimated tokens
+      (translation_batch_token_target), at most translation_batch_size each
+    - Each batch gets the source text preceding it as context, so batches
+      don't depend on each other
+    - Sliding window: up to translation_concurrent_batches batches in flight,
+      the next one starts as soon as any finishes
+    - Ids missing from a reply are re-requested once (reconcile_batch);
+      segments that still fail keep their original text and are counted
+      in stats.untranslated
+    - Results are reassembled in the original order
+    - wire_format picks the batch protocol; None uses translation_wire_format
+    - merge_fragments None uses translation_merge_fragments
+    """
+    return [
+        event["segment"]
+        async for event in iter_translation_events(
+            segments, source_language, target_language, stats, wire_format, merge_fragments
+        )
+        if event["type"] == "segment"
+    ]
+
+
+async def iter_translation_events(
+    segments: list[SegmentInput],
+    source_language: str = "en",
+    target_language: str = "ko",
+    stats: TranslationStats | None = None,
+    wire_format: WireFormat | None = None,
+    merge_fragments: bool | None = None,
+    *,
+    units: TranslationUnits | None = None,
+    window: asyncio.Semaphore | _FairLane | None = None,
+) -> AsyncIterator[dict]:
+    """Run the translate_segments pipeline, yielding results as they land.
+
+    Yields:
+      {"type": "segment", "index": i, "segment": TranslatedSegmentOutput}
+          in timeline order, as soon as segments 0..i are all done (memory
+          hits at the start of the timeline come out before any LLM call)
+      {"type": "progress", "completed_batches", "total_batches",
+       "emitted_segments", "total_segments"}
+          after every finished batch
+
+    Closing the generator early cancels the batches still running.
+    units/window let translate_segments_multi share one pre-pass and one
+    batch budget across target languages.
     """
     if not segments:
-        return []
+        return
+
+    stats = stats if stats is not None else TranslationStats()
 
     logger.info(f"Starting translation: {len(segments)} segments")
 
@@ -114,61 +425,179 @@ async def translate_segments(
             model=settings.openai_model,
             temperature=settings.llm_temperature_article,
             max_retries=settings.retry_max_attempts,
+            cache_ttl=settings.llm_cache_ttl_translation,
+            weight=1,
         )
     )
 
-    batch_size = settings.translation_batch_size
+    plan_units = units or _build_units(segments, merge_fragments)
+    units = plan_units.units
+    stats.units = len(units)
+    stats.merged = plan_units.merged
+    stats.duplicates = plan_units.duplicates
+
+    texts: list[str | None] = [None] * len(units)
+    memory = get_translation_memory()
+    if memory is not None:
+        texts = await memory.lookup(
+            [unit["text"] for unit in units], source_language, target_language
+        )
+    pending = [idx for idx, text in enumerate(texts) if text is None]
+    stats.memory_hits = len(units) - len(pending)
+    stats.memory_misses = len(pending)
+
+    wire_format = wire_format or settings.translation_wire_format
     context_size = settings.translation_context_size
-    concurrent_batches = settings.translation_concurrent_batches
+    window = window or asyncio.Semaphore(max(1, settings.translation_concurrent_batches))
 
-    batches = chunk_array(segments, batch_size)
-    translated_segments: list[TranslatedSegmentOutput] = []
+    plan = plan_batches(
+        [units[idx]["text"] for idx in pending],
+        token_target=settings.translation_batch_token_target,
+        max_segments=settings.translation_batch_size,
+    )
+    batches = [[pending[pos] for pos in batch] for batch in plan.batches]
+    stats.batch_plan = plan
+
+    plan_summary = plan.summary()
+    logger.info(
+        f"Created {len(batches)} batches (segments per batch: {plan_summary['segments_per_batch']}, "
+        f"max estimated tokens: {plan_summary['max_batch_tokens']}, "
+        f"units: {len(units)}/{len(segments)}, memory hits: {stats.memory_hits}/{len(units)})"
+    )
 
-    logger.info(f"Created {len(batches)} batches (size: {batch_size})")
+    async def process_batch(batch_idx: int, indices: list[int]) -> tuple[list[int], list[str | None]]:
+        async with window:
+            logger.debug(f"Translating batch {batch_idx + 1}/{len(batches)}")
+            translations = await reconcile_batch(
+                llm,
+                [units[idx] for idx in indices],
+                source_language,
+                target_language,
+                build_context(units, indices[0], context_size),
+                wire_format,
+                stats,
+            )
+        return indices, translations
+
+    group_texts: dict[int, list[str]] = {}
+
+    def output(idx: int) -> TranslatedSegmentOutput:
+        seg = segments[idx]
+        group_idx = plan_units.segment_group[idx]
+        unit_text = texts[plan_units.group_unit[group_idx]]
+        if unit_text is None:
+            # Untranslated segments keep their original text
+            translated = seg["text"]
+        else:
+            if group_idx not in group_texts:
+                group_texts[group_idx] = plan_units.group_translations(group_idx, segments, unit_text)
+            translated = group_texts[group_idx][plan_units.groups[group_idx].index(idx)]
+        return {
+            "start": seg["start"],
+            "end": seg["end"],
+            "original_text": seg["text"],
+            "translated_text": translated,
+        }
+
+    done = [text is not None for text in texts]
+    emitted = 0
+    tasks = [
+        asyncio.ensure_future(process_batch(batch_idx, indices))
+        for batch_idx, indices in enumerate(batches)
+    ]
+    try:
+        while emitted < len(segments) and done[plan_units.unit_of(emitted)]:
+            yield {"type": "segment", "index": emitted, "segment": output(emitted)}
+            emitted += 1
+
+        for completed, next_batch in enumerate(asyncio.as_completed(tasks), start=1):
+            indices, translations = await next_batch
+            for idx, translated in zip(indices, translations):
+                texts[idx] = translated
+                done[idx] = True
+            logger.info(f"Batch progress: {completed}/{len(batches)}")
+
+            while emitted < len(segments) and done[plan_units.unit_of(emitted)]:
+                yield {"type": "segment", "index": emitted, "segment": output(emitted)}
+                emitted += 1
+            yield {
+                "type": "progress",
+                "completed_batches": completed,
+                "total_batches": len(batches),
+                "emitted_segments": emitted,
+                "total_segments": len(segments),
+            }
+    finally:
+        # A batch failed for good or the consumer went away: stop spending tokens
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if memory is not None and pending:
+        await memory.store(
+            [(units[idx]["text"], texts[idx]) for idx in pending if texts[idx] is not None],
+            source_language,
+            target_language,
+        )
 
-    previous_context = ""
+    if stats.untranslated:
+        logger.warning(
+            f"{stats.untranslated} segments left untranslated "
+            f"(missing ids: {stats.missing_ids}, re-translated: {stats.retranslated})"
+        )
 
-    for i in range(0, len(batches), concurrent_batches):
-        concurrent_batch_group = batches[i:i + concurrent_batches]
+    logger.info(f"Translation completed: {len(segments)} segments")
 
-        # Process batches concurrently
-        async def process_batch(batch: list[SegmentInput], batch_idx: int) -> list[TranslatedSegmentOutput]:
-            absolute_batch_idx = i + batch_idx
-            context = "" if absolute_batch_idx == 0 else previous_context
 
-            logger.debug(f"Translating batch {absolute_batch_idx + 1}/{len(batches)}")
+async def translate_segments_multi(
+    segments: list[SegmentInput],
+    source_language: str = "en",
+    target_languages: list[str] | None = None,
+    stats: dict[str, TranslationStats] | None = None,
+    wire_format: WireFormat | None = None,
+    merge_fragments: bool | None = None,
+) -> dict[str, list[TranslatedSegmentOutput]]:
+    """
+    Translate the same segments into several languages at once.
+
+    The pre-pass runs once and every (language x batch) job shares one
+    window of translation_fanout_concurrent_batches. Free slots go to the
+    language with the fewest batches in flight, so the languages run side
+    by side instead of one after another. stats, if given,
+    receives one TranslationStats per language. Any language failing fails
+    the whole call.
+    """
+    target_languages = target_languages or ["ko"]
+    if not segments:
+        return {language: [] for language in target_languages}
 
-            translations = await translate_batch(
-                llm, batch, source_language, target_language, context
-            )
+    settings = get_settings()
+    units = _build_units(segments, merge_fragments)
+    window = _FairWindow(settings.translation_fanout_concurrent_batches)
+    stats = stats if stats is not None else {}
 
-            return [
-                {
-                    "start": seg["start"],
-                    "end": seg["end"],
-                    "original_text": seg["text"],
-                    "translated_text": translations[idx],
-                }
-                for idx, seg in enumerate(batch)
-            ]
-
-        tasks = [
-            process_batch(batch, batch_idx)
-            for batch_idx, batch in enumerate(concurrent_batch_group)
+    async def run(language: str) -> list[TranslatedSegmentOutput]:
+        stats[language] = TranslationStats()
+        return [
+            event["segment"]
+            async for event in iter_translation_events(
+                segments,
+                source_language,
+                language,
+                stats[language],
+                wire_format,
+                units=units,
+                window=window.lane(language),
+            )
+            if event["type"] == "segment"
         ]
-        results = await asyncio.gather(*tasks)
-
-        for batch_result in results:
-            translated_segments.extend(batch_result)
 
-        # Update context for next batch
-        last_batch = concurrent_batch_group[-1]
-        if last_batch:
-            context_segments = last_batch[-context_size:]
-            previous_context = " ".join(seg["text"] for seg in context_segments)
-
-        logger.info(f"Batch progress: {min(i + concurrent_batches, len(batches))}/{len(batches)}")
-
-    logger.info(f"Translation completed: {len(translated_segments)} segments")
-
-    return translated_segments
+    logger.info(f"Starting fan-out translation: {len(segments)} segments -> {target_languages}")
+    tasks = [asyncio.ensure_future(run(language)) for language in target_languages]
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return dict(zip(target_languages, results))
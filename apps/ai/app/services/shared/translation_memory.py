@@ -0,0 +1,102 @@
+"""Segment-level translation memory shared across requests.
+
+Subtitle lines repeat heavily (intros, "thanks for watching", lyrics,
+catchphrases), so each translated line is stored under
+(normalized source text, source language, target language, prompt version)
+and reused by later requests before anything is sent to the LLM.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+
+from app.config import get_settings
+from app.prompts.translation import TRANSLATION_PROMPT_VERSION
+from app.services.shared.cache import TieredCache
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+_translation_memory: "TranslationMemory | None" = None
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form for memory lookups: NFC, trimmed, single spaces.
+
+    Case and punctuation are kept since they change the translation.
+    """
+    return _WHITESPACE_RUN.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_memory_key(text: str, source_language: str, target_language: str) -> str:
+    payload = json.dumps(
+        [TRANSLATION_PROMPT_VERSION, source_language, target_language, normalize_text(text)],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """Batch lookups/stores of line translations on top of a TieredCache"""
+
+    def __init__(self, cache: TieredCache, ttl: int):
+        self.cache = cache
+        self.ttl = ttl
+
+    async def lookup(
+        self,
+        texts: list[str],
+        source_language: str,
+        target_language: str,
+    ) -> list[str | None]:
+        """Return the remembered translation for each text (None for misses)."""
+        keys = [make_memory_key(t, source_language, target_language) for t in texts]
+        found = await self.cache.get_many(list(dict.fromkeys(keys)))
+        return [found.get(key) for key in keys]
+
+    async def store(
+        self,
+        pairs: list[tuple[str, str]],
+        source_language: str,
+        target_language: str,
+    ) -> None:
+        """Remember (source text, translation) pairs."""
+        items = {
+            make_memory_key(text, source_language, target_language): translated
+            for text, translated in pairs
+        }
+        await self.cache.set_many(list(items.items()), ttl=self.ttl)
+
+    def snapshot(self) -> dict:
+        return self.cache.snapshot()
+
+    def close(self) -> None:
+        self.cache.close()
+
+
+def get_translation_memory() -> TranslationMemory | None:
+    """Return the process-wide translation memory, or None if disabled."""
+    global _translation_memory
+    settings = get_settings()
+    if not settings.translation_memory_enabled:
+        return None
+    if _translation_memory is None:
+        _translation_memory = TranslationMemory(
+            TieredCache(
+                namespace="translation_memory",
+                max_bytes=settings.translation_memory_max_bytes,
+                sqlite_path=settings.translation_memory_sqlite_path,
+                sqlite_max_entries=settings.translation_memory_sqlite_max_entries,
+            ),
+            ttl=settings.translation_memory_ttl,
+        )
+    return _translation_memory
+
+
+def reset_translation_memory() -> None:
+    """Drop the process-wide instance (shutdown and tests)."""
+    global _translation_memory
+    if _translation_memory is not None:
+        _translation_memory.close()
+    _translation_memory = None
@@ -0,0 +1,150 @@
+"""Pre-translation pass: merge STT fragments into sentences and collapse repeats"""
+
+import re
+from dataclasses import dataclass, field
+
+from app.services.shared.translation_memory import normalize_text
+
+# Sentence-final punctuation, optionally followed by closing quotes/brackets
+SENTENCE_END = re.compile(r"[.!?。！？…][\"'”’)\]]*$")
+
+
+@dataclass
+class TranslationUnits:
+    """What actually gets translated, and how it maps back to the input segments.
+
+    Adjacent segments are merged into groups (one group per segment when
+    merging is off); groups with the same normalized text share one unit.
+    """
+
+    units: list[dict] = field(default_factory=list)  # {"start", "end", "text"}
+    groups: list[list[int]] = field(default_factory=list)  # segment indices per group
+    group_unit: list[int] = field(default_factory=list)
+    segment_group: list[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    @property
+    def merged(self) -> int:
+        """Segments folded into a preceding segment's group"""
+        return len(self.segment_group) - len(self.groups)
+
+    @property
+    def duplicates(self) -> int:
+        """Groups served by an earlier group's unit"""
+        return len(self.groups) - len(self.units)
+
+    def unit_of(self, segment_idx: int) -> int:
+        return self.group_unit[self.segment_group[segment_idx]]
+
+    def group_translations(self, group_idx: int, segments: list[dict], translated: str) -> list[str]:
+        """The unit translation spread over the group's segments"""
+        members = self.groups[group_idx]
+        if len(members) == 1:
+            return [translated]
+        return split_translation(translated, [len(segments[idx]["text"]) for idx in members])
+
+
+def _ends_sentence(text: str) -> bool:
+    return bool(SENTENCE_END.search(text.rstrip()))
+
+
+def _merge_groups(segments: list[dict], max_chars: int, max_gap: float) -> list[list[int]]:
+    groups: list[list[int]] = []
+    current: list[int] = []
+    current_chars = 0
+
+    for idx, seg in enumerate(segments):
+        if current:
+            prev = segments[current[-1]]
+            closed = (
+                _ends_sentence(prev["text"])
+                or current_chars + 1 + len(seg["text"]) > max_chars
+                or seg["start"] - prev["end"] > max_gap
+            )
+            if closed:
+                groups.append(current)
+                current, current_chars = [], 0
+        current_chars += len(seg["text"]) + (1 if current else 0)
+        current.append(idx)
+
+    if current:
+        groups.append(current)
+    return groups
+
+
+def build_units(
+    segments: list[dict],
+    merge: bool = False,
+    max_chars: int = 200,
+    max_gap: float = 1.0,
+) -> TranslationUnits:
+    """Group segments into translation units.
+
+    With merge on, consecutive segments are joined until one ends a
+    sentence, the joined text would exceed max_chars, or the pause before
+    the next segment is longer than max_gap seconds. Groups whose
+    normalized text is identical are then translated once.
+    """
+    if merge:
+        groups = _merge_groups(segments, max(1, max_chars), max_gap)
+    else:
+        groups = [[idx] for idx in range(len(segments))]
+
+    plan = TranslationUnits(groups=groups, segment_group=[0] * len(segments))
+    unit_by_text: dict[str, int] = {}
+
+    for group_idx, members in enumerate(groups):
+        for idx in members:
+            plan.segment_group[idx] = group_idx
+        text = " ".join(segments[idx]["text"].strip() for idx in members)
+        key = normalize_text(text)
+        if key not in unit_by_text:
+            unit_by_text[key] = len(plan.units)
+            plan.units.append({
+                "start": segments[members[0]]["start"],
+                "end": segments[members[-1]]["end"],
+                "text": text,
+            })
+        plan.group_unit.append(unit_by_text[key])
+    return plan
+
+
+def split_translation(translated: str, weights: list[int]) -> list[str]:
+    """Cut a translation into len(weights) consecutive parts sized like the sources.
+
+    Cuts fall on spaces when the translation has any (en/ko/...), otherwise
+    between characters (ja/zh). Each cut goes to the boundary closest to the
+    source-proportional position while leaving at least one token for every
+    remaining part; parts can only come out empty when there are fewer
+    tokens than parts.
+    """
+    spaced = any(ch.isspace() for ch in translated.strip())
+    tokens = translated.split() if spaced else list(translated.strip())
+    joiner = " " if spaced else ""
+    parts_count = len(weights)
+
+    # Character offset after each token
+    offsets: list[int] = []
+    position = 0
+    for token in tokens:
+        position += len(token) + (len(joiner) if offsets else 0)
+        offsets.append(position)
+
+    total_weight = sum(weights) or parts_count
+    cuts: list[int] = []
+    cumulative = 0
+    previous = 0
+    for part_idx, weight in enumerate(weights[:-1]):
+        cumulative += weight or 1
+        target = position * cumulative / total_weight
+        remaining = parts_count - part_idx - 1
+        low = min(previous + 1, len(tokens))
+        high = max(low, len(tokens) - remaining)
+        cut = min(range(low, high + 1), key=lambda n: abs(offsets[n - 1] - target) if n else target)
+        cuts.append(cut)
+        previous = cut
+
+    bounds = [0, *cuts, len(tokens)]
+    return [joiner.join(tokens[a:b]) for a, b in zip(bounds, bounds[1:])]
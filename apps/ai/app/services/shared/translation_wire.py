@@ -0,0 +1,136 @@
+"""Wire formats for translation batches.
+
+"json" (default): the batch is sent as a JSON array of {"id", "text"} and
+the model replies {"translations": [{"id", "text"}, ...]}.
+
+"compact": one "id|text" line per segment in both directions. It drops the
+braces, keys, quotes and indentation, which is a large share of the tokens
+for short subtitle lines, and output tokens dominate latency.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Literal
+
+WireFormat = Literal["json", "compact"]
+WIRE_FORMATS: tuple[str, ...] = ("json", "compact")
+
+# "3|text", tolerating "3 | text", "[3] text", "3: text", "3. text", "3) text"
+_COMPACT_LINE = re.compile(r"^\s*\[?(\d+)\]?\s*(\||:|\.|\)|\t|(?<=\])\s)\s*(.*?)\s*$")
+
+
+class CompactFormatError(ValueError):
+    """The model's reply could not be read as compact lines"""
+
+
+class IncompleteReplyError(ValueError):
+    """A readable reply that lacks some ids; raised to keep it out of the
+    response cache, and carries the reply so it can still be used"""
+
+    def __init__(self, reply, found: int, expected: int):
+        super().__init__(f"Reply has {found} of {expected} translations")
+        self.reply = reply
+
+
+def require_complete(reply, translations: dict[int, str], count: int) -> None:
+    """Raise IncompleteReplyError unless every id in range(count) was translated"""
+    if len(translations) < count:
+        raise IncompleteReplyError(reply, len(translations), count)
+
+
+@dataclass
+class ReplyIssues:
+    """Ids in a reply that could not be placed; filled in by the parsers"""
+
+    duplicate_ids: list[int] = field(default_factory=list)
+    out_of_range_ids: list[int] = field(default_factory=list)
+    malformed_items: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.duplicate_ids or self.out_of_range_ids or self.malformed_items)
+
+
+def encode_json(texts: list[str]) -> str:
+    return json.dumps(
+        [{"id": idx, "text": text} for idx, text in enumerate(texts)],
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
+def encode_compact(texts: list[str]) -> str:
+    # Line breaks inside a subtitle would read as a new record
+    return "\n".join(
+        f"{idx}|{text.replace(chr(13), ' ').replace(chr(10), ' ')}"
+        for idx, text in enumerate(texts)
+    )
+
+
+def parse_compact(content: str, count: int, issues: ReplyIssues | None = None) -> dict[int, str]:
+    """Read "id|text" lines into {id: text}, tolerating minor deviations.
+
+    - Markdown code fences and blank lines are ignored
+    - Common separators other than "|" are accepted (see _COMPACT_LINE)
+    - A line without a usable id continues the previous entry; "id|" lines
+      with an out-of-range or repeated id are dropped
+    - A reply that is JSON after all is read with the JSON protocol
+
+    Ids outside range(count) and repeated ids are not trusted (the first
+    occurrence wins) and are recorded in `issues`. Raises
+    CompactFormatError when no line could be read.
+    """
+    issues = issues if issues is not None else ReplyIssues()
+    stripped = content.strip()
+    if stripped.startswith("{"):
+        try:
+            return parse_json_translations(json.loads(stripped), count, issues)
+        except json.JSONDecodeError as e:
+            raise CompactFormatError(f"Malformed JSON reply: {e}") from e
+
+    parsed: dict[int, str] = {}
+    current: int | None = None
+    for line in stripped.splitlines():
+        if not line.strip() or line.lstrip().startswith("```"):
+            continue
+        match = _COMPACT_LINE.match(line)
+        if match and int(match.group(1)) < count and int(match.group(1)) not in parsed:
+            current = int(match.group(1))
+            parsed[current] = match.group(3)
+        elif match and match.group(2) == "|":
+            # An explicit record we can't place (bad or repeated id): drop it
+            idx = int(match.group(1))
+            (issues.duplicate_ids if idx < count else issues.out_of_range_ids).append(idx)
+            current = None
+        elif current is not None:
+            parsed[current] = f"{parsed[current]} {line.strip()}".strip()
+
+    translations = {idx: text for idx, text in parsed.items() if text}
+    if not translations:
+        raise CompactFormatError("No id|text lines in reply")
+    return translations
+
+
+def parse_json_translations(result: dict, count: int, issues: ReplyIssues | None = None) -> dict[int, str]:
+    """Read a {"translations": [{"id", "text"}]} reply into {id: text}.
+
+    The first occurrence of an id wins; repeated, out-of-range and malformed
+    items are recorded in `issues`.
+    """
+    issues = issues if issues is not None else ReplyIssues()
+    translations: dict[int, str] = {}
+    items = result.get("translations", []) if isinstance(result, dict) else []
+    for item in items if isinstance(items, list) else []:
+        idx = item.get("id") if isinstance(item, dict) else None
+        text = item.get("text") if isinstance(item, dict) else None
+        if isinstance(idx, str) and idx.isdigit():
+            idx = int(idx)
+        if not isinstance(idx, int) or isinstance(idx, bool) or not isinstance(text, str):
+            issues.malformed_items += 1
+        elif not 0 <= idx < count:
+            issues.out_of_range_ids.append(idx)
+        elif idx in translations:
+            issues.duplicate_ids.append(idx)
+        else:
+            translations[idx] = text
+    return translations
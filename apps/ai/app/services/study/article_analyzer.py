@@ -2,6 +2,8 @@
 
 import json
 import time
+from typing import AsyncIterator
+
 import structlog
 
 from app.config import get_settings
@@ -11,66 +13,112 @@ from app.prompts.study_analysis import get_study_system_prompt, TASK_PROMPT
 
 logger = structlog.get_logger()
 
+# Streamed array key -> event type
+STREAM_EVENT_TYPES = {"sentences": "sentence", "expressions": "expression"}
 
-async def analyze_article(
-    text: str,
-    target_language: str = "en",
-    title: str | None = None,
-) -> dict:
-    """Analyze a Korean article: split sentences, translate, extract expressions."""
-    start_time = time.time()
-    settings = get_settings()
 
-    llm = BaseLLMService(
+def _build_llm() -> BaseLLMService:
+    settings = get_settings()
+    return BaseLLMService(
         default_config=LLMConfig(
             model=settings.openai_model,
             temperature=settings.llm_temperature_article,
             timeout=30,
             max_retries=settings.retry_max_attempts,
+            cache_ttl=settings.llm_cache_ttl_article,
+            weight=3,  # long article in, every sentence translated out
         )
     )
 
+
+def _build_prompts(text: str, target_language: str, title: str | None) -> tuple[str, str]:
     system_prompt = get_study_system_prompt(target_language)
     user_content = f"Target language: {target_language}\n\n"
     if title:
         user_content += f"Title: {title}\n\n"
     user_content += f"Article:\n{text}"
+    return system_prompt + "\n\n" + TASK_PROMPT, user_content
 
-    try:
-        result = llm.complete_json(
-            system_prompt=system_prompt + "\n\n" + TASK_PROMPT,
-            user_content=user_content,
-        )
 
-        sentences = result.get("sentences", [])
-        expressions = result.get("expressions", [])
+def _build_result(result: dict, target_language: str, start_time: float) -> dict:
+    sentences = result.get("sentences", [])
+    expressions = result.get("expressions", [])
 
-        processing_time = (time.time() - start_time) * 1000
+    processing_time = (time.time() - start_time) * 1000
 
-        return {
-            "sentences": sentences,
-            "expressions": expressions,
-            "meta": {
-                "sentenceCount": len(sentences),
-                "expressionCount": len(expressions),
-                "targetLanguage": target_language,
-                "processingTime": round(processing_time, 1),
-            },
-        }
+    return {
+        "sentences": sentences,
+        "expressions": expressions,
+        "meta": {
+            "sentenceCount": len(sentences),
+            "expressionCount": len(expressions),
+            "targetLanguage": target_language,
+            "processingTime": round(processing_time, 1),
+        },
+    }
 
-    except json.JSONDecodeError as e:
+
+def _to_service_error(e: Exception) -> AIServiceError:
+    if isinstance(e, AIServiceError):
+        return e
+    if isinstance(e, json.JSONDecodeError):
         logger.error("openai_response_parse_failed", error=str(e))
-        raise AIServiceError(
+        return AIServiceError(
             code=ErrorCode.LLM_ERROR,
             message="Failed to parse analysis result",
             status_code=500,
         )
-    except AIServiceError:
-        raise
-    except Exception as e:
-        logger.error("article_analysis_failed", error=str(e))
-        raise AIServiceError(
-            code=ErrorCode.LLM_ERROR,
-            message="Article analysis failed",
-            status_code=500,
+    logger.error("article_analysis_failed", error=str(e))
+    return AIServiceError(
+        code=ErrorCode.LLM_ERROR,
+        message="Article analysis failed",
+        status_code=500,
+    )
+
+
+async def analyze_article(
+    text: str,
+    target_language: str = "en",
+    title: str | None = None,
+) -> dict:
+    """Analyze a Korean article: split sentences, translate, extract expressions."""
+    start_time = time.time()
+    llm = _build_llm()
+    system_prompt, user_content = _build_prompts(text, target_language, title)
+
+    try:
+        result = await llm.complete_json_async(
+            system_prompt=system_prompt,
+            user_content=user_content,
         )
+        return _build_result(result, target_language, start_time)
+    except Exception as e:
+        raise _to_service_error(e)
+
+
+async def analyze_article_stream(
+    text: str,
+    target_language: str = "en",
+    title: str | None = None,
+) -> AsyncIterator[dict]:
+    """Streaming variant of analyze_article.
+
+    Yields {"type": "sentence" | "expression", "data": {...}} as each item is
+    generated, then {"type": "complete", "data": <analyze_article result>}.
+    """
+    start_time = time.time()
+    llm = _build_llm()
+    system_prompt, user_content = _build_prompts(text, target_language, title)
+
+    try:
+        async for key, value in llm.stream_json(
+            system_prompt=system_prompt,
+            user_content=user_content,
+            array_keys=set(STREAM_EVENT_TYPES),
+        ):
+            if key is None:
+                yield {"type": "complete", "data": _build_result(value, target_language, start_time)}
+            else:
+                yield {"type": STREAM_EVENT_TYPES[key], "data": value}
+    except Exception as e:
+        raise _to_service_error(e)
@@ -1,6 +1,8 @@
 """OpenAI LLM Service for video analysis"""
 
 import json
+from typing import AsyncIterator
+
 import structlog
 from openai import APIError, APIConnectionError, RateLimitError as OpenAIRateLimitError
 
@@ -24,6 +26,8 @@ class LLMService:
                 temperature=settings.llm_temperature_video,
                 timeout=settings.timeout_analyze,
                 max_retries=settings.retry_max_attempts,
+                cache_ttl=settings.llm_cache_ttl_video,
+                weight=2,
             )
         )
         self.model = settings.openai_model
@@ -46,6 +50,80 @@ class LLMService:
             return formatted, True
         return transcript, False
 
+    def _validate_highlight(
+        self,
+        idx: int,
+        h: dict,
+        segments: list[STTSegment]
+    ) -> dict:
+        """Correct one highlight's timestamp against non-empty segments"""
+        # 영상 길이 계산 (마지막 세그먼트의 end 값 기준)
+        video_duration = segments[-1].end
+        first_segment_start = segments[0].start
+
+        timestamp = h.get("timestamp", 0)
+        original_timestamp = timestamp
+        correction_reason = None
+
+        # 1. 영상 길이 초과 검증
+        if timestamp > video_duration:
+            correction_reason = "exceeds_duration"
+            logger.warning(
+                "timestamp_exceeds_duration",
+                highlight_index=idx,
+                timestamp=timestamp,
+                video_duration=video_duration,
+                excess_seconds=timestamp - video_duration,
+                title=h.get("title")
+            )
+            # 마지막 세그먼트의 시작 시간으로 보정
+            timestamp = int(segments[-1].start)
+
+        # 2. 음수 또는 첫 세그먼트 이전 검증
+        elif timestamp < first_segment_start:
+            correction_reason = "before_first_segment"
+            logger.warning(
+                "timestamp_before_start",
+                highlight_index=idx,
+                timestamp=timestamp,
+                first_segment_start=first_segment_start,
+                title=h.get("title")
+            )
+            timestamp = int(first_segment_start)
+
+        # 3. 가장 가까운 실제 세그먼트 타임스탬프 찾기
+        closest = min(segments, key=lambda seg: abs(seg.start - timestamp))
+
+        # 10초 이상 차이나면 가장 가까운 타임스탬프로 보정
+        if abs(closest.start - timestamp) > 10:
+            if not correction_reason:
+                correction_reason = "segment_mismatch"
+            corrected_timestamp = int(closest.start)
+            logger.info(
+                "timestamp_corrected",
+                highlight_index=idx,
+                original=original_timestamp,
+                after_bounds_check=timestamp,
+                corrected=corrected_timestamp,
+                closest_segment_start=closest.start,
+                reason=correction_reason
+            )
+        else:
+            corrected_timestamp = timestamp
+            if correction_reason:
+                logger.info(
+                    "timestamp_corrected",
+                    highlight_index=idx,
+                    original=original_timestamp,
+                    corrected=corrected_timestamp,
+                    reason=correction_reason
+                )
+
+        return {
+            **h,
+            "timestamp": corrected_timestamp
+        }
+
     def _validate_highlights(
         self,
         highlights: list[dict],
@@ -69,70 +147,7 @@ class LLMService:
             raw_timestamps=[h.get("timestamp") for h in highlights]
         )
 
-        validated = []
-        for idx, h in enumerate(highlights):
-            timestamp = h.get("timestamp", 0)
-            original_timestamp = timestamp
-            correction_reason = None
-
-            # 1. 영상 길이 초과 검증
-            if timestamp > video_duration:
-                correction_reason = "exceeds_duration"
-                logger.warning(
-                    "timestamp_exceeds_duration",
-                    highlight_index=idx,
-                    timestamp=timestamp,
-                    video_duration=video_duration,
-                    excess_seconds=timestamp - video_duration,
-                    title=h.get("title")
-                )
-                # 마지막 세그먼트의 시작 시간으로 보정
-                timestamp = int(segments[-1].start)
-
-            # 2. 음수 또는 첫 세그먼트 이전 검증
-            elif timestamp < first_segment_start:
-                correction_reason = "before_first_segment"
-                logger.warning(
-                    "timestamp_before_start",
-                    highlight_index=idx,
-                    timestamp=timestamp,
-                    first_segment_start=first_segment_start,
-                    title=h.get("title")
-                )
-                timestamp = int(first_segment_start)
-
-            # 3. 가장 가까운 실제 세그먼트 타임스탬프 찾기
-            closest = min(segments, key=lambda seg: abs(seg.start - timestamp))
-
-            # 10초 이상 차이나면 가장 가까운 타임스탬프로 보정
-            if abs(closest.start - timestamp) > 10:
-                if not correction_reason:
-                    correction_reason = "segment_mismatch"
-                corrected_timestamp = int(closest.start)
-                logger.info(
-                    "timestamp_corrected",
-                    highlight_index=idx,
-                    original=original_timestamp,
-                    after_bounds_check=timestamp,
-                    corrected=corrected_timestamp,
-                    closest_segment_start=closest.start,
-                    reason=correction_reason
-                )
-            else:
-                corrected_timestamp = timestamp
-                if correction_reason:
-                    logger.info(
-                        "timestamp_corrected",
-                        highlight_index=idx,
-                        original=original_timestamp,
-                        corrected=corrected_timestamp,
-                        reason=correction_reason
-                    )
-
-            validated.append({
-                **h,
-                "timestamp": corrected_timestamp
-            })
+        validated = [self._validate_highlight(idx, h, segments) for idx, h in enumerate(highlights)]
 
         # 검증 완료 로그
         logger.info(
@@ -148,26 +163,13 @@ class LLMService:
 
         return validated
 
-    async def analyze(
+    def _build_prompt(
         self,
         metadata: VideoMetadata,
-        transcript: str | None = None,
-        segments: list[STTSegment] | None = None
-    ) -> AnalysisResult:
-        """
-        Analyze video content using LLM
-
-        Args:
-            metadata: Video metadata (title, channel, description)
-            transcript: Full transcript text
-            segments: Timestamped segments
-
-        Returns:
-            AnalysisResult with summary, score, keywords, highlights
-
-        Raises:
-            LLMError: If OpenAI API call fails
-        """
+        transcript: str | None,
+        segments: list[STTSegment] | None
+    ) -> tuple[str, str]:
+        """Build (system_prompt, user content) and log the analysis start"""
         formatted_transcript, has_timestamps = self._format_transcript(
             transcript, segments
         )
@@ -215,36 +217,44 @@ class LLMService:
                 title_length=len(metadata.title)
             )
 
-        try:
-            result = self._llm.complete_json(system_prompt, content)
-        except OpenAIRateLimitError as e:
+        return system_prompt, content
+
+    def _to_llm_error(self, e: Exception) -> Exception:
+        """Map OpenAI/JSON errors to LLMError; other exceptions pass through"""
+        if isinstance(e, OpenAIRateLimitError):
             logger.error("llm_rate_limit", error=str(e))
-            raise LLMError(
+            return LLMError(
                 message="OpenAI API 요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.",
                 details={"retry_after": 60}
             )
-        except APIConnectionError as e:
+        if isinstance(e, APIConnectionError):
             logger.error("llm_connection_error", error=str(e))
-            raise LLMError(
+            return LLMError(
                 message="OpenAI API에 연결할 수 없습니다",
                 unavailable=True,
                 details={"error": str(e)}
             )
-        except APIError as e:
+        if isinstance(e, APIError):
             logger.error("llm_api_error", error=str(e), status_code=getattr(e, "status_code", None))
-            raise LLMError(
+            return LLMError(
                 message="OpenAI API 호출에 실패했습니다",
                 details={"error": str(e)}
             )
-        except json.JSONDecodeError as e:
+        if isinstance(e, json.JSONDecodeError):
             logger.error("llm_json_parse_error", error=str(e))
-            raise LLMError(
+            return LLMError(
                 message="AI 응답을 파싱할 수 없습니다",
                 details={"error": str(e)}
             )
+        return e
 
-        # 타임스탬프 검증 및 보정
-        raw_highlights = result.get("highlights", [])
+    def _build_result(
+        self,
+        result: dict,
+        segments: list[STTSegment] | None
+    ) -> AnalysisResult:
+        # 타임스탬프 검증 및 보정 (객체가 아닌 항목은 버림)
+        raw_highlights = [h for h in result.get("highlights", []) if isinstance(h, dict)]
 
         # LLM 원본 응답 로그 (DEBUG)
         logger.debug(
@@ -276,3 +286,71 @@ class LLMService:
                 Highlight(**h) for h in validated_highlights
             ]
         )
+
+    async def analyze(
+        self,
+        metadata: VideoMetadata,
+        transcript: str | None = None,
+        segments: list[STTSegment] | None = None
+    ) -> AnalysisResult:
+        """
+        Analyze video content using LLM
+
+        Args:
+            metadata: Video metadata (title, channel, description)
+            transcript: Full transcript text
+            segments: Timestamped segments
+
+        Returns:
+            AnalysisResult with summary, score, keywords, highlights
+
+        Raises:
+            LLMError: If OpenAI API call fails
+        """
+        system_prompt, content = self._build_prompt(metadata, transcript, segments)
+
+        try:
+            result = await self._llm.complete_json_async(system_prompt, content)
+        except (APIError, json.JSONDecodeError) as e:
+            raise self._to_llm_error(e)
+
+        return self._build_result(result, segments)
+
+    async def analyze_stream(
+        self,
+        metadata: VideoMetadata,
+        transcript: str | None = None,
+        segments: list[STTSegment] | None = None
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming variant of analyze
+
+        Yields {"type": "keyword", "data": str} and {"type": "highlight",
+        "data": {...}} as the model produces them (highlight timestamps are
+        validated one by one), then {"type": "complete", "data": <AnalysisResult>}
+        with the same content analyze() would return.
+
+        Raises:
+            LLMError: If OpenAI API call fails
+        """
+        system_prompt, content = self._build_prompt(metadata, transcript, segments)
+        highlight_index = 0
+
+        try:
+            async for key, value in self._llm.stream_json(
+                system_prompt, content, array_keys={"keywords", "highlights"}
+            ):
+                if key == "keywords":
+                    yield {"type": "keyword", "data": value}
+                elif key == "highlights":
+                    if not isinstance(value, dict):
+                        logger.warning("highlight_malformed", value=repr(value)[:200])
+                        continue
+                    highlight = self._validate_highlight(highlight_index, value, segments) if segments else value
+                    highlight_index += 1
+                    yield {"type": "highlight", "data": highlight}
+                else:
+                    result = self._build_result(value, segments)
+                    yield {"type": "complete", "data": result.model_dump(by_alias=True)}
+        except (APIError, json.JSONDecodeError) as e:
+            raise self._to_llm_error(e)
@@ -1,12 +1,17 @@
 """External STT API Client"""
 
+from typing import Awaitable
+
 import httpx
 import structlog
 
 from app.config import get_settings
 from app.models import STTResponse, STTSegment
 from app.core.exceptions import STTError, ValidationError, ErrorCode
-from app.services.shared.stt import get_stt_provider
+from app.services.shared.stt import AudioSource, AudioStream, STTResult, get_stt_provider
+from app.services.shared.stt.chunking import ChunkedTranscriber, FFmpegError
+from app.services.shared.stt.result_cache import get_stt_result_cache
+from app.services.shared.stt.transcode import TranscodingProvider
 
 logger = structlog.get_logger()
 
@@ -19,6 +24,22 @@ ALLOWED_CONTENT_TYPES = {
 }
 
 
+def stt_cache_scope() -> str:
+    """The STT configuration a cached transcript depends on.
+
+    Model, chunking and transcoding change results slightly, so each
+    combination is cached separately.
+    """
+    settings = get_settings()
+    return settings.stt_provider + (
+        f"/{settings.stt_local_model}" if settings.stt_provider == "local" else ""
+    ) + (
+        f":chunked/{settings.stt_chunk_seconds}" if settings.stt_chunking_enabled else ""
+    ) + (
+        f":opus/{settings.stt_transcode_bitrate_kbps}k" if settings.stt_transcode_enabled else ""
+    )
+
+
 class STTClient:
     """Client for external STT API, using pluggable STT providers"""
 
@@ -30,6 +51,16 @@ class STTClient:
         self.retry_max_attempts = settings.retry_max_attempts
         self.retry_base_delay = settings.retry_base_delay
         self._provider = get_stt_provider()
+        if settings.stt_transcode_enabled:
+            self._provider = TranscodingProvider(self._provider, settings.stt_transcode_bitrate_kbps)
+        self._chunked = ChunkedTranscriber(
+            self._provider,
+            chunk_seconds=settings.stt_chunk_seconds,
+            overlap_seconds=settings.stt_chunk_overlap_seconds,
+            search_seconds=settings.stt_chunk_search_seconds,
+            parallelism=settings.stt_chunk_parallelism,
+        ) if settings.stt_chunking_enabled else None
+        self._cache_scope = stt_cache_scope()
 
     def validate_file(
         self,
@@ -38,8 +69,17 @@ class STTClient:
         content_type: str | None = None
     ) -> None:
         """Validate audio file before processing"""
+        self.validate_upload(len(audio_data), filename, content_type)
+
+    def validate_upload(
+        self,
+        size: int,
+        filename: str,
+        content_type: str | None = None
+    ) -> None:
+        """Validate an audio file by size and name, without reading it"""
         # Check file size
-        file_size_mb = len(audio_data) / (1024 * 1024)
+        file_size_mb = size / (1024 * 1024)
         if file_size_mb > self.max_file_size_mb:
             raise ValidationError(
                 ErrorCode.FILE_TOO_LARGE,
@@ -88,22 +128,87 @@ class STTClient:
             ValidationError: If file validation fails
             STTError: If STT API call fails
         """
+        return await self.transcribe_source(
+            AudioSource.from_bytes(audio_data, filename, content_type),
+            language=language,
+        )
+
+    async def transcribe_source(
+        self,
+        audio: AudioSource,
+        language: str = "auto",
+    ) -> STTResponse:
+        """
+        Transcribe an audio file without loading it into memory
+
+        The provider streams the file to its backend (see
+        STTProvider.transcribe_source). A result cached for the same audio
+        content, provider and language hint is returned without calling it.
+        Same errors as transcribe().
+        """
         # Validate file
-        self.validate_file(audio_data, filename, content_type)
+        self.validate_upload(audio.size, audio.filename, audio.content_type)
+
+        cache = get_stt_result_cache()
+        cache_key = await cache.make_key(audio, self._cache_scope, language) if cache else None
+        if cache_key is not None:
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                logger.info(
+                    "stt_cache_hit",
+                    audio_size=audio.size,
+                    filename=audio.filename,
+                    language=cached.language,
+                    segments_count=len(cached.segments)
+                )
+                return self._to_response(cached)
 
         logger.info(
             "stt_request_start",
-            audio_size=len(audio_data),
-            filename=filename,
+            audio_size=audio.size,
+            filename=audio.filename,
             language=language
         )
 
+        stt_result = await self._call_provider(self._transcribe(audio, language))
+        self._log_result(stt_result)
+
+        if cache_key is not None:
+            await cache.set(cache_key, stt_result)
+
+        return self._to_response(stt_result)
+
+    async def transcribe_stream(
+        self,
+        audio: AudioStream,
+        language: str = "auto",
+    ) -> STTResponse:
+        """
+        Transcribe audio as it arrives, e.g. while it is still downloading
+
+        The result cache is skipped: the content is only known once it has
+        all been sent. With chunking enabled the stream is spooled first,
+        since cutting at silences needs the whole file.
+        Same errors as transcribe(); AudioStreamError if the source fails.
+        """
+        self.validate_upload(audio.size or 0, audio.filename, audio.content_type)
+
+        logger.info(
+            "stt_stream_request_start",
+            audio_size=audio.size,
+            filename=audio.filename,
+            language=language
+        )
+
+        stt_result = await self._call_provider(self._transcribe_stream(audio, language))
+        self._log_result(stt_result)
+        return self._to_response(stt_result)
+
+    @staticmethod
+    async def _call_provider(call: Awaitable[STTResult]) -> STTResult:
+        """Await a provider call, turning HTTP failures into STTError"""
         try:
-            stt_result = await self._provider.transcribe(
-                audio_data=audio_data,
-                filename=filename,
-                language=language,
-            )
+            return await call
         except httpx.HTTPStatusError as e:
             if e.response.status_code >= 500:
                 raise STTError(
@@ -122,6 +227,8 @@ class STTClient:
                 details={"error": str(e)}
             )
 
+    @staticmethod
+    def _log_result(stt_result: STTResult) -> None:
         segments = stt_result.segments
 
         # 세그먼트 시간 범위 로그
@@ -155,6 +262,8 @@ class STTClient:
                 segments_count=0
             )
 
+    @staticmethod
+    def _to_response(stt_result: STTResult) -> STTResponse:
         return STTResponse(
             text=stt_result.text,
             language=stt_result.language,
@@ -164,6 +273,26 @@ class STTClient:
             ]
         )
 
+    async def _transcribe(self, audio: AudioSource, language: str) -> STTResult:
+        """Chunked transcription when enabled, a single provider call otherwise"""
+        if self._chunked is None:
+            return await self._provider.transcribe_source(audio, language=language)
+        try:
+            return await self._chunked.transcribe(audio, language=language)
+        except (FileNotFoundError, FFmpegError) as e:
+            # ffmpeg missing or unable to decode: the backend may still manage the file
+            logger.warning("stt_chunking_unavailable", error=str(e))
+            return await self._provider.transcribe_source(audio, language=language)
+
+    async def _transcribe_stream(self, audio: AudioStream, language: str) -> STTResult:
+        if self._chunked is None:
+            return await self._provider.transcribe_stream(audio, language=language)
+        source = await audio.spool()
+        try:
+            return await self._transcribe(source, language)
+        finally:
+            source.close()
+
     def is_within_limit(self, duration_seconds: float) -> bool:
         """Check if audio duration is within limit"""
         return duration_seconds <= self.max_duration_minutes * 60
@@ -0,0 +1,412 @@
+"""Asynchronous STT jobs: submit now, poll for the transcript later.
+
+A job is an uploaded file or a YouTube video id. Submitting stores the job
+(and the uploaded file) in a local SQLite database and returns at once; a
+fixed number of worker tasks per process claim jobs from it in submission
+order. A claim is a lease that the worker renews while the job runs, so a
+job whose process died is claimed again once its lease runs out, by any
+process sharing the database.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+import structlog
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, STTError
+from app.models import STTResponse
+from app.services.shared.stt import AudioSource
+from .stt_client import STTClient
+from .video_stt import transcribe_youtube_video
+
+logger = structlog.get_logger()
+
+_stt_job_runner: "STTJobRunner | None" = None
+
+
+@dataclass
+class STTJob:
+    """One transcription request and its progress"""
+
+    id: str
+    kind: str  # "upload" or "video"
+    params: dict
+    status: str = "queued"  # queued -> running -> succeeded | failed
+    stage: str = "queued"  # queued, downloading, transcribing, done
+    result: dict | None = None
+    error: dict | None = None
+    attempts: int = 0
+    lease_until: float = 0.0
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+_COLUMNS = tuple(f.name for f in fields(STTJob))
+_JSON_COLUMNS = {"params", "result", "error"}
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM stt_jobs"
+
+
+def _encode(name: str, value):
+    return json.dumps(value, ensure_ascii=False) if name in _JSON_COLUMNS and value is not None else value
+
+
+class STTJobStore:
+    """SQLite table of jobs, shared by every process using the same path.
+
+    Methods are blocking; the runner calls them from a worker thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS stt_jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, params TEXT NOT NULL, "
+                "status TEXT NOT NULL, stage TEXT NOT NULL, result TEXT, error TEXT, "
+                "attempts INTEGER NOT NULL, lease_until REAL NOT NULL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS stt_jobs_status_idx ON stt_jobs (status, created_at)")
+            self._conn.commit()
+
+    @staticmethod
+    def _to_job(row: tuple) -> STTJob:
+        values = dict(zip(_COLUMNS, row))
+        for column in _JSON_COLUMNS:
+            if values[column] is not None:
+                values[column] = json.loads(values[column])
+        return STTJob(**values)
+
+    def create(self, job: STTJob) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO stt_jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [_encode(name, getattr(job, name)) for name in _COLUMNS],
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> STTJob | None:
+        with self._lock:
+            row = self._conn.execute(f"{_SELECT} WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def update(self, job_id: str, **values) -> None:
+        values["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in values)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE stt_jobs SET {assignments} WHERE id = ?",
+                (*(_encode(name, value) for name, value in values.items()), job_id),
+            )
+            self._conn.commit()
+
+    def count_queued(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM stt_jobs WHERE status = 'queued'").fetchone()[0]
+
+    def claim(self, lease_seconds: float) -> STTJob | None:
+        """Take the oldest queued job, or a running one whose lease has expired.
+
+        The conditional UPDATE makes the claim atomic across processes: when
+        two workers race for a job only one of them changes the row.
+        """
+        now = time.time()
+        with self._lock:
+            while True:
+                row = self._conn.execute(
+                    f"{_SELECT} WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    return None
+                job = self._to_job(row)
+                claimed = self._conn.execute(
+                    "UPDATE stt_jobs SET status = 'running', attempts = attempts + 1, "
+                    "lease_until = ?, updated_at = ? "
+                    "WHERE id = ? AND status = ? AND lease_until = ?",
+                    (now + lease_seconds, now, job.id, job.status, job.lease_until),
+                ).rowcount
+                self._conn.commit()
+                if claimed:
+                    job.attempts += 1
+                    job.lease_until = now + lease_seconds
+                    return job
+
+    def delete_finished_before(self, cutoff: float) -> list[STTJob]:
+        """Remove finished jobs last updated before `cutoff`; returns them"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"{_SELECT} WHERE status IN ('succeeded', 'failed') AND updated_at < ?", (cutoff,)
+            ).fetchall()
+            if rows:
+                self._conn.executemany("DELETE FROM stt_jobs WHERE id = ?", [(row[0],) for row in rows])
+                self._conn.commit()
+        return [self._to_job(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class STTJobRunner:
+    """Bounded pool of worker tasks running STT jobs from the store"""
+
+    def __init__(
+        self,
+        store: STTJobStore,
+        files_dir: str,
+        workers: int = 2,
+        queue_size: int = 100,
+        max_attempts: int = 2,
+        ttl: int = 24 * 3600,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 2.0,
+        sweep_interval: float = 3600.0,
+    ):
+        self.store = store
+        self.files_dir = files_dir
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.max_attempts = max_attempts
+        self.ttl = ttl
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.sweep_interval = sweep_interval
+        self.running = 0
+        self.succeeded = 0
+        self.failed = 0
+        self._wakeup: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+        Path(files_dir).mkdir(parents=True, exist_ok=True)
+
+    async def start(self) -> None:
+        """Drop expired jobs and start the workers (idempotent)"""
+        if self._wakeup is not None:
+            return
+        self._wakeup = asyncio.Event()
+        expired = await self._sweep()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.ensure_future(self._sweeper()))
+        logger.info("stt_job_runner_started", workers=self.workers, expired_jobs=expired)
+
+    async def _sweep(self) -> int:
+        """Delete jobs that finished more than `ttl` ago, with any leftover files"""
+        expired = await asyncio.to_thread(self.store.delete_finished_before, time.time() - self.ttl)
+        for job in expired:
+            self._remove_file(job)
+        return len(expired)
+
+    async def _sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                expired = await self._sweep()
+            except Exception as e:
+                logger.warning("stt_job_sweep_failed", error=str(e))
+                continue
+            if expired:
+                logger.info("stt_job_expired", expired_jobs=expired)
+
+    async def _enqueue(self, job: STTJob) -> STTJob:
+        await asyncio.to_thread(self.store.create, job)
+        self._wakeup.set()
+        logger.info("stt_job_queued", job_id=job.id, kind=job.kind)
+        return job
+
+    async def _check_capacity(self) -> None:
+        queued = await asyncio.to_thread(self.store.count_queued)
+        if queued >= self.queue_size:
+            raise STTError(
+                message="STT 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요",
+                unavailable=True,
+                details={"queued": queued},
+            )
+
+    async def submit_upload(self, audio: AudioSource, language: str = "auto") -> STTJob:
+        """Store the uploaded file with the job; the caller still owns (and closes) `audio`"""
+        await self.start()
+        STTClient().validate_upload(audio.size, audio.filename, audio.content_type)
+        await self._check_capacity()
+
+        job_id = uuid.uuid4().hex
+        path = os.path.join(self.files_dir, job_id + os.path.splitext(audio.filename)[1].lower())
+        await audio.save_to(path)
+        params = {
+            "path": path,
+            "filename": audio.filename,
+            "content_type": audio.content_type,
+            "language": language,
+        }
+        return await self._enqueue(STTJob(id=job_id, kind="upload", params=params))
+
+    async def submit_video(self, video_id: str, language: str = "auto") -> STTJob:
+        await self.start()
+        await self._check_capacity()
+        params = {"video_id": video_id, "language": language}
+        return await self._enqueue(STTJob(id=uuid.uuid4().hex, kind="video", params=params))
+
+    async def get(self, job_id: str) -> STTJob | None:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self.store.claim, self.lease_seconds)
+            if job is None:
+                # Woken by a local submit, or polling for jobs submitted by other processes
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("stt_job_worker_error", job_id=job.id, error=str(e))
+
+    async def _heartbeat(self, job: STTJob) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.store.update, job.id, lease_until=time.time() + self.lease_seconds)
+            except Exception as e:
+                # e.g. "database is locked": the lease still has two more renewals before it runs out
+                logger.warning("stt_job_heartbeat_failed", job_id=job.id, error=str(e))
+
+    async def _run(self, job: STTJob) -> None:
+        if job.attempts > self.max_attempts:
+            # Its lease ran out on every attempt (e.g. it keeps killing the process)
+            await self._fail(job, STTError(message="작업이 반복적으로 중단되어 실패 처리되었습니다"))
+            return
+
+        stage = "downloading" if job.kind == "video" else "transcribing"
+        await asyncio.to_thread(self.store.update, job.id, stage=stage)
+
+        async def on_stage(name: str) -> None:
+            await asyncio.to_thread(self.store.update, job.id, stage=name)
+
+        heartbeat = asyncio.ensure_future(self._heartbeat(job))
+        self.running += 1
+        started = time.perf_counter()
+        try:
+            result = await self._execute(job, on_stage)
+        except asyncio.CancelledError:
+            # Shutdown: hand the job back without counting the attempt
+            await asyncio.to_thread(
+                self.store.update, job.id, status="queued", stage="queued", attempts=job.attempts - 1, lease_until=0.0
+            )
+            raise
+        except AIServiceError as e:
+            await self._fail(job, e)
+        except Exception as e:
+            logger.error("stt_job_unexpected_error", job_id=job.id, error=str(e))
+            await self._fail(job, STTError(message="STT 처리 중 오류가 발생했습니다"))
+        else:
+            await asyncio.to_thread(
+                self.store.update, job.id, status="succeeded", stage="done", result=result.model_dump()
+            )
+            self.succeeded += 1
+            logger.info(
+                "stt_job_succeeded",
+                job_id=job.id,
+                kind=job.kind,
+                attempts=job.attempts,
+                duration_seconds=round(time.perf_counter() - started, 2),
+            )
+            self._remove_file(job)
+        finally:
+            self.running -= 1
+            heartbeat.cancel()
+
+    async def _execute(self, job: STTJob, on_stage) -> STTResponse:
+        language = job.params.get("language", "auto")
+        if job.kind == "video":
+            return await transcribe_youtube_video(
+                job.params["video_id"], language, request_id=f"job-{job.id}", on_stage=on_stage
+            )
+
+        audio = AudioSource.from_path(
+            job.params["path"], filename=job.params["filename"], content_type=job.params["content_type"]
+        )
+        try:
+            return await STTClient().transcribe_source(audio, language=language)
+        finally:
+            audio.close()
+
+    async def _fail(self, job: STTJob, error: AIServiceError) -> None:
+        detail = {"code": error.code.value, "message": error.message}
+        if error.details:
+            detail["details"] = error.details
+        await asyncio.to_thread(self.store.update, job.id, status="failed", stage="done", error=detail)
+        self.failed += 1
+        logger.warning("stt_job_failed", job_id=job.id, kind=job.kind, error_code=error.code.value)
+        self._remove_file(job)
+
+    @staticmethod
+    def _remove_file(job: STTJob) -> None:
+        path = job.params.get("path")
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+    async def close(self) -> None:
+        """Stop the workers; interrupted jobs go back to the queue"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+        self.store.close()
+
+
+def get_stt_job_runner() -> STTJobRunner:
+    """Return the process-wide job runner, created from settings on first use."""
+    global _stt_job_runner
+    if _stt_job_runner is None:
+        settings = get_settings()
+        _stt_job_runner = STTJobRunner(
+            STTJobStore(settings.stt_job_db_path),
+            files_dir=settings.stt_job_files_dir,
+            workers=settings.stt_job_workers,
+            queue_size=settings.stt_job_queue_size,
+            max_attempts=settings.stt_job_max_attempts,
+            ttl=settings.stt_job_ttl,
+            lease_seconds=settings.stt_job_lease_seconds,
+            sweep_interval=settings.stt_job_sweep_interval,
+        )
+    return _stt_job_runner
+
+
+def peek_stt_job_runner() -> STTJobRunner | None:
+    """The runner if it has been created, without creating it (for stats)."""
+    return _stt_job_runner
+
+
+async def reset_stt_job_runner() -> None:
+    """Stop the workers and drop the instance (shutdown and tests)."""
+    global _stt_job_runner
+    if _stt_job_runner is not None:
+        await _stt_job_runner.close()
+    _stt_job_runner = None
@@ -0,0 +1,97 @@
+"""Transcripts of YouTube videos, keyed by video id.
+
+/stt/video/{video_id} downloads and transcribes the whole video, so a
+popular video is worth remembering per (video id, language hint, STT configuration).
+Videos that can't be downloaded (private, age-restricted, removed) or are
+over the duration limit are remembered for a short while too, so repeated
+requests fail immediately instead of going through yt-dlp again.
+"""
+
+import json
+from dataclasses import asdict, dataclass
+
+from app.config import get_settings
+from app.models import STTResponse
+from app.services.shared.cache import TieredCache
+
+# Bump when the stored entry layout changes
+VIDEO_CACHE_VERSION = "v1"
+
+_video_transcript_cache: "VideoTranscriptCache | None" = None
+
+
+@dataclass
+class DownloadFailure:
+    """Remembered download failure; duration is set when the video was too long"""
+
+    duration: int | None = None
+
+
+def _key(kind: str, *parts: str) -> str:
+    return json.dumps([VIDEO_CACHE_VERSION, kind, *parts], separators=(",", ":"))
+
+
+class VideoTranscriptCache:
+    """Transcripts and download failures per video on top of a TieredCache"""
+
+    def __init__(self, cache: TieredCache, ttl: int, failure_ttl: int):
+        self.cache = cache
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.failure_hits = 0
+
+    async def get_transcript(self, video_id: str, language: str, scope: str) -> STTResponse | None:
+        value = await self.cache.get(_key("transcript", video_id, language, scope))
+        return STTResponse.model_validate_json(value) if value is not None else None
+
+    async def set_transcript(self, video_id: str, language: str, scope: str, result: STTResponse) -> None:
+        await self.cache.set(
+            _key("transcript", video_id, language, scope),
+            result.model_dump_json(),
+            ttl=self.ttl,
+        )
+
+    async def get_failure(self, video_id: str) -> DownloadFailure | None:
+        # Download failures don't depend on the language or the STT provider
+        value = await self.cache.get(_key("failure", video_id))
+        if value is None:
+            return None
+        self.failure_hits += 1
+        return DownloadFailure(**json.loads(value))
+
+    async def set_failure(self, video_id: str, failure: DownloadFailure) -> None:
+        await self.cache.set(_key("failure", video_id), json.dumps(asdict(failure)), ttl=self.failure_ttl)
+
+    def snapshot(self) -> dict:
+        return {**self.cache.snapshot(), "failure_hits": self.failure_hits}
+
+    def close(self) -> None:
+        self.cache.close()
+
+
+def get_video_transcript_cache() -> VideoTranscriptCache | None:
+    """Return the process-wide video transcript cache, or None if disabled."""
+    global _video_transcript_cache
+    settings = get_settings()
+    if not settings.stt_video_cache_enabled:
+        return None
+    if _video_transcript_cache is None:
+        _video_transcript_cache = VideoTranscriptCache(
+            TieredCache(
+                namespace="video_transcripts",
+                max_bytes=settings.stt_video_cache_max_bytes,
+                sqlite_path=settings.stt_video_cache_sqlite_path,
+                sqlite_max_entries=settings.stt_video_cache_sqlite_max_entries,
+            ),
+            ttl=settings.stt_video_cache_ttl,
+            failure_ttl=settings.stt_video_failure_ttl,
+        )
+    return _video_transcript_cache
+
+
+def reset_video_transcript_cache() -> None:
+    """Drop the process-wide instance (shutdown and tests)."""
+    global _video_transcript_cache
+    if _video_transcript_cache is not None:
+        _video_transcript_cache.close()
+    _video_transcript_cache = None
@@ -0,0 +1,175 @@
+"""YouTube video → transcript pipeline (download, STT, transcript cache)"""
+
+from typing import Awaitable, Callable
+
+import structlog
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode
+from app.models import STTResponse
+from app.services.shared.stt import AudioStreamError
+from .stt_client import STTClient, stt_cache_scope
+from .transcript_cache import DownloadFailure, get_video_transcript_cache
+from .youtube_audio import YouTubeAudioDownloader
+
+logger = structlog.get_logger()
+
+
+def _download_error(video_id: str, duration: int | None, downloader: YouTubeAudioDownloader) -> AIServiceError:
+    """422 for a video over the duration limit, 400 for any other download failure"""
+    if duration and not downloader.is_within_limit(duration):
+        duration_minutes = duration / 60
+        max_minutes = downloader.max_duration_minutes
+        return AIServiceError(
+            code=ErrorCode.AUDIO_TOO_LONG,
+            message=f"영상 길이({int(duration_minutes)}분)가 최대 허용 시간({max_minutes}분)을 초과했습니다. 더 짧은 영상을 시도해주세요!",
+            status_code=422,
+            details={
+                "video_id": video_id,
+                "duration_minutes": round(duration_minutes, 1),
+                "max_duration_minutes": max_minutes
+            }
+        )
+    return AIServiceError(
+        code=ErrorCode.STT_ERROR,
+        message="영상 오디오를 다운로드할 수 없습니다. 영상이 비공개이거나 접근이 제한되었을 수 있습니다.",
+        status_code=400,
+        details={"video_id": video_id}
+    )
+
+
+async def transcribe_youtube_video(
+    video_id: str,
+    language: str = "auto",
+    request_id: str = "unknown",
+    on_stage: Callable[[str], Awaitable[None]] | None = None,
+) -> STTResponse:
+    """
+    Download a YouTube video's audio and transcribe it
+
+    Shared by /stt/video/{video_id} and STT jobs. `on_stage` is called
+    with "downloading" and "transcribing" as the pipeline moves on. With
+    YOUTUBE_STREAM_ENABLED the audio is uploaded while it downloads.
+
+    Raises:
+        AIServiceError: 400 if the download fails, 422 if the video is too long
+        STTError: If the STT call fails
+    """
+    settings = get_settings()
+    cache = get_video_transcript_cache()
+    downloader = YouTubeAudioDownloader()
+    scope = stt_cache_scope()
+    if cache is not None:
+        cached = await cache.get_transcript(video_id, language, scope)
+        if cached is not None:
+            logger.info(
+                "stt_video_cache_hit",
+                request_id=request_id,
+                video_id=video_id,
+                segments_count=len(cached.segments)
+            )
+            return cached
+
+        failure = await cache.get_failure(video_id)
+        # A remembered duration no longer over the (possibly raised) limit is retried
+        if failure is not None and not (failure.duration and downloader.is_within_limit(failure.duration)):
+            logger.info(
+                "stt_video_failure_cached",
+                request_id=request_id,
+                video_id=video_id,
+                duration=failure.duration
+            )
+            raise _download_error(video_id, failure.duration, downloader)
+
+    if settings.youtube_stream_enabled:
+        result = await _transcribe_streaming(video_id, language, request_id, downloader, on_stage)
+    else:
+        result = await _transcribe_downloaded(video_id, language, request_id, downloader, on_stage)
+
+    logger.info(
+        "stt_video_request_complete",
+        request_id=request_id,
+        video_id=video_id,
+        text_length=len(result.text),
+        language=result.language,
+        segments_count=len(result.segments)
+    )
+
+    if cache is not None:
+        await cache.set_transcript(video_id, language, scope, result)
+
+    return result
+
+
+async def _download_failed(video_id: str, duration: int | None, downloader: YouTubeAudioDownloader) -> AIServiceError:
+    """Remember a permanent failure (briefly) and build the error to raise"""
+    cache = get_video_transcript_cache()
+    too_long = bool(duration) and not downloader.is_within_limit(duration)
+    # Timeouts and network errors were already retried; the next request tries again
+    if cache is not None and (too_long or downloader.last_failure_permanent):
+        await cache.set_failure(video_id, DownloadFailure(duration=duration if too_long else None))
+    return _download_error(video_id, duration, downloader)
+
+
+async def _transcribe_downloaded(
+    video_id: str,
+    language: str,
+    request_id: str,
+    downloader: YouTubeAudioDownloader,
+    on_stage: Callable[[str], Awaitable[None]] | None,
+) -> STTResponse:
+    """Download the whole audio, then transcribe it"""
+    # Download audio from YouTube
+    if on_stage is not None:
+        await on_stage("downloading")
+    audio_data, duration = await downloader.download_audio(video_id)
+
+    if audio_data is None:
+        raise await _download_failed(video_id, duration, downloader)
+
+    logger.info(
+        "stt_video_audio_downloaded",
+        request_id=request_id,
+        video_id=video_id,
+        size_mb=round(len(audio_data) / 1024 / 1024, 2),
+        duration=duration
+    )
+
+    # Transcribe using STT
+    if on_stage is not None:
+        await on_stage("transcribing")
+    stt_client = STTClient()
+    return await stt_client.transcribe(
+        audio_data=audio_data,
+        filename=f"{video_id}.m4a",
+        language=language,
+        content_type="audio/mp4"
+    )
+
+
+async def _transcribe_streaming(
+    video_id: str,
+    language: str,
+    request_id: str,
+    downloader: YouTubeAudioDownloader,
+    on_stage: Callable[[str], Awaitable[None]] | None,
+) -> STTResponse:
+    """Upload the audio for STT while it is still downloading"""
+    if on_stage is not None:
+        await on_stage("downloading")
+    stream, duration = await downloader.open_audio_stream(video_id)
+
+    if stream is None:
+        raise await _download_failed(video_id, duration, downloader)
+
+    # Downloading and uploading now overlap; the upload is what's left to wait for
+    if on_stage is not None:
+        await on_stage("transcribing")
+    try:
+        return await STTClient().transcribe_stream(stream, language=language)
+    except AudioStreamError as e:
+        # Cut off mid-download: not remembered as a failure, a retry may well work
+        logger.error("stt_video_stream_failed", request_id=request_id, video_id=video_id, error=str(e))
+        raise _download_error(video_id, None, downloader)
+    finally:
+        await stream.aclose()
@@ -3,34 +3,82 @@
 import asyncio
 import tempfile
 import os
+import time
 import structlog
 from pathlib import Path
 from typing import Optional, Tuple
 
+import httpx
 import yt_dlp
 
 from app.config import get_settings
+from app.services.shared.stt import AudioStream, AudioStreamError
+from .youtube_info_cache import get_youtube_info_cache
+from .youtube_stream import open_media_stream
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+YDL_OPTS = {
+    'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
+    'quiet': True,
+    'no_warnings': True,
+    'extract_audio': True,
+    'noplaylist': True,
+    # Bypass age gate and bot detection
+    'age_limit': None,
+    'geo_bypass': True,
+    'nocheckcertificate': True,
+}
+
+# Container of the selected audio format -> upload content type
+STREAM_CONTENT_TYPES = {'m4a': 'audio/mp4', 'webm': 'audio/webm', 'mp3': 'audio/mpeg', 'ogg': 'audio/ogg'}
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Whether retrying can't help: private, removed, region-locked...
+
+    yt-dlp raises these as "expected" extractor errors; network errors,
+    throttled or expired media URLs and anything unexpected are transient.
+    """
+    cause = error.exc_info[1] if isinstance(error, yt_dlp.utils.DownloadError) and error.exc_info else None
+    return isinstance(cause, yt_dlp.utils.ExtractorError) and cause.expected
+
 
 class YouTubeAudioDownloader:
     """Download audio from YouTube videos using yt-dlp"""
 
     def __init__(self):
         self.max_duration_minutes = settings.stt_max_duration_minutes
+        # Set when the last download_audio/open_audio_stream failed for a
+        # reason a retry won't fix (callers remember those failures)
+        self.last_failure_permanent = False
 
     async def download_audio(self, video_id: str) -> Tuple[Optional[bytes], Optional[int]]:
         """
         Download audio from YouTube video
 
+        Transient failures are retried up to RETRY_MAX_ATTEMPTS times with
+        exponential backoff; permanent ones (see last_failure_permanent) and
+        videos over the duration limit are not.
+
         Args:
             video_id: YouTube video ID
 
         Returns:
             Tuple of (audio_bytes, duration_seconds) or (None, None) on failure
         """
+        attempts = max(1, settings.retry_max_attempts)
+        for attempt in range(1, attempts + 1):
+            audio_bytes, duration = await self._download_once(video_id)
+            if audio_bytes is not None or duration is not None or self.last_failure_permanent or attempt == attempts:
+                return audio_bytes, duration
+            delay = settings.retry_base_delay * 2 ** (attempt - 1)
+            logger.warning("youtube_audio_download_retry", video_id=video_id, attempt=attempt, delay=delay)
+            await asyncio.sleep(delay)
+
+    async def _download_once(self, video_id: str) -> Tuple[Optional[bytes], Optional[int]]:
+        self.last_failure_permanent = False
         video_url = f"https://www.youtube.com/watch?v={video_id}"
 
         logger.info("youtube_audio_download_start", video_id=video_id)
@@ -40,50 +88,36 @@ class YouTubeAudioDownloader:
             with tempfile.TemporaryDirectory() as temp_dir:
                 output_path = os.path.join(temp_dir, "audio")
 
-                ydl_opts = {
-                    'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
-                    'outtmpl': output_path + '.%(ext)s',
-                    'quiet': True,
-                    'no_warnings': True,
-                    'extract_audio': True,
-                    'noplaylist': True,
-                    # Bypass age gate and bot detection
-                    'age_limit': None,
-                    'geo_bypass': True,
-                    'nocheckcertificate': True,
-                }
-
-                def _extract_info(url: str, ydl_opts: dict) -> dict | None:
-                    """Blocking call to yt-dlp extract_info"""
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        return ydl.extract_info(url, download=False)
-
-                def _download(url: str, ydl_opts: dict) -> None:
-                    """Blocking call to yt-dlp download"""
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([url])
-
-                # Get video info first to check duration (run in thread)
-                info = await asyncio.to_thread(_extract_info, video_url, ydl_opts)
+                ydl_opts = {**YDL_OPTS, 'outtmpl': output_path + '.%(ext)s'}
 
-                if not info:
-                    logger.error("youtube_audio_info_failed", video_id=video_id)
-                    return None, None
+                # One YoutubeDL for both phases; the extraction result is
+                # processed for download instead of fetching the page again
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    started = time.perf_counter()
+                    info = await self._extract_info(ydl, video_id, video_url)
+                    extract_seconds = time.perf_counter() - started
 
-                duration_seconds = info.get('duration', 0)
-                max_duration_seconds = self.max_duration_minutes * 60
+                    if not info:
+                        logger.error("youtube_audio_info_failed", video_id=video_id)
+                        return None, None
 
-                if duration_seconds > max_duration_seconds:
-                    logger.warn(
-                        "youtube_audio_duration_exceeded",
-                        video_id=video_id,
-                        duration=duration_seconds,
-                        max_duration=max_duration_seconds
-                    )
-                    return None, duration_seconds
+                    duration_seconds = info.get('duration', 0)
+                    max_duration_seconds = self.max_duration_minutes * 60
+
+                    if duration_seconds > max_duration_seconds:
+                        logger.warn(
+                            "youtube_audio_duration_exceeded",
+                            video_id=video_id,
+                            duration=duration_seconds,
+                            max_duration=max_duration_seconds
+                        )
+                        self.last_failure_permanent = True
+                        return None, duration_seconds
 
-                # Download the audio (run in thread)
-                await asyncio.to_thread(_download, video_url, ydl_opts)
+                    # Select the format and download it (run in thread)
+                    started = time.perf_counter()
+                    await asyncio.to_thread(ydl.process_ie_result, info, download=True)
+                    download_seconds = time.perf_counter() - started
 
                 # Find the downloaded file
                 audio_file = None
@@ -97,24 +131,159 @@ class YouTubeAudioDownloader:
                     return None, None
 
                 # Read the audio file
+                started = time.perf_counter()
                 audio_bytes = audio_file.read_bytes()
+                read_seconds = time.perf_counter() - started
 
                 logger.info(
                     "youtube_audio_download_complete",
                     video_id=video_id,
                     size_mb=round(len(audio_bytes) / 1024 / 1024, 2),
-                    duration=duration_seconds
+                    duration=duration_seconds,
+                    extract_seconds=round(extract_seconds, 3),
+                    download_seconds=round(download_seconds, 3),
+                    read_seconds=round(read_seconds, 3)
                 )
 
                 return audio_bytes, duration_seconds
 
         except yt_dlp.utils.DownloadError as e:
-            logger.error("youtube_audio_download_error", video_id=video_id, error=str(e))
+            self.last_failure_permanent = _is_permanent(e)
+            logger.error(
+                "youtube_audio_download_error",
+                video_id=video_id,
+                error=str(e),
+                permanent=self.last_failure_permanent
+            )
+            # The cached media URLs may be what failed (expired or revoked)
+            cache = get_youtube_info_cache()
+            if cache is not None:
+                cache.delete(video_id)
             return None, None
         except Exception as e:
             logger.error("youtube_audio_unexpected_error", video_id=video_id, error=str(e))
             return None, None
 
+    async def open_audio_stream(self, video_id: str) -> Tuple[Optional[AudioStream], Optional[int]]:
+        """
+        Audio of a YouTube video as a stream, read from the media URL as it is consumed
+
+        The format is selected from the (cached) extraction without
+        downloading, and its URL is read in byte ranges by open_media_stream.
+        Formats that aren't a plain HTTP(S) file (HLS/DASH manifests) and
+        a first request that fails fall back to download_audio.
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            Tuple of (audio_stream, duration_seconds), (None, duration) if the
+            video is too long, or (None, None) on failure. Close the stream
+            with aclose() once done.
+        """
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
+
+        logger.info("youtube_audio_stream_start", video_id=video_id)
+        self.last_failure_permanent = False
+
+        try:
+            with yt_dlp.YoutubeDL(YDL_OPTS) as ydl:
+                started = time.perf_counter()
+                info = await self._extract_info(ydl, video_id, video_url)
+                extract_seconds = time.perf_counter() - started
+
+                if not info:
+                    logger.error("youtube_audio_info_failed", video_id=video_id)
+                    return None, None
+
+                duration_seconds = info.get('duration') or 0
+                if not self.is_within_limit(duration_seconds):
+                    logger.warn(
+                        "youtube_audio_duration_exceeded",
+                        video_id=video_id,
+                        duration=duration_seconds,
+                        max_duration=self.max_duration_minutes * 60
+                    )
+                    self.last_failure_permanent = True
+                    return None, duration_seconds
+
+                # Format selection only; the media URL is read below
+                selected = await asyncio.to_thread(ydl.process_ie_result, info, download=False)
+        except yt_dlp.utils.DownloadError as e:
+            logger.error("youtube_audio_download_error", video_id=video_id, error=str(e))
+            cache = get_youtube_info_cache()
+            if cache is not None:
+                cache.delete(video_id)
+            if _is_permanent(e):
+                self.last_failure_permanent = True
+                return None, None
+            # download_audio extracts afresh and retries
+            return await self._download_as_stream(video_id)
+
+        media_url = selected.get('url')
+        if not media_url or selected.get('protocol') not in ('http', 'https'):
+            logger.info("youtube_audio_stream_unsupported", video_id=video_id, protocol=selected.get('protocol'))
+            return await self._download_as_stream(video_id)
+
+        ext = selected.get('ext') or 'm4a'
+        started = time.perf_counter()
+        try:
+            stream = await open_media_stream(
+                media_url,
+                selected.get('http_headers') or {},
+                filename=f"{video_id}.{ext}",
+                content_type=STREAM_CONTENT_TYPES.get(ext, 'application/octet-stream'),
+                range_bytes=settings.youtube_stream_range_bytes,
+                buffer_bytes=settings.youtube_stream_buffer_bytes,
+            )
+        except (httpx.HTTPError, AudioStreamError) as e:
+            # Possibly an expired URL from the info cache; download_audio extracts afresh
+            logger.warning("youtube_audio_stream_open_failed", video_id=video_id, error=str(e))
+            cache = get_youtube_info_cache()
+            if cache is not None:
+                cache.delete(video_id)
+            return await self._download_as_stream(video_id)
+
+        logger.info(
+            "youtube_audio_stream_opened",
+            video_id=video_id,
+            size_mb=round(stream.size / 1024 / 1024, 2) if stream.size else None,
+            duration=duration_seconds,
+            format_id=selected.get('format_id'),
+            extract_seconds=round(extract_seconds, 3),
+            first_response_seconds=round(time.perf_counter() - started, 3)
+        )
+        return stream, duration_seconds
+
+    async def _download_as_stream(self, video_id: str) -> Tuple[Optional[AudioStream], Optional[int]]:
+        audio_bytes, duration = await self.download_audio(video_id)
+        if audio_bytes is None:
+            return None, duration
+
+        async def chunks():
+            yield audio_bytes
+
+        return AudioStream(chunks(), len(audio_bytes), f"{video_id}.m4a", "audio/mp4"), duration
+
+    async def _extract_info(self, ydl: yt_dlp.YoutubeDL, video_id: str, video_url: str) -> dict | None:
+        """
+        Video info as extracted from YouTube, before format selection
+
+        Served from the info cache when this video was extracted recently.
+        """
+        cache = get_youtube_info_cache()
+        if cache is not None:
+            info = cache.get(video_id)
+            if info is not None:
+                logger.info("youtube_info_cache_hit", video_id=video_id)
+                return info
+
+        # process=False: formats are selected later, by process_ie_result
+        info = await asyncio.to_thread(ydl.extract_info, video_url, download=False, process=False)
+        if info and cache is not None:
+            cache.set(video_id, info)
+        return info
+
     def is_within_limit(self, duration_seconds: int) -> bool:
         """Check if duration is within STT limit"""
         return duration_seconds <= self.max_duration_minutes * 60
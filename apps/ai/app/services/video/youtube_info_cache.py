@@ -0,0 +1,77 @@
+"""yt-dlp extraction results per video id, kept briefly in memory.
+
+Extracting a YouTube video (watch page, player, format list) is most of
+yt-dlp's work before the audio itself. The unprocessed info dict is kept
+for a short TTL so a retry, a transcription in another language or a job
+re-run downloads straight away. Only in memory: the info holds signed
+media URLs that expire after a few hours and are bound to this host's IP,
+and may contain values that don't survive JSON.
+"""
+
+import copy
+import time
+from collections import OrderedDict
+
+from app.config import get_settings
+from app.services.shared.cache import CacheStats
+
+_youtube_info_cache: "YouTubeInfoCache | None" = None
+
+
+class YouTubeInfoCache:
+    """LRU of extracted info dicts bounded by entry count, with a TTL"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+
+    def get(self, video_id: str) -> dict | None:
+        """A private copy of the cached info (yt-dlp mutates it while processing)"""
+        entry = self._entries.get(video_id)
+        if entry is not None and entry[1] <= time.time():
+            del self._entries[video_id]
+            self.stats.expirations += 1
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(video_id)
+        self.stats.hits += 1
+        self.stats.memory_hits += 1
+        return copy.deepcopy(entry[0])
+
+    def set(self, video_id: str, info: dict) -> None:
+        self._entries.pop(video_id, None)
+        self._entries[video_id] = (copy.deepcopy(info), time.time() + self.ttl)
+        self.stats.writes += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, video_id: str) -> None:
+        self._entries.pop(video_id, None)
+
+    def snapshot(self) -> dict:
+        return {"entries": len(self._entries), **self.stats.to_dict()}
+
+
+def get_youtube_info_cache() -> YouTubeInfoCache | None:
+    """Return the process-wide info cache, or None if disabled."""
+    global _youtube_info_cache
+    settings = get_settings()
+    if not settings.youtube_info_cache_enabled:
+        return None
+    if _youtube_info_cache is None:
+        _youtube_info_cache = YouTubeInfoCache(
+            max_entries=settings.youtube_info_cache_max_entries,
+            ttl=settings.youtube_info_cache_ttl,
+        )
+    return _youtube_info_cache
+
+
+def reset_youtube_info_cache() -> None:
+    """Drop the process-wide instance (shutdown and tests)."""
+    global _youtube_info_cache
+    _youtube_info_cache = None
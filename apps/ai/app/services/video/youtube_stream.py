@@ -0,0 +1,113 @@
+"""Reading a media URL chunk by chunk, for STT uploads that overlap the download.
+
+The file is requested in byte ranges (YouTube throttles long single
+requests, the same reason yt-dlp uses http_chunk_size) by a background
+task that stays a bounded buffer ahead of the reader. Nothing is written
+to disk and at most `buffer_bytes` of audio is held in memory.
+"""
+
+import asyncio
+import re
+
+import httpx
+import structlog
+
+from app.services.shared.stt import AudioStream, AudioStreamError
+from app.services.shared.stt.audio import AUDIO_CHUNK_SIZE
+
+logger = structlog.get_logger()
+
+_CONTENT_RANGE_TOTAL = re.compile(r"/(\d+)$")
+
+
+def _build_media_client() -> httpx.AsyncClient:
+    # Not the pooled STT client: different host, and redirects are expected
+    return httpx.AsyncClient(follow_redirects=True, timeout=httpx.Timeout(30.0))
+
+
+def _total_size(response: httpx.Response) -> int | None:
+    if response.status_code == 206:
+        match = _CONTENT_RANGE_TOTAL.search(response.headers.get("content-range", ""))
+        return int(match.group(1)) if match else None
+    length = response.headers.get("content-length")
+    return int(length) if length else None
+
+
+async def _fetch(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    range_bytes: int,
+    queue: asyncio.Queue,
+    size: asyncio.Future,
+) -> None:
+    """Producer: range requests until the whole file is in the queue, then None"""
+    position = 0
+    total = None
+    try:
+        while total is None or position < total:
+            request_headers = {**headers, "Range": f"bytes={position}-{position + range_bytes - 1}"}
+            async with client.stream("GET", url, headers=request_headers) as response:
+                response.raise_for_status()
+                if total is None:
+                    total = _total_size(response)
+                    if total is None and response.status_code == 206:
+                        # Only part of the file, and no way to know how much is left
+                        raise AudioStreamError("media server sent a partial response without a total size")
+                    size.set_result(total)
+                received = 0
+                async for chunk in response.aiter_bytes(AUDIO_CHUNK_SIZE):
+                    received += len(chunk)
+                    await queue.put(chunk)
+            position += received
+            if response.status_code != 206 or total is None:
+                break  # Whole file in one response (server ignored the range)
+            if received == 0:
+                raise AudioStreamError(f"media stream ended at {position} of {total} bytes")
+        await queue.put(None)
+    except Exception as e:
+        if not size.done():
+            size.set_exception(e)
+        await queue.put(e)
+
+
+async def open_media_stream(
+    url: str,
+    headers: dict[str, str],
+    filename: str,
+    content_type: str,
+    range_bytes: int = 10 * 1024 * 1024,
+    buffer_bytes: int = 4 * 1024 * 1024,
+) -> AudioStream:
+    """Start downloading `url` and return it as an AudioStream of known size.
+
+    Returns once the first response has arrived, so the size (and any HTTP
+    error) is known up front. Raises httpx.HTTPError if the first request
+    fails, or AudioStreamError if it is partial without saying the total
+    size. The caller must aclose() the stream.
+    """
+    client = _build_media_client()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, buffer_bytes // AUDIO_CHUNK_SIZE))
+    size: asyncio.Future = asyncio.get_running_loop().create_future()
+    producer = asyncio.ensure_future(_fetch(client, url, headers, range_bytes, queue, size))
+
+    async def close() -> None:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        await client.aclose()
+
+    try:
+        total = await size
+    except BaseException:
+        await close()
+        raise
+
+    async def chunks():
+        while (item := await queue.get()) is not None:
+            if isinstance(item, Exception):
+                if isinstance(item, AudioStreamError):
+                    raise item
+                raise AudioStreamError(f"media download failed: {item}") from item
+            yield item
+
+    return AudioStream(chunks(), total, filename, content_type, on_close=close)
@@ -0,0 +1 @@
+"""Offline benchmarks for the AI service (run with `python -m benchmarks.<name>`)"""
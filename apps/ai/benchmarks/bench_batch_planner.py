@@ -0,0 +1,85 @@
+"""Token-aware batch planning vs the fixed 10-segment split.
+
+Usage (from apps/ai):
+    python -m benchmarks.bench_batch_planner [--input stt.json ...] [--token-target 1500] [--max-segments 40]
+
+Without --input, synthetic transcripts shaped like our STT output are used
+(fragmented lyrics, conversation, long lecture segments, and a mix). With
+--input, each file is an STT response ({"segments": [...]}) or a bare
+segment list, e.g. saved /api/v1/stt/transcribe responses.
+
+For each transcript the script prints the number of LLM round trips, the
+estimated tokens of the largest batch (output-limit/timeout risk), total
+prompt tokens including the per-batch system prompt, and a
+simulated wall time: batches run in a sliding window of
+translation_concurrent_batches slots, each taking
+FIRST_TOKEN_SECONDS + completion tokens / TOKENS_PER_SECOND.
+"""
+
+import argparse
+import heapq
+import statistics
+
+from benchmarks.common import load_transcript, synthetic_transcripts
+
+from app.config import get_settings
+from app.prompts.translation import get_translation_system_prompt
+from app.services.shared.batch_planner import plan_batches, segment_cost
+from app.services.shared.tokens import estimate_tokens
+
+FIRST_TOKEN_SECONDS = 0.6
+TOKENS_PER_SECOND = 60.0
+
+def simulate_wall_time(batch_tokens: list[int], window: int) -> float:
+    """Sliding-window schedule: each batch starts when the earliest slot frees"""
+    slots = [0.0] * max(1, window)
+    for tokens in batch_tokens:
+        start = heapq.heappop(slots)
+        # Roughly half of a batch's estimate is completion tokens
+        heapq.heappush(slots, start + FIRST_TOKEN_SECONDS + (tokens / 2) / TOKENS_PER_SECOND)
+    return max(slots)
+
+
+def describe(name: str, texts: list[str], token_target: int, max_segments: int, window: int) -> None:
+    fixed = plan_batches(texts, token_target=0, max_segments=10)
+    planned = plan_batches(texts, token_target=token_target, max_segments=max_segments)
+    costs = [segment_cost(t) for t in texts]
+    system_tokens = estimate_tokens(get_translation_system_prompt("en", "ko"))
+    print(
+        f"\n{name}: {len(texts)} segments, "
+        f"median {statistics.median(costs)} / max {max(costs)} est. tokens per segment"
+    )
+    for label, plan in [("fixed-10", fixed), (f"token-{token_target}", planned)]:
+        tokens = plan.estimated_tokens
+        # The system prompt is resent with every batch
+        prompt_tokens = sum(tokens) // 2 + len(plan) * system_tokens
+        print(
+            f"  {label:>12}: batches={len(plan):4d}  prompt_tokens={prompt_tokens:6d}  "
+            f"tokens/batch median={int(statistics.median(tokens)):5d} max={max(tokens):5d}  "
+            f"simulated={simulate_wall_time(tokens, window):6.1f}s"
+        )
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", nargs="*", default=[])
+    parser.add_argument("--token-target", type=int, default=settings.translation_batch_token_target)
+    parser.add_argument("--max-segments", type=int, default=settings.translation_batch_size)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    transcripts = (
+        {path: load_transcript(path) for path in args.input}
+        if args.input
+        else synthetic_transcripts(args.seed)
+    )
+    window = settings.translation_concurrent_batches
+    print(f"window={window} first_token={FIRST_TOKEN_SECONDS}s decode={TOKENS_PER_SECOND} tok/s")
+    for name, texts in transcripts.items():
+        if texts:
+            describe(name, texts, args.token_target, args.max_segments, window)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Real-time factor of the local faster-whisper provider, for sizing CPU nodes.
+
+Usage (from apps/ai, needs `pip install faster-whisper` and a speech file):
+    python -m benchmarks.bench_local_stt_rtf --input speech.wav [--threads 1 2 4] [--model small]
+
+For each threads-per-worker value the pool runs cores // threads workers
+(at least one) and measures, after loading the model in every worker:
+
+- RTF: processing time / audio duration of a single job on an idle pool
+  (lower is faster; 0.1 = ten minutes of audio in one minute)
+- throughput: audio seconds transcribed per wall-clock second with every
+  worker busy
+- per core: throughput / cores in use, to size a node from expected
+  audio hours per hour
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+import structlog
+
+from benchmarks.common import reset_shared_state  # noqa: F401  (sets env defaults)
+
+
+async def _run(path: str, model: str, compute_type: str, threads: int, cores: int, language: str) -> dict:
+    from app.services.shared.stt.local_provider import LocalWhisperPool
+
+    workers = max(1, cores // threads)
+    pool = LocalWhisperPool(model, compute_type=compute_type, workers=workers, cpu_threads=threads, queue_size=workers)
+    try:
+        started = time.perf_counter()
+        await pool.start()
+        load_seconds = time.perf_counter() - started
+
+        single = await pool.transcribe(path, language)
+        rtf = single["processing_seconds"] / single["duration"]
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(pool.transcribe(path, language) for _ in range(workers)))
+        wall = time.perf_counter() - started
+        throughput = sum(r["duration"] for r in results) / wall
+    finally:
+        pool.close()
+
+    return {
+        "workers": workers,
+        "load": load_seconds,
+        "rtf": rtf,
+        "throughput": throughput,
+        "per_core": throughput / (workers * threads),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", required=True, help="speech audio file (any format ffmpeg/PyAV can decode)")
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4], help="cpu_threads per worker")
+    parser.add_argument("--cores", type=int, default=os.cpu_count() or 1, help="cores to fill with workers")
+    parser.add_argument("--language", default="auto")
+    args = parser.parse_args()
+
+    try:
+        import faster_whisper  # noqa: F401
+    except ImportError:
+        sys.exit("faster-whisper is not installed (pip install faster-whisper)")
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    print(f"model={args.model} compute_type={args.compute_type} cores={args.cores}")
+    print(f"{'threads':>7}  {'workers':>7}  {'load':>7}  {'RTF':>6}  {'throughput':>10}  {'per core':>8}")
+    for threads in args.threads:
+        r = asyncio.run(_run(args.input, args.model, args.compute_type, threads, args.cores, args.language))
+        print(
+            f"{threads:>7}  {r['workers']:>7}  {r['load']:>6.1f}s  {r['rtf']:>6.3f}  "
+            f"{r['throughput']:>9.1f}x  {r['per_core']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cost of the STT result cache key (SHA-256 of the audio) next to a transcription.
+
+Usage (from apps/ai):
+    python -m benchmarks.bench_stt_cache_hash [--sizes 10 100 250] [--bitrate 128] [--rtf 0.1]
+
+For each file size (written to a temp file, as an upload is spooled):
+
+- hash: time to compute the cache key (streaming SHA-256 in a worker thread)
+- hit: STTClient.transcribe_source for a file already in the cache
+  (validation + hash + lookup), end to end
+- transcription: what a miss costs on the backend, estimated as
+  audio duration (size at --bitrate kbps) x --rtf (real-time factor)
+
+No STT backend is called; the cache is primed directly.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+import structlog
+
+from benchmarks.common import reset_shared_state  # noqa: F401  (sets env defaults)
+
+MB = 1024 * 1024
+
+
+async def _run(size_mb: int, bitrate_kbps: int, rtf: float) -> tuple[float, float, float]:
+    from app.services.shared.stt import AudioSource, STTResult
+    from app.services.shared.stt.result_cache import get_stt_result_cache, hash_audio, reset_stt_result_cache
+    from app.services.video.stt_client import STTClient
+
+    reset_stt_result_cache()
+    client = STTClient()
+    with tempfile.NamedTemporaryFile(suffix=".mp3") as f:
+        block = os.urandom(MB)
+        for _ in range(size_mb):
+            f.write(block)
+        f.flush()
+
+        audio = AudioSource.from_path(f.name, content_type="audio/mpeg")
+        try:
+            started = time.perf_counter()
+            await hash_audio(audio)
+            hash_seconds = time.perf_counter() - started
+
+            cache = get_stt_result_cache()
+            key = await cache.make_key(audio, client._cache_scope, "auto")
+            await cache.set(key, STTResult(text="cached", language="en"))
+
+            started = time.perf_counter()
+            await client.transcribe_source(audio, "auto")
+            hit_seconds = time.perf_counter() - started
+        finally:
+            audio.close()
+
+    audio_seconds = size_mb * MB * 8 / (bitrate_kbps * 1000)
+    return hash_seconds, hit_seconds, audio_seconds * rtf
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 250], help="file sizes in MB")
+    parser.add_argument("--bitrate", type=int, default=128, help="audio bitrate in kbps, for the duration estimate")
+    parser.add_argument("--rtf", type=float, default=0.1, help="backend real-time factor")
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    os.environ["MAX_FILE_SIZE_MB"] = str(max(args.sizes) + 1)
+    print(f"{'file':>7}  {'hash':>9}  {'hash rate':>11}  {'cache hit':>10}  {'transcription':>14}")
+    for size_mb in args.sizes:
+        hash_seconds, hit_seconds, transcribe_seconds = asyncio.run(_run(size_mb, args.bitrate, args.rtf))
+        print(
+            f"{size_mb:>5}MB  {hash_seconds:>8.3f}s  {size_mb / hash_seconds:>7.0f}MB/s  "
+            f"{hit_seconds:>9.3f}s  {transcribe_seconds:>13.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
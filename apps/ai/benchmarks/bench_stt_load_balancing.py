@@ -0,0 +1,131 @@
+"""Latency across several STT backends: round robin vs least outstanding bytes.
+
+Usage (from apps/ai):
+    python -m benchmarks.bench_stt_load_balancing [--requests 200] [--concurrency 12] [--dead]
+
+Three stand-in WhisperX backends, each transcribing two files at a time
+with a service time proportional to the file size; the third one is
+--slow times slower (an older box, or one with a noisy neighbour). File
+sizes follow a heavy-tailed distribution (mostly short clips, a few long
+videos). With --dead a fourth backend refuses connections.
+
+For each strategy the same requests are sent by --concurrency clients and
+the per-request latency (mean, p50, p95, max) and the share of audio each
+backend received are reported. Time is scaled so a run takes seconds.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import statistics
+import time
+
+import httpx
+import structlog
+
+from benchmarks.common import reset_shared_state  # noqa: F401  (sets env defaults)
+
+MB = 1024 * 1024
+
+
+class StandInBackends:
+    """Fake WhisperX servers with limited parallelism, routed by host"""
+
+    def __init__(self, speeds: dict[str, float], seconds_per_mb: float, slots: int = 2):
+        self.speeds = speeds
+        self.seconds_per_mb = seconds_per_mb
+        self.slots = {host: asyncio.Semaphore(slots) for host in speeds}
+        self.audio_bytes = {host: 0 for host in speeds}
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if self.speeds[host] == 0:
+            raise httpx.ConnectError("connection refused", request=request)
+        size = len(await request.aread())
+        async with self.slots[host]:
+            await asyncio.sleep(size / MB * self.seconds_per_mb / self.speeds[host])
+        self.audio_bytes[host] += size
+        return httpx.Response(200, json={"text": "", "language": "en", "segments": []})
+
+
+def _round_robin_pool(urls: list[str]):
+    from app.services.shared.stt.backends import STTBackendPool
+
+    class RoundRobinPool(STTBackendPool):
+        """Baseline: the next backend in turn, whatever it is doing"""
+
+        def __init__(self, urls):
+            super().__init__(urls)
+            self._turn = itertools.cycle(self.backends)
+
+        def pick(self, exclude=frozenset()):
+            for backend in self._turn:
+                if backend.url not in exclude or len(exclude) >= len(self.backends):
+                    return backend
+
+    return RoundRobinPool(urls)
+
+
+async def _run(strategy: str, sizes: list[int], concurrency: int, slow: float, dead: bool) -> tuple[list[float], dict]:
+    from app.services.shared.stt import AudioSource
+    from app.services.shared.stt.backends import STTBackendPool
+    from app.services.shared.stt.whisperx_provider import WhisperXProvider
+
+    speeds = {"stt-1": 1.0, "stt-2": 1.0, "stt-3": 1 / slow}
+    if dead:
+        speeds["stt-4"] = 0
+    urls = [f"http://{host}:12321" for host in speeds]
+    backends = StandInBackends(speeds, seconds_per_mb=0.02)
+    pool = _round_robin_pool(urls) if strategy == "round robin" else STTBackendPool(urls)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(backends.handler))
+    provider = WhisperXProvider(http_client=client, backends=pool)
+
+    queue = list(sizes)
+    latencies: list[float] = []
+
+    async def worker():
+        while queue:
+            size = queue.pop()
+            started = time.perf_counter()
+            await provider.transcribe_source(AudioSource.from_bytes(b"\0" * size, "a.mp3", "audio/mpeg"))
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    await client.aclose()
+    return latencies, backends.audio_bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--slow", type=float, default=4.0, help="how many times slower the third backend is")
+    parser.add_argument("--dead", action="store_true", help="add a backend that refuses connections")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    from app.config import get_settings
+
+    # Retries of the dead backend should not sleep
+    get_settings().retry_base_delay = 0.0
+
+    rng = random.Random(args.seed)
+    sizes = [min(int(rng.lognormvariate(0, 1.2) * MB), 60 * MB) for _ in range(args.requests)]
+    print(f"{args.requests} requests, {sum(sizes) / MB:.0f}MB of audio, concurrency {args.concurrency}")
+    print(f"{'strategy':>14}  {'mean':>7}  {'p50':>7}  {'p95':>7}  {'max':>7}  audio share per backend")
+    for strategy in ("round robin", "least bytes"):
+        latencies, audio_bytes = asyncio.run(_run(strategy, sizes, args.concurrency, args.slow, args.dead))
+        latencies.sort()
+        total = sum(audio_bytes.values())
+        share = "  ".join(f"{host}={audio_bytes[host] / total:.0%}" for host in audio_bytes)
+        print(
+            f"{strategy:>14}  {statistics.mean(latencies):>6.2f}s  {latencies[len(latencies) // 2]:>6.2f}s  "
+            f"{latencies[int(len(latencies) * 0.95)]:>6.2f}s  {latencies[-1]:>6.2f}s  {share}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Bytes sent and STT latency with and without Opus transcoding (requires ffmpeg).
+
+Usage (from apps/ai):
+    python -m benchmarks.bench_stt_transcode [--minutes 5 30 60] [--uplink-mbps 100] [--bitrate 24]
+
+For each duration a 128 kbps stereo AAC file (tone + noise) is generated
+with ffmpeg, then sent through STTClient.transcribe_source twice:
+
+- original: the file as is
+- opus: STT_TRANSCODE_ENABLED (16 kHz mono Opus at --bitrate kbps)
+
+The STT backend is an httpx transport that reads the request body at
+--uplink-mbps and returns an empty transcript, so latency is
+transcoding + upload. Model time is left out: the backend resamples to
+16 kHz mono either way.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import structlog
+
+from benchmarks.common import reset_shared_state
+
+MB = 1024 * 1024
+
+
+def _throttled_transport(uplink_mbps: float):
+    """Stand-in STT backend that receives the body at a fixed bandwidth"""
+    import httpx
+
+    class ThrottledTransport(httpx.AsyncBaseTransport):
+        def __init__(self):
+            self.received = 0
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            async for chunk in request.stream:
+                self.received += len(chunk)
+                await asyncio.sleep(len(chunk) * 8 / (uplink_mbps * 1_000_000))
+            return httpx.Response(200, json={"text": "", "language": "en", "segments": []})
+
+    return ThrottledTransport()
+
+
+def _generate(path: str, minutes: int) -> None:
+    seconds = minutes * 60
+    subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency=220:duration={seconds}",
+            "-f", "lavfi", "-i", f"anoisesrc=d={seconds}:a=0.05",
+            "-filter_complex", "amix=inputs=2,aformat=channel_layouts=stereo",
+            "-ar", "44100", "-c:a", "aac", "-b:a", "128k", path,
+        ],
+        check=True,
+    )
+
+
+async def _send(path: str, transcode: bool, bitrate: int, uplink_mbps: float) -> tuple[int, float]:
+    import httpx
+
+    from app.config import get_settings
+    from app.services.shared import clients
+    from app.services.shared.stt import AudioSource
+    from app.services.video.stt_client import STTClient
+
+    reset_shared_state()
+    settings = get_settings()
+    settings.stt_cache_enabled = False
+    settings.stt_transcode_enabled = transcode
+    settings.stt_transcode_bitrate_kbps = bitrate
+
+    transport = _throttled_transport(uplink_mbps)
+    clients._stt_http_client = httpx.AsyncClient(transport=transport, timeout=None)
+    audio = AudioSource.from_path(path, content_type="audio/mp4")
+    try:
+        started = time.perf_counter()
+        await STTClient().transcribe_source(audio)
+        return transport.received, time.perf_counter() - started
+    finally:
+        audio.close()
+        await clients._stt_http_client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, nargs="+", default=[5, 30, 60], help="audio durations")
+    parser.add_argument("--uplink-mbps", type=float, default=100.0, help="bandwidth to the STT backend")
+    parser.add_argument("--bitrate", type=int, default=24, help="Opus bitrate in kbps")
+    args = parser.parse_args()
+
+    if shutil.which("ffmpeg") is None:
+        sys.exit("ffmpeg not found on PATH")
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    print(f"{'audio':>6}  {'original':>17}  {'opus':>17}  {'bytes':>6}  {'latency':>7}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for minutes in args.minutes:
+            path = os.path.join(workdir, f"talk-{minutes}m.m4a")
+            _generate(path, minutes)
+            sent, took = asyncio.run(_send(path, False, args.bitrate, args.uplink_mbps))
+            opus_sent, opus_took = asyncio.run(_send(path, True, args.bitrate, args.uplink_mbps))
+            print(
+                f"{minutes:>4}m  {sent / MB:>7.1f}MB {took:>7.2f}s  {opus_sent / MB:>7.1f}MB {opus_took:>7.2f}s  "
+                f"{sent / opus_sent:>5.1f}x  {took / opus_took:>6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Peak memory of /stt/transcribe as the uploaded file grows.
+
+Usage (from apps/ai):
+    python -m benchmarks.bench_stt_upload_memory [--sizes 25 100 250]
+
+Each (mode, size) runs in a fresh subprocess and reports how much the
+process's peak RSS grew while handling one upload:
+
+- buffered: the previous handler (`await audio.read()` then a multipart
+  body built from the bytes), mounted on a benchmark-only route
+- streaming: the real /stt/transcribe (upload spooled to disk, streamed
+  to the backend)
+
+The STT backend is an httpx transport that drains the request body
+chunk by chunk, so only the AI service's own buffering is measured.
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import reset_shared_state  # noqa: F401  (sets env defaults)
+
+MB = 1024 * 1024
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _drain_transport():
+    """Stand-in STT backend that reads the body chunk by chunk and keeps nothing.
+
+    (httpx.MockTransport would buffer the whole request before its handler runs.)
+    """
+    import httpx
+
+    class DrainTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            received = 0
+            async for chunk in request.stream:
+                received += len(chunk)
+            return httpx.Response(200, json={"text": "", "language": "en", "segments": [], "received": received})
+
+    return DrainTransport()
+
+
+def _install_buffered_route(app) -> None:
+    from fastapi import File, Form, UploadFile
+
+    from app.services.shared.clients import get_stt_http_client
+
+    @app.post("/bench/buffered")
+    async def buffered(audio: UploadFile = File(...), language: str = Form(default="auto")):
+        audio_data = await audio.read()
+        response = await get_stt_http_client().post(
+            "http://stt/whisperX/transcribe",
+            files={"audio": (audio.filename, audio_data, "audio/webm")},
+            data={"language": language},
+        )
+        return response.json()
+
+
+async def _run_worker(mode: str, size_mb: int) -> None:
+    import httpx
+
+    from app.services.shared import clients
+    from main import app
+
+    clients._stt_http_client = httpx.AsyncClient(transport=_drain_transport())
+    _install_buffered_route(app)
+    path = "/bench/buffered" if mode == "buffered" else "/stt/transcribe"
+
+    with tempfile.NamedTemporaryFile(suffix=".mp3") as f:
+        block = os.urandom(MB)
+        for _ in range(size_mb):
+            f.write(block)
+        f.flush()
+        del block
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            before = _peak_rss_mb()
+            with open(f.name, "rb") as audio:
+                response = await client.post(path, files={"audio": ("bench.mp3", audio, "audio/mpeg")})
+            response.raise_for_status()
+            print(f"{_peak_rss_mb() - before:.1f}")
+
+
+def _measure(mode: str, size_mb: int) -> float:
+    env = {**os.environ, "MAX_FILE_SIZE_MB": str(size_mb + 1), "RATE_LIMIT_STT": "1000"}
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_stt_upload_memory", "--worker", mode, str(size_mb)],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 100, 250], help="upload sizes in MB")
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "SIZE_MB"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        asyncio.run(_run_worker(args.worker[0], int(args.worker[1])))
+        return
+
+    print(f"{'upload':>8}  {'buffered':>14}  {'streaming':>14}   (peak RSS growth)")
+    for size_mb in args.sizes:
+        buffered = _measure("buffered", size_mb)
+        streaming = _measure("streaming", size_mb)
+        print(f"{size_mb:>6}MB  {buffered:>12.1f}MB  {streaming:>12.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Sliding-window vs lockstep batch scheduling in translate_segments.
+
+Usage (from apps/ai):
+    python -m benchmarks.bench_translation_pipeline [--segments 600] [--base-latency 0.2]
+
+A fake OpenAI client answers each batch after a skewed latency (most calls
+around --base-latency, ~15% of them 6x slower). The lockstep baseline is the
+previous scheduler: start translation_concurrent_batches batches, wait for
+the whole group with asyncio.gather, then start the next group.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+
+# Compare schedulers on identical fixed-size batches
+os.environ.setdefault("TRANSLATION_BATCH_SIZE", "10")
+os.environ.setdefault("TRANSLATION_BATCH_TOKEN_TARGET", "0")
+
+from benchmarks.common import echo_translation, fake_openai, reset_shared_state, skewed_latency, timed
+
+from app.config import get_settings
+from app.services.shared.llm_service import BaseLLMService, LLMConfig
+from app.services.shared.translation import build_context, chunk_array, translate_batch, translate_segments
+
+
+async def lockstep_translate(segments: list[dict]) -> list[str]:
+    """The pre-pipeline scheduler, kept here as the baseline"""
+    settings = get_settings()
+    llm = BaseLLMService(default_config=LLMConfig(model=settings.openai_model, weight=1))
+    batches = chunk_array(segments, settings.translation_batch_size)
+    group_size = settings.translation_concurrent_batches
+    translated: list[str] = []
+    previous_context = ""
+    for i in range(0, len(batches), group_size):
+        group = batches[i:i + group_size]
+        results = await asyncio.gather(*[
+            translate_batch(llm, batch, "en", "ko", "" if i + j == 0 else previous_context)
+            for j, batch in enumerate(group)
+        ])
+        for batch_result in results:
+            translated.extend(batch_result)
+        previous_context = build_context(group[-1], len(group[-1]), settings.translation_context_size)
+    return translated
+
+
+async def run(n_segments: int, base_latency: float, seed: int) -> None:
+    settings = get_settings()
+    segments = [
+        {"start": float(i), "end": float(i + 1), "text": f"Subtitle line number {i}"}
+        for i in range(n_segments)
+    ]
+    n_batches = -(-n_segments // settings.translation_batch_size)
+
+    print(
+        f"segments={n_segments} batches={n_batches} batch_size={settings.translation_batch_size} "
+        f"window={settings.translation_concurrent_batches} base_latency={base_latency}s"
+    )
+
+    results = {}
+    for name, translate in [
+        ("lockstep", lockstep_translate),
+        ("sliding_window", lambda segs: translate_segments(segs, "en", "ko")),
+    ]:
+        reset_shared_state()
+        # Same latency for a given batch under both schedulers
+        rng = random.Random(seed)
+        batch_latency = [skewed_latency(rng, base_latency) for _ in range(n_batches)]
+
+        def latency(user_content: str) -> float:
+            first_text = json.loads(user_content.split("번역할 자막:\n", 1)[1])[0]["text"]
+            return batch_latency[int(first_text.rsplit(" ", 1)[1]) // settings.translation_batch_size]
+
+        with fake_openai(echo_translation, latency) as calls:
+            _, elapsed = await timed(translate(segments))
+        busy = sum(delay for _, delay in calls)
+        results[name] = elapsed
+        print(
+            f"{name:>15}: {elapsed:6.2f}s  calls={len(calls)}  "
+            f"throughput={n_segments / elapsed:7.1f} seg/s  "
+            f"slot_utilization={busy / (elapsed * settings.translation_concurrent_batches):5.1%}"
+        )
+
+    print(f"speedup: {results['lockstep'] / results['sliding_window']:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=600)
+    parser.add_argument("--base-latency", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(run(args.segments, args.base_latency, args.seed))
+
+
+if __name__ == "__main__":
+    main()
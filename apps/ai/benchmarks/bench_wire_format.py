@@ -0,0 +1,88 @@
+"""Token cost of the JSON vs compact translation wire formats.
+
+Usage (from apps/ai):
+    python -m benchmarks.bench_wire_format [--input stt.json ...]
+
+Builds the exact prompts translate_batch sends for each batch of the plan,
+plus the reply each protocol asks for, and counts tokens with tiktoken
+(o200k_base) when it is installed, otherwise with tokens.estimate_tokens.
+The source text stands in for the translation, so reply counts measure
+protocol overhead rather than target-language length. JSON replies are
+formatted like the prompt's example (2-space indented).
+"""
+
+import argparse
+import json
+
+from benchmarks.common import load_transcript, synthetic_transcripts
+
+from app.config import get_settings
+from app.prompts.translation import get_translation_system_prompt
+from app.services.shared.batch_planner import plan_batches
+from app.services.shared.tokens import estimate_tokens
+from app.services.shared.translation import build_batch_prompt, build_context
+from app.services.shared.translation_wire import encode_compact
+
+
+def token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return "tiktoken/o200k_base", lambda text: len(encoding.encode(text))
+    except Exception:  # not installed, or the encoding can't be downloaded
+        return "estimate_tokens", estimate_tokens
+
+
+def expected_reply(texts: list[str], wire_format: str) -> str:
+    if wire_format == "compact":
+        return encode_compact(texts)
+    return json.dumps(
+        {"translations": [{"id": idx, "text": text} for idx, text in enumerate(texts)]},
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
+def measure(texts: list[str], count) -> dict[str, tuple[int, int]]:
+    settings = get_settings()
+    plan = plan_batches(texts, settings.translation_batch_token_target, settings.translation_batch_size)
+    totals = {}
+    for wire_format in ("json", "compact"):
+        system_tokens = count(get_translation_system_prompt("en", "ko", wire_format))
+        prompt_tokens = reply_tokens = 0
+        for batch in plan.batches:
+            batch_texts = [texts[idx] for idx in batch]
+            context = build_context([{"text": t} for t in texts], batch[0], settings.translation_context_size)
+            prompt_tokens += system_tokens + count(build_batch_prompt(batch_texts, context, wire_format))
+            reply_tokens += count(expected_reply(batch_texts, wire_format))
+        totals[wire_format] = (prompt_tokens, reply_tokens)
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", nargs="*", default=[])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    transcripts = (
+        {path: load_transcript(path) for path in args.input}
+        if args.input
+        else synthetic_transcripts(args.seed)
+    )
+    counter_name, count = token_counter()
+    print(f"token counter: {counter_name}")
+    for name, texts in transcripts.items():
+        if not texts:
+            continue
+        totals = measure(texts, count)
+        (json_in, json_out), (compact_in, compact_out) = totals["json"], totals["compact"]
+        print(
+            f"{name:>14}: prompt {json_in:6d} -> {compact_in:6d} ({1 - compact_in / json_in:5.1%} fewer)  "
+            f"reply {json_out:6d} -> {compact_out:6d} ({1 - compact_out / json_out:5.1%} fewer)"
+        )
+
+
+if __name__ == "__main__":
+    main()
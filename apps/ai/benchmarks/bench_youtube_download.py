@@ -0,0 +1,100 @@
+"""yt-dlp phases of a YouTube audio download: two extractions vs one vs cached.
+
+Usage (from apps/ai, needs network access to YouTube):
+    python -m benchmarks.bench_youtube_download [--video-ids jNQXAC9IVRw ...] [--runs 3]
+
+For each video, with a fresh temp directory per run:
+
+- two-pass: extract_info(download=False), then ydl.download([url]) on a
+  new YoutubeDL, which fetches and parses the page and player again
+  (the previous download path)
+- single: extract_info(process=False) once, then process_ie_result on the
+  same YoutubeDL (YouTubeAudioDownloader.download_audio, info cache off)
+- cached: download_audio with the extraction already in the info cache
+
+Times are the median of --runs; "extract" is the part of the total spent
+before the first (or only) extraction returned.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+import structlog
+import yt_dlp
+
+from benchmarks.common import reset_shared_state
+
+YDL_OPTS = {
+    'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
+    'quiet': True,
+    'no_warnings': True,
+    'noplaylist': True,
+}
+
+
+def _two_pass(url: str) -> tuple[float, float]:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        opts = {**YDL_OPTS, 'outtmpl': os.path.join(temp_dir, 'audio.%(ext)s')}
+        started = time.perf_counter()
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            ydl.extract_info(url, download=False)
+        extract = time.perf_counter() - started
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            ydl.download([url])
+        return extract, time.perf_counter() - started
+
+
+def _single(url: str) -> tuple[float, float]:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        opts = {**YDL_OPTS, 'outtmpl': os.path.join(temp_dir, 'audio.%(ext)s')}
+        started = time.perf_counter()
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(url, download=False, process=False)
+            extract = time.perf_counter() - started
+            ydl.process_ie_result(info, download=True)
+        return extract, time.perf_counter() - started
+
+
+async def _downloader(video_id: str, cached: bool) -> float:
+    from app.services.video.youtube_audio import YouTubeAudioDownloader
+
+    reset_shared_state()
+    downloader = YouTubeAudioDownloader()
+    if cached:
+        await downloader.download_audio(video_id)
+    started = time.perf_counter()
+    audio, _ = await downloader.download_audio(video_id)
+    if audio is None:
+        raise SystemExit(f"download of {video_id} failed")
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video-ids", nargs="+", default=["jNQXAC9IVRw"])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    print(f"{'video':>12}  {'two-pass':>9}  {'extract':>8}  {'single':>9}  {'extract':>8}  {'cached':>9}")
+    for video_id in args.video_ids:
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        two_pass = [_two_pass(url) for _ in range(args.runs)]
+        single = [_single(url) for _ in range(args.runs)]
+        cached = [asyncio.run(_downloader(video_id, cached=True)) for _ in range(args.runs)]
+        print(
+            f"{video_id:>12}  {statistics.median(t for _, t in two_pass):>8.2f}s  "
+            f"{statistics.median(e for e, _ in two_pass):>7.2f}s  "
+            f"{statistics.median(t for _, t in single):>8.2f}s  "
+            f"{statistics.median(e for e, _ in single):>7.2f}s  "
+            f"{statistics.median(cached):>8.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
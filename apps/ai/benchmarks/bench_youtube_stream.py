@@ -0,0 +1,134 @@
+"""YouTube audio into STT: download to a temp file first vs stream while downloading.
+
+Usage (from apps/ai):
+    python -m benchmarks.bench_youtube_stream [--sizes 10 50 100] [--download-mbps 80] [--upload-mbps 80]
+
+A stand-in media host serves the audio at --download-mbps and a stand-in
+STT backend reads the upload at --upload-mbps (both via httpx transports,
+no network). For each file size:
+
+- download: the whole file is fetched into a temp file, read into memory
+  and then uploaded (the previous download_audio + STTClient.transcribe)
+- stream: open_media_stream + STTClient.transcribe_stream, the upload
+  consuming the download as it arrives
+
+Reports the wall time until the STT backend has the whole file, peak
+Python heap (tracemalloc) and bytes written to local disk.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+import structlog
+
+from benchmarks.common import reset_shared_state
+
+MB = 1024 * 1024
+RATE_CHUNK = 256 * 1024
+
+
+def _media_handler(data: bytes, mbps: float):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        header = request.headers.get("range", "")
+        start, end = (int(x) for x in header.removeprefix("bytes=").split("-"))
+        # A view, so the stand-in's own copy doesn't count against the heap
+        part = memoryview(data)[start:end + 1]
+
+        async def body():
+            for i in range(0, len(part), RATE_CHUNK):
+                await asyncio.sleep(RATE_CHUNK * 8 / (mbps * 1e6))
+                yield bytes(part[i:i + RATE_CHUNK])
+
+        return httpx.Response(
+            206,
+            content=body(),
+            headers={
+                "Content-Range": f"bytes {start}-{start + len(part) - 1}/{len(data)}",
+                "Content-Length": str(len(part)),
+            },
+        )
+
+    return handler
+
+
+class _STTBackend(httpx.AsyncBaseTransport):
+    """Reads the upload as it is sent (MockTransport would buffer the whole body first)"""
+
+    def __init__(self, mbps: float):
+        self.mbps = mbps
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async for chunk in request.stream:
+            await asyncio.sleep(len(chunk) * 8 / (self.mbps * 1e6))
+        return httpx.Response(200, json={"text": "", "language": "en", "segments": []})
+
+
+async def _run(mode: str, size_mb: int, download_mbps: float, upload_mbps: float) -> tuple[float, int, int]:
+    from app.services.shared import clients
+    from app.services.video import youtube_stream
+    from app.services.video.stt_client import STTClient
+    from app.services.video.youtube_stream import open_media_stream
+
+    reset_shared_state()
+    data = os.urandom(size_mb * MB)
+    build_media_client = youtube_stream._build_media_client
+    handler = _media_handler(data, download_mbps)
+    youtube_stream._build_media_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    clients._stt_http_client = httpx.AsyncClient(transport=_STTBackend(upload_mbps))
+    url = "https://media.bench/videoplayback"
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    written = 0
+    if mode == "download":
+        stream = await open_media_stream(url, {}, "v.m4a", "audio/mp4")
+        with tempfile.NamedTemporaryFile(suffix=".m4a") as f:
+            async for chunk in stream.iter_chunks():
+                f.write(chunk)
+                written += len(chunk)
+            await stream.aclose()
+            f.flush()
+            audio_bytes = await asyncio.to_thread(Path(f.name).read_bytes)
+        await STTClient().transcribe(audio_bytes, "v.m4a", content_type="audio/mp4")
+        del audio_bytes
+    else:
+        stream = await open_media_stream(url, {}, "v.m4a", "audio/mp4")
+        try:
+            await STTClient().transcribe_stream(stream)
+        finally:
+            await stream.aclose()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await clients.close_clients()
+    youtube_stream._build_media_client = build_media_client
+    return elapsed, peak, written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100], help="audio sizes in MB")
+    parser.add_argument("--download-mbps", type=float, default=80.0)
+    parser.add_argument("--upload-mbps", type=float, default=80.0)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    os.environ["MAX_FILE_SIZE_MB"] = str(max(args.sizes) + 1)
+    os.environ["STT_CACHE_ENABLED"] = "false"
+    print(f"download {args.download_mbps} Mbps, upload {args.upload_mbps} Mbps")
+    print(f"{'audio':>6}  {'mode':>8}  {'time':>7}  {'peak heap':>10}  {'disk':>7}")
+    for size_mb in args.sizes:
+        for mode in ("download", "stream"):
+            elapsed, peak, written = asyncio.run(_run(mode, size_mb, args.download_mbps, args.upload_mbps))
+            print(f"{size_mb:>4}MB  {mode:>8}  {elapsed:>6.2f}s  {peak / MB:>8.1f}MB  {written / MB:>5.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Shared helpers for benchmarks: environment defaults and a fake OpenAI client"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from typing import Callable
+from unittest.mock import MagicMock, patch
+
+# Benchmarks never talk to real services
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def skewed_latency(rng: random.Random, base: float, slow_ratio: float = 0.15, slow_factor: float = 6.0) -> float:
+    """Mostly `base`-ish latencies with a heavy tail of slow calls"""
+    latency = base * rng.uniform(0.7, 1.3)
+    if rng.random() < slow_ratio:
+        latency *= slow_factor
+    return latency
+
+
+def echo_translation(user_content: str) -> str:
+    """Fake translate_batch response: every segment's text prefixed with "T:"."""
+    payload = user_content.split("번역할 자막:\n", 1)[1]
+    items = json.loads(payload)
+    return json.dumps(
+        {"translations": [{"id": it["id"], "text": f"T:{it['text']}"} for it in items]},
+        ensure_ascii=False,
+    )
+
+
+@contextmanager
+def fake_openai(respond: Callable[[str], str], latency: Callable[[str], float]):
+    """Patch the pooled OpenAI client with one that sleeps `latency(user_content)`.
+
+    Yields the list of calls as (user_content, latency) tuples.
+    """
+    calls: list[tuple[str, float]] = []
+
+    async def create(**kwargs):
+        user_content = kwargs["messages"][-1]["content"]
+        delay = latency(user_content)
+        calls.append((user_content, delay))
+        await asyncio.sleep(delay)
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=respond(user_content)))])
+
+    client = MagicMock()
+    client.chat.completions.create = create
+    with patch("app.services.shared.llm_service.get_openai_client", return_value=client):
+        yield calls
+
+
+async def timed(coro) -> tuple[object, float]:
+    started = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - started
+
+
+def reset_shared_state() -> None:
+    """Fresh limiter/budget/cache between runs so runs don't influence each other"""
+    from app.services.shared.concurrency import reset_llm_limiter
+    from app.services.shared.llm_cache import reset_llm_cache
+    from app.services.shared.retry_policy import reset_token_budget
+    from app.services.shared.stt.backends import reset_stt_backend_pool
+    from app.services.shared.stt.result_cache import reset_stt_result_cache
+    from app.services.shared.translation_memory import reset_translation_memory
+    from app.services.video.transcript_cache import reset_video_transcript_cache
+    from app.services.video.youtube_info_cache import reset_youtube_info_cache
+
+    reset_llm_limiter()
+    reset_llm_cache()
+    reset_token_budget()
+    reset_translation_memory()
+    reset_stt_result_cache()
+    reset_video_transcript_cache()
+    reset_youtube_info_cache()
+    reset_stt_backend_pool()
+
+
+_VOCAB = (
+    "the a we you it is was really just so and but know think going right here "
+    "video today thing people actually because little something model data time "
+    "about would could like yeah okay look this that what when where very"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_VOCAB) for _ in range(max(1, words))).capitalize() + "."
+
+
+def synthetic_transcripts(seed: int) -> dict[str, list[str]]:
+    """Transcripts shaped like our STT output: lyrics, conversation, lecture, mixed"""
+    rng = random.Random(seed)
+    lyrics = [_sentence(rng, rng.randint(1, 4)) for _ in range(400)]
+    conversation = [_sentence(rng, rng.randint(4, 16)) for _ in range(400)]
+    lecture = [_sentence(rng, int(rng.gauss(45, 15))) for _ in range(200)]
+    mixed = []
+    for _ in range(400):
+        roll = rng.random()
+        words = rng.randint(1, 3) if roll < 0.3 else rng.randint(5, 15) if roll < 0.85 else rng.randint(30, 80)
+        mixed.append(_sentence(rng, words))
+    return {"lyrics": lyrics, "conversation": conversation, "lecture": lecture, "mixed": mixed}
+
+
+def load_transcript(path: str) -> list[str]:
+    """Segment texts from a saved STT response ({"segments": [...]}) or a bare segment list"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    segments = data.get("segments", data.get("data", {}).get("segments", [])) if isinstance(data, dict) else data
+    return [seg["text"] for seg in segments if seg.get("text")]
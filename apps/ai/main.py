@@ -15,6 +15,15 @@ from app.config import get_settings
 from app.core.error_handlers import setup_exception_handlers
 from app.core.middleware import ApiKeyMiddleware, RequestIdMiddleware, LoggingMiddleware
 from app.core.rate_limiter import limiter
+from app.services.shared.clients import init_clients, close_clients
+from app.services.shared.llm_cache import get_llm_cache, reset_llm_cache
+from app.services.shared.translation_memory import get_translation_memory, reset_translation_memory
+from app.services.shared.stt.result_cache import get_stt_result_cache, reset_stt_result_cache
+from app.services.video.transcript_cache import get_video_transcript_cache, reset_video_transcript_cache
+from app.services.video.youtube_info_cache import get_youtube_info_cache, reset_youtube_info_cache
+from app.services.shared.stt.backends import peek_stt_backend_pool, reset_stt_backend_pool
+from app.services.shared.stt.local_provider import get_local_whisper_pool, reset_local_whisper_pool
+from app.services.video.stt_jobs import get_stt_job_runner, reset_stt_job_runner
 
 
 def setup_logging():
@@ -44,7 +53,41 @@ async def lifespan(app: FastAPI):
         model=settings.openai_model,
         stt_api_url=settings.stt_api_url
     )
+    await init_clients()
+    if settings.stt_provider == "local":
+        # Load the model in every worker before taking requests
+        await get_local_whisper_pool().start()
+    # Picks up jobs left queued or unfinished by a previous run
+    await get_stt_job_runner().start()
     yield
+    # Before the clients close, so interrupted jobs are requeued cleanly
+    await reset_stt_job_runner()
+    await close_clients()
+    llm_cache = get_llm_cache()
+    if llm_cache is not None:
+        logger.info("llm_cache_stats", **llm_cache.snapshot())
+    reset_llm_cache()
+    translation_memory = get_translation_memory()
+    if translation_memory is not None:
+        logger.info("translation_memory_stats", **translation_memory.snapshot())
+    reset_translation_memory()
+    stt_result_cache = get_stt_result_cache()
+    if stt_result_cache is not None:
+        logger.info("stt_result_cache_stats", **stt_result_cache.snapshot())
+    reset_stt_result_cache()
+    video_transcript_cache = get_video_transcript_cache()
+    if video_transcript_cache is not None:
+        logger.info("video_transcript_cache_stats", **video_transcript_cache.snapshot())
+    reset_video_transcript_cache()
+    youtube_info_cache = get_youtube_info_cache()
+    if youtube_info_cache is not None:
+        logger.info("youtube_info_cache_stats", **youtube_info_cache.snapshot())
+    reset_youtube_info_cache()
+    stt_backends = peek_stt_backend_pool()
+    if stt_backends is not None:
+        logger.info("stt_backend_stats", **stt_backends.snapshot())
+    reset_stt_backend_pool()
+    reset_local_whisper_pool()
     logger.info("app_shutdown")
 
 
@@ -13,6 +13,66 @@ from fastapi.testclient import TestClient
 from httpx import ASGITransport, AsyncClient
 
 from main import app
+from app.core.rate_limiter import limiter
+from app.services.shared.concurrency import reset_llm_limiter
+from app.services.shared.llm_cache import reset_llm_cache
+from app.services.shared.retry_policy import reset_token_budget
+from app.services.shared.stt.backends import reset_stt_backend_pool
+from app.services.shared.stt.result_cache import reset_stt_result_cache
+from app.services.video.transcript_cache import reset_video_transcript_cache
+from app.services.video.youtube_info_cache import reset_youtube_info_cache
+from app.services.shared.translation_memory import reset_translation_memory
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """Reset in-memory rate limit counters so tests don't throttle each other"""
+    limiter.reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_cache():
+    """Start every test with an empty LLM response cache"""
+    reset_llm_cache()
+    yield
+    reset_llm_cache()
+
+
+@pytest.fixture(autouse=True)
+def fresh_translation_memory():
+    """Start every test with an empty translation memory"""
+    reset_translation_memory()
+    yield
+    reset_translation_memory()
+
+
+@pytest.fixture(autouse=True)
+def fresh_stt_result_cache():
+    """Start every test with empty STT result, video transcript and YouTube info caches"""
+    reset_stt_result_cache()
+    reset_video_transcript_cache()
+    reset_youtube_info_cache()
+    yield
+    reset_stt_result_cache()
+    reset_video_transcript_cache()
+    reset_youtube_info_cache()
+
+
+@pytest.fixture(autouse=True)
+def fresh_stt_backend_pool():
+    """Start every test with fresh STT backend counters (nothing ejected)"""
+    reset_stt_backend_pool()
+    yield
+    reset_stt_backend_pool()
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_limiter():
+    """Start every test with a fresh limiter and token budget"""
+    reset_llm_limiter()
+    reset_token_budget()
+    yield
 
 
 @pytest.fixture
@@ -34,7 +94,7 @@ async def async_client():
 @pytest.fixture
 def mock_openai():
     """Mock OpenAI client"""
-    with patch("app.services.llm.OpenAI") as mock:
+    with patch("app.services.shared.llm_service.get_openai_client") as mock:
         mock_instance = MagicMock()
         mock_response = MagicMock()
         mock_response.choices = [
@@ -44,7 +104,7 @@ def mock_openai():
                 )
             )
         ]
-        mock_instance.chat.completions.create.return_value = mock_response
+        mock_instance.chat.completions.create = AsyncMock(return_value=mock_response)
         mock.return_value = mock_instance
         yield mock_instance
 
@@ -72,6 +132,28 @@ def mock_stt_api():
         yield mock_response
 
 
+@pytest.fixture
+def stt_backend(monkeypatch):
+    """Stand-in WhisperX backend behind the pooled STT client; records raw requests"""
+    import httpx
+    from app.services.shared import clients
+
+    received: list[dict] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        received.append({"headers": request.headers, "body": body})
+        return httpx.Response(200, json={
+            "text": "hello",
+            "language": "en",
+            "language_probability": 0.9,
+            "segments": [{"start": 0.0, "end": 1.0, "text": "hello"}],
+        })
+
+    monkeypatch.setattr(clients, "_stt_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    yield received
+
+
 @pytest.fixture
 def sample_analyze_request():
     """Sample analyze request data"""
@@ -0,0 +1,76 @@
+"""Tests for token-aware translation batching"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.shared.batch_planner import plan_batches, segment_cost
+from app.services.shared.translation import TranslationStats, translate_segments
+
+
+class TestPlanBatches:
+    """Tests for plan_batches"""
+
+    def test_short_fragments_packed_up_to_cap(self):
+        plan = plan_batches(["ok"] * 100, token_target=1500, max_segments=40)
+        assert [len(b) for b in plan.batches] == [40, 40, 20]
+
+    def test_long_segments_split_by_token_target(self):
+        long_text = "word " * 200  # ~250 tokens in, ~250 out
+        plan = plan_batches([long_text] * 10, token_target=1500, max_segments=40)
+
+        assert all(tokens <= 1500 for tokens in plan.estimated_tokens)
+        assert len(plan) == 10 // (1500 // segment_cost(long_text))
+
+    def test_oversized_segment_gets_own_batch(self):
+        plan = plan_batches(["a", "x" * 20000, "b"], token_target=500, max_segments=40)
+        assert plan.batches == [[0], [1], [2]]
+
+    def test_batches_are_contiguous_and_complete(self):
+        texts = [("w " * n) for n in [1, 50, 3, 400, 2, 2, 90, 10, 1, 300]]
+        plan = plan_batches(texts, token_target=400, max_segments=3)
+
+        assert [idx for batch in plan.batches for idx in batch] == list(range(len(texts)))
+        assert all(len(batch) <= 3 for batch in plan.batches)
+
+    def test_zero_target_is_fixed_size(self):
+        plan = plan_batches(["x" * 1000] * 25, token_target=0, max_segments=10)
+        assert [len(b) for b in plan.batches] == [10, 10, 5]
+
+    def test_summary(self):
+        summary = plan_batches(["hello world"] * 3, token_target=1500, max_segments=2).summary()
+        assert summary["batch_count"] == 2
+        assert summary["segments_per_batch"] == [2, 1]
+        assert summary["max_batch_tokens"] == 2 * segment_cost("hello world")
+
+
+class TestTranslateUsesPlan:
+    """translate_segments batches by the plan and reports it"""
+
+    async def test_plan_drives_llm_calls(self):
+        segments = [{"start": float(i), "end": float(i + 1), "text": f"Hi {i}"} for i in range(50)]
+        batch_sizes: list[int] = []
+
+        async def create(*args, **kwargs):
+            items = json.loads(kwargs["messages"][-1]["content"].split("번역할 자막:\n", 1)[1])
+            batch_sizes.append(len(items))
+            content = json.dumps({"translations": [{"id": it["id"], "text": "번역"} for it in items]})
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+        stats = TranslationStats()
+        with patch("app.services.shared.llm_service.get_openai_client") as mock:
+            mock.return_value.chat.completions.create = AsyncMock(side_effect=create)
+            await translate_segments(segments, stats=stats)
+
+        assert sorted(batch_sizes, reverse=True) == [40, 10]
+        assert stats.batch_plan.summary()["segments_per_batch"] == [40, 10]
+
+    def test_meta_reports_batch_count(self, client):
+        response = MagicMock(choices=[MagicMock(message=MagicMock(content='{"translations": [{"id": 0, "text": "번역"}]}'))])
+        with patch("app.services.shared.llm_service.get_openai_client") as mock:
+            mock.return_value.chat.completions.create = AsyncMock(return_value=response)
+            meta = client.post(
+                "/api/v1/translate",
+                json={"segments": [{"start": 0.0, "end": 1.0, "text": "Hello"}]},
+            ).json()["meta"]
+
+        assert meta["batchCount"] == 1
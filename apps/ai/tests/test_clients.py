@@ -0,0 +1,65 @@
+"""Tests for process-wide pooled clients"""
+
+import httpx
+from fastapi.testclient import TestClient
+
+from main import app
+from app.services.shared import clients
+from app.services.shared.llm_service import BaseLLMService
+from app.services.shared.stt.whisperx_provider import WhisperXProvider
+
+
+class TestPooledClients:
+    """Clients are shared across services and owned by the app lifespan"""
+
+    def test_llm_services_share_one_client(self):
+        """Every BaseLLMService reuses the same pooled AsyncOpenAI client"""
+        first = BaseLLMService()
+        second = BaseLLMService()
+        assert first.client is second.client
+        assert first.client is clients.get_openai_client()
+
+    def test_stt_provider_uses_pooled_client(self):
+        """WhisperXProvider defaults to the shared STT http client"""
+        assert WhisperXProvider().http_client is clients.get_stt_http_client()
+
+    def test_injected_clients_take_precedence(self):
+        """Explicitly injected clients are used instead of the pooled ones"""
+        sentinel = object()
+        assert BaseLLMService(client=sentinel).client is sentinel
+        assert WhisperXProvider(http_client=sentinel).http_client is sentinel
+
+    def test_blocking_client_leaves_retries_to_llm_retry(self):
+        """complete_json's client makes one attempt per call and reports rate limits"""
+        from app.services.shared.retry_policy import get_token_budget
+
+        sync_client = BaseLLMService().sync_client
+        assert sync_client is BaseLLMService().sync_client
+        assert sync_client is clients.get_openai_sync_client()
+        assert sync_client.max_retries == 0
+
+        response = httpx.Response(
+            429,
+            headers={"retry-after": "3", "x-ratelimit-limit-tokens": "90000"},
+            request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"),
+        )
+        for hook in sync_client._client.event_hooks["response"]:
+            hook(response)
+        assert get_token_budget().capacity == 90000
+        assert get_token_budget().snapshot()["paused_for_seconds"] > 2
+
+    def test_lifespan_creates_and_closes_clients(self):
+        """Startup creates the pooled clients, shutdown closes and drops them"""
+        with TestClient(app):
+            openai_client = clients._openai_client
+            sync_client = clients._openai_sync_client
+            stt_client = clients._stt_http_client
+            assert openai_client is not None
+            assert sync_client is not None
+            assert stt_client is not None
+
+        assert clients._openai_client is None
+        assert clients._openai_sync_client is None
+        assert clients._stt_http_client is None
+        assert sync_client.is_closed()
+        assert stt_client.is_closed
@@ -0,0 +1,145 @@
+"""Tests for the adaptive OpenAI concurrency limiter"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from app.services.shared.concurrency import AdaptiveConcurrencyLimiter, get_llm_limiter
+from app.services.shared.llm_service import BaseLLMService, LLMConfig
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Tests for admission and AIMD adaptation"""
+
+    async def test_caps_concurrent_weight(self):
+        """No more than `limit` units are held at once"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, latency_target=10)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_use)
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(*[call() for _ in range(6)])
+
+        assert peak == 2
+        assert limiter.stats.queued >= 4
+        assert limiter.in_use == 0
+
+    async def test_heavy_call_admitted_when_idle(self):
+        """A call heavier than the limit still runs when nothing else does"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+        async with limiter.slot(weight=5):
+            assert limiter.in_use == 5
+        assert limiter.in_use == 0
+
+    async def test_weights_are_respected(self):
+        """A weight-3 call waits until enough units are free"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4)
+        await limiter.acquire(2)
+
+        heavy = asyncio.create_task(limiter.acquire(3))
+        await asyncio.sleep(0.01)
+        assert not heavy.done()
+        assert limiter.queue_depth == 1
+
+        limiter.release(2)
+        await heavy
+        assert limiter.in_use == 3
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Cancelling a queued acquire removes it without leaking capacity"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+
+        assert limiter.queue_depth == 0
+        assert limiter.in_use == 0
+
+    def test_additive_increase_on_fast_success(self):
+        """Fast successes grow the limit by about one per window"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_target=10)
+        for _ in range(4):
+            limiter.record(latency=0.5)
+        assert 4.9 < limiter.limit < 5.1
+
+    def test_multiplicative_decrease_on_429(self):
+        """A rate-limited call halves the limit, once per cooldown"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, decrease_cooldown=60)
+        limiter.record(latency=0.5, throttled=True)
+        limiter.record(latency=0.5, throttled=True)
+        assert limiter.limit == 4
+        assert limiter.stats.throttled == 2
+        assert limiter.stats.decreases == 1
+
+    def test_slow_calls_decrease_gently(self):
+        """Calls over the latency target shrink the limit by 10%"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_target=1)
+        limiter.record(latency=5)
+        assert limiter.limit == pytest.approx(9)
+
+    def test_limit_bounded(self):
+        """The limit stays within [min_limit, max_limit]"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=2, max_limit=3, decrease_cooldown=0)
+        limiter.record(latency=0.1, throttled=True)
+        assert limiter.limit == 2
+        for _ in range(20):
+            limiter.record(latency=0.1)
+        assert limiter.limit == 3
+
+    def test_seeded_from_settings(self):
+        """The process-wide limiter starts at max_concurrent_requests"""
+        assert get_llm_limiter().limit == 10
+
+
+class TestLLMServiceLimiting:
+    """BaseLLMService routes every attempt through the global limiter"""
+
+    async def test_429_reported_to_limiter(self):
+        """A RateLimitError from OpenAI is recorded as a throttle event"""
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        error = RateLimitError(
+            "rate limited",
+            response=httpx.Response(429, request=request),
+            body=None,
+        )
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=error)
+        llm = BaseLLMService(LLMConfig(max_retries=1), client=client)
+
+        with pytest.raises(RateLimitError):
+            await llm.complete_json_async("system", "user")
+
+        limiter = get_llm_limiter()
+        assert limiter.stats.throttled == 1
+        assert limiter.limit == 5
+        assert limiter.in_use == 0
+
+    async def test_weight_held_during_call(self):
+        """The configured weight is held while the request is in flight"""
+        observed = []
+
+        async def create(*args, **kwargs):
+            observed.append(get_llm_limiter().in_use)
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content="{}"))]
+            return response
+
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=create)
+        llm = BaseLLMService(LLMConfig(weight=3), client=client)
+
+        await llm.complete_json_async("system", "user")
+
+        assert observed == [3]
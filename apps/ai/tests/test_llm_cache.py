@@ -0,0 +1,214 @@
+"""Tests for the LLM response cache"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.config import get_settings
+from app.services.shared.cache import LRUCache, SQLiteCache, TieredCache
+from app.services.shared.llm_cache import get_llm_cache, make_cache_key
+from app.services.shared.llm_service import BaseLLMService, LLMConfig
+
+
+class TestLRUCache:
+    """Tests for the in-memory tier"""
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Entries are evicted oldest-access-first once the byte budget is exceeded"""
+        cache = LRUCache(max_bytes=10)
+        cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", "cccc")
+
+        assert cache.get("a") == "aaaa"
+        assert cache.get("b") is None
+        assert cache.get("c") == "cccc"
+        assert cache.size_bytes == 8
+        assert cache.stats.evictions == 1
+
+    def test_ttl_expiry(self):
+        """Expired entries are not returned"""
+        cache = LRUCache(max_bytes=100)
+        cache.set("a", "value", ttl=0.01)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.stats.expirations == 1
+
+    def test_oversized_value_is_skipped(self):
+        """A value larger than the whole budget is not stored"""
+        cache = LRUCache(max_bytes=4)
+        cache.set("a", "too large")
+        assert len(cache) == 0
+
+
+class TestSQLiteCache:
+    """Tests for the on-disk tier"""
+
+    def test_shared_between_instances(self, tmp_path):
+        """Two instances on the same file (e.g. two workers) see each other's writes"""
+        path = str(tmp_path / "cache.db")
+        writer = SQLiteCache(path, "llm_responses", max_entries=10)
+        reader = SQLiteCache(path, "llm_responses", max_entries=10)
+
+        writer.set("key", "value", ttl=60)
+        value, expires_at = reader.get("key")
+
+        assert value == "value"
+        assert expires_at > time.time()
+
+    def test_bounded_by_entries(self, tmp_path):
+        """Least recently accessed rows are removed beyond max_entries"""
+        cache = SQLiteCache(str(tmp_path / "cache.db"), "llm_responses", max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.set("c", "3")
+
+        assert cache.get("a") is None
+        assert cache.get("c") == ("3", None)
+        assert cache.stats.evictions == 1
+
+    def test_overwrites_do_not_evict(self, tmp_path):
+        """Replacing a key keeps the running row count unchanged"""
+        cache = SQLiteCache(str(tmp_path / "cache.db"), "llm_responses", max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.set_many([("a", "3"), ("a", "4"), ("b", "5")])
+
+        assert cache.get("a") == ("4", None)
+        assert cache.stats.evictions == 0
+
+    def test_expired_rows_swept_periodically(self, tmp_path):
+        """Expired rows are deleted every sweep_every writes, not on every write"""
+        path = str(tmp_path / "cache.db")
+        cache = SQLiteCache(path, "llm_responses", max_entries=10, sweep_every=3)
+        cache.set("old", "1", ttl=0.01)
+        time.sleep(0.02)
+
+        cache.set("a", "2")
+        assert cache.stats.expirations == 0
+        cache.set("b", "3")
+        assert cache.stats.expirations == 1
+        # Rows written meanwhile by another process are counted at the sweep
+        SQLiteCache(path, "llm_responses", max_entries=100).set_many([(f"k{i}", "x") for i in range(9)])
+        cache.set("c", "4")
+        cache.set("d", "5")
+        cache.set("e", "6")
+
+        assert cache.stats.evictions == 4
+        assert cache.get("e") == ("6", None)
+
+    def test_rejects_invalid_namespace(self, tmp_path):
+        """Namespace is used as a table name and must be a plain identifier"""
+        with pytest.raises(ValueError):
+            SQLiteCache(str(tmp_path / "cache.db"), "x; DROP TABLE y", max_entries=1)
+
+
+class TestTieredCache:
+    """Tests for memory + disk composition"""
+
+    async def test_disk_hit_promotes_to_memory(self, tmp_path):
+        """A value found only on disk is served and copied into memory"""
+        path = str(tmp_path / "cache.db")
+        await TieredCache("llm_responses", 1024, sqlite_path=path).set("k", "v", ttl=60)
+
+        cache = TieredCache("llm_responses", 1024, sqlite_path=path)
+        assert await cache.get("k") == "v"
+        assert await cache.get("k") == "v"
+        assert cache.stats.disk_hits == 1
+        assert cache.stats.memory_hits == 1
+
+    async def test_get_many_queries_disk_once_for_memory_misses(self, tmp_path):
+        """Batched lookups mix memory and disk hits and count misses per key"""
+        path = str(tmp_path / "cache.db")
+        await TieredCache("llm_responses", 1024, sqlite_path=path).set_many(
+            [("a", "1"), ("b", "2")], ttl=60
+        )
+
+        cache = TieredCache("llm_responses", 1024, sqlite_path=path)
+        await cache.set("c", "3")
+        with patch.object(cache.disk, "get_many", wraps=cache.disk.get_many) as disk_get_many:
+            found = await cache.get_many(["a", "b", "c", "missing"])
+
+        assert found == {"a": "1", "b": "2", "c": "3"}
+        disk_get_many.assert_called_once_with(["a", "b", "missing"])
+        assert (cache.stats.memory_hits, cache.stats.disk_hits, cache.stats.misses) == (1, 2, 1)
+
+
+class TestLLMCacheKey:
+    """Tests for cache key derivation"""
+
+    def test_key_depends_on_all_inputs(self):
+        """Changing any input changes the key"""
+        base = make_cache_key("gpt-4o-mini", 0.3, "system", "user")
+        assert base == make_cache_key("gpt-4o-mini", 0.3, "system", "user")
+        assert base != make_cache_key("gpt-4o", 0.3, "system", "user")
+        assert base != make_cache_key("gpt-4o-mini", 0.2, "system", "user")
+        assert base != make_cache_key("gpt-4o-mini", 0.3, "other", "user")
+        assert base != make_cache_key("gpt-4o-mini", 0.3, "system", "other")
+
+
+class TestBaseLLMServiceCaching:
+    """Tests for caching in BaseLLMService.complete_json_async"""
+
+    @pytest.fixture
+    def openai_client(self):
+        client = MagicMock()
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content='{"answer": 42}'))]
+        client.chat.completions.create = AsyncMock(return_value=response)
+        return client
+
+    async def test_identical_calls_hit_cache(self, openai_client):
+        """The second identical call is served from cache"""
+        llm = BaseLLMService(LLMConfig(cache_ttl=60), client=openai_client)
+
+        first = await llm.complete_json_async("system", "user")
+        second = await llm.complete_json_async("system", "user")
+
+        assert first == second == {"answer": 42}
+        assert openai_client.chat.completions.create.await_count == 1
+        assert get_llm_cache().stats.hits == 1
+
+    async def test_different_content_misses(self, openai_client):
+        """Different user content is a different cache entry"""
+        llm = BaseLLMService(LLMConfig(cache_ttl=60), client=openai_client)
+
+        await llm.complete_json_async("system", "user 1")
+        await llm.complete_json_async("system", "user 2")
+
+        assert openai_client.chat.completions.create.await_count == 2
+
+    async def test_zero_ttl_opts_out(self, openai_client):
+        """cache_ttl=0 bypasses the cache entirely"""
+        llm = BaseLLMService(LLMConfig(cache_ttl=0), client=openai_client)
+
+        await llm.complete_json_async("system", "user")
+        await llm.complete_json_async("system", "user")
+
+        assert openai_client.chat.completions.create.await_count == 2
+        assert get_llm_cache().stats.misses == 0
+
+    async def test_disabled_globally(self, openai_client):
+        """LLM_CACHE_ENABLED=false disables caching for every service"""
+        llm = BaseLLMService(LLMConfig(cache_ttl=60), client=openai_client)
+
+        with patch.object(get_settings(), "llm_cache_enabled", False):
+            await llm.complete_json_async("system", "user")
+            await llm.complete_json_async("system", "user")
+
+        assert openai_client.chat.completions.create.await_count == 2
+
+
+class TestStatsEndpoint:
+    """Tests for /health/stats"""
+
+    def test_reports_llm_cache_counters(self, client):
+        """Cache counters are exposed for monitoring"""
+        response = client.get("/health/stats")
+
+        assert response.status_code == 200
+        stats = response.json()["llm_cache"]
+        assert {"hits", "misses", "evictions", "hit_rate"} <= stats.keys()
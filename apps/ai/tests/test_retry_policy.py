@@ -0,0 +1,202 @@
+"""Tests for rate-limit aware retries and the token budget"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from app.config import get_settings
+from app.services.shared.llm_service import BaseLLMService, LLMConfig
+from app.services.shared.retry_policy import (
+    RateLimitState,
+    TokenBudget,
+    get_token_budget,
+    parse_reset_duration,
+    parse_retry_after,
+    record_rate_limit_headers,
+)
+
+OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+
+
+def rate_limit_error(headers: dict) -> RateLimitError:
+    request = httpx.Request("POST", OPENAI_URL)
+    return RateLimitError(
+        "rate limited",
+        response=httpx.Response(429, headers=headers, request=request),
+        body=None,
+    )
+
+
+def completion(content: str = '{"ok": true}') -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    return response
+
+
+class TestHeaderParsing:
+    """Tests for OpenAI rate-limit header parsing"""
+
+    @pytest.mark.parametrize("value,expected", [
+        ("1s", 1.0),
+        ("20ms", 0.02),
+        ("6m0s", 360.0),
+        ("1h2m3.5s", 3723.5),
+        ("0.5", 0.5),
+        ("soon", None),
+        (None, None),
+    ])
+    def test_parse_reset_duration(self, value, expected):
+        assert parse_reset_duration(value) == expected
+
+    def test_retry_after_ms_preferred(self):
+        """retry-after-ms is more precise than retry-after"""
+        assert parse_retry_after({"retry-after-ms": "1500", "retry-after": "2"}) == 1.5
+
+    def test_retry_after_seconds(self):
+        assert parse_retry_after({"retry-after": "3"}) == 3.0
+
+    def test_retry_after_http_date(self):
+        """An HTTP-date Retry-After is converted to a delay"""
+        from email.utils import formatdate
+        delay = parse_retry_after({"retry-after": formatdate(time.time() + 10, usegmt=True)})
+        assert 8 <= delay <= 10
+
+    def test_rate_limit_state(self):
+        state = RateLimitState.from_headers({
+            "x-ratelimit-limit-tokens": "200000",
+            "x-ratelimit-remaining-tokens": "150000",
+            "x-ratelimit-reset-tokens": "15s",
+            "x-ratelimit-remaining-requests": "499",
+            "x-ratelimit-reset-requests": "120ms",
+        })
+        assert state.limit_tokens == 200000
+        assert state.remaining_tokens == 150000
+        assert state.reset_tokens == 15.0
+        assert state.remaining_requests == 499
+        assert state.reset_requests == 0.12
+
+
+class TestTokenBudget:
+    """Tests for the process-wide tokens-per-minute budget"""
+
+    async def test_no_capacity_means_no_wait(self):
+        """Without a known capacity, calls pass straight through"""
+        budget = TokenBudget()
+        assert await budget.acquire(10_000) == 0.0
+
+    async def test_waits_for_refill(self):
+        """A call that doesn't fit waits for the bucket to refill"""
+        budget = TokenBudget(tokens_per_minute=6000)  # 100 tokens/s
+        await budget.acquire(6000)
+
+        waited = await budget.acquire(20)
+        assert 0.15 <= waited < 0.6
+
+    def test_learns_capacity_from_headers(self):
+        """x-ratelimit-limit-tokens sets capacity; remaining caps availability"""
+        budget = TokenBudget()
+        budget.observe({
+            "x-ratelimit-limit-tokens": "60000",
+            "x-ratelimit-remaining-tokens": "1000",
+        })
+        assert budget.capacity == 60000
+        assert budget.available < 1100
+
+    async def test_429_pauses_all_callers(self):
+        """After a 429 with Retry-After every new call waits"""
+        budget = TokenBudget()
+        budget.observe({"retry-after-ms": "200"}, status_code=429)
+
+        waited = await budget.acquire(1)
+        assert waited >= 0.2
+        assert budget.pauses == 1
+
+    def test_exhausted_requests_pause_until_reset(self):
+        budget = TokenBudget()
+        budget.observe({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "2s"})
+        assert budget.snapshot()["paused_for_seconds"] > 1.5
+
+    async def test_wait_capped_by_max_wait(self):
+        """A call never waits longer than max_wait for budget"""
+        budget = TokenBudget(max_wait=0.1)
+        budget.pause_for(30)
+        waited = await budget.acquire(1)
+        assert waited < 0.5
+
+    async def test_response_hook_feeds_process_budget(self):
+        """The pooled client's response hook updates the shared budget"""
+        request = httpx.Request("POST", OPENAI_URL)
+        response = httpx.Response(
+            200,
+            headers={"x-ratelimit-limit-tokens": "90000"},
+            request=request,
+        )
+        await record_rate_limit_headers(response)
+        assert get_token_budget().capacity == 90000
+
+
+class TestLLMRetries:
+    """Tests for BaseLLMService retry scheduling"""
+
+    async def test_429_retried_after_retry_after(self):
+        """A 429 is retried once Retry-After has elapsed, not by blind backoff"""
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=[
+            rate_limit_error({"retry-after-ms": "100"}),
+            completion(),
+        ])
+        llm = BaseLLMService(LLMConfig(max_retries=3), client=client)
+
+        started = time.perf_counter()
+        result = await llm.complete_json_async("system", "user")
+        elapsed = time.perf_counter() - started
+
+        assert result == {"ok": True}
+        assert client.chat.completions.create.await_count == 2
+        # Well under the 1s exponential-backoff base delay
+        assert 0.1 <= elapsed < 0.9
+
+    async def test_attempts_capped(self):
+        """A persistently throttled request stops after max_retries attempts"""
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(
+            side_effect=rate_limit_error({"retry-after-ms": "10"})
+        )
+        llm = BaseLLMService(LLMConfig(max_retries=3), client=client)
+
+        with pytest.raises(RateLimitError):
+            await llm.complete_json_async("system", "user")
+
+        assert client.chat.completions.create.await_count == 3
+
+    async def test_deadline_caps_total_retry_time(self):
+        """Retries stop once the retry deadline has passed"""
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(
+            side_effect=rate_limit_error({"retry-after-ms": "150"})
+        )
+        llm = BaseLLMService(LLMConfig(max_retries=10), client=client)
+
+        with patch.object(get_settings(), "retry_deadline", 0.2):
+            with pytest.raises(RateLimitError):
+                await llm.complete_json_async("system", "user")
+
+        assert client.chat.completions.create.await_count <= 3
+
+    async def test_translate_batch_does_not_multiply_attempts(self):
+        """translate_batch relies on the shared policy instead of retrying again"""
+        from app.services.shared.translation import translate_batch
+
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(
+            side_effect=rate_limit_error({"retry-after-ms": "10"})
+        )
+        llm = BaseLLMService(LLMConfig(max_retries=3), client=client)
+
+        with pytest.raises(RateLimitError):
+            await translate_batch(llm, [{"start": 0, "end": 1, "text": "hi"}], "en", "ko")
+
+        assert client.chat.completions.create.await_count == 3
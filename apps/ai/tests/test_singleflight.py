@@ -0,0 +1,155 @@
+"""Tests for single-flight request coalescing"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.shared.llm_service import BaseLLMService, LLMConfig
+from app.services.shared.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for the SingleFlight primitive"""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Callers with the same key await one execution"""
+        group = SingleFlight("test")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(*[group.do("key", work) for _ in range(5)])
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert group.stats.leaders == 1
+        assert group.stats.coalesced == 4
+        assert group.in_flight == 0
+
+    async def test_different_keys_run_separately(self):
+        """Coalescing is per key"""
+        group = SingleFlight("test")
+        work = AsyncMock(return_value="x")
+
+        await asyncio.gather(group.do("a", work), group.do("b", work))
+
+        assert work.await_count == 2
+
+    async def test_error_propagates_to_all_waiters(self):
+        """Every waiter receives the leader's exception"""
+        group = SingleFlight("test")
+
+        async def failing():
+            await asyncio.sleep(0.02)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            *[group.do("key", failing) for _ in range(3)],
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert group.in_flight == 0
+
+    async def test_next_call_after_completion_runs_again(self):
+        """Results are not cached once the in-flight call finishes"""
+        group = SingleFlight("test")
+        work = AsyncMock(return_value="x")
+
+        await group.do("key", work)
+        await group.do("key", work)
+
+        assert work.await_count == 2
+
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """A disconnecting waiter detaches without affecting the shared call"""
+        group = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leaving = asyncio.create_task(group.do("key", work))
+        staying = asyncio.create_task(group.do("key", work))
+        await asyncio.sleep(0.01)
+        leaving.cancel()
+
+        assert await staying == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+
+    async def test_last_waiter_cancel_cancels_work(self):
+        """The shared call is cancelled once every waiter has left"""
+        group = SingleFlight("test")
+        finished = False
+
+        async def work():
+            nonlocal finished
+            await asyncio.sleep(0.2)
+            finished = True
+
+        waiters = [asyncio.create_task(group.do("key", work)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert group.in_flight == 0
+        assert group.stats.abandoned == 1
+        assert finished is False
+
+    async def test_call_after_abandon_starts_fresh(self):
+        """A caller arriving right after the work was abandoned does not join it"""
+        group = SingleFlight("test")
+
+        async def work():
+            try:
+                await asyncio.sleep(0.2)
+            except asyncio.CancelledError:
+                # Still unwinding (e.g. closing a connection) when the next caller arrives
+                await asyncio.sleep(0.05)
+                raise
+            return "stale"
+
+        async def fresh():
+            return "fresh"
+
+        waiter = asyncio.create_task(group.do("key", work))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert await group.do("key", fresh) == "fresh"
+        assert group.stats.leaders == 2
+
+
+class TestLLMCoalescing:
+    """BaseLLMService coalesces identical in-flight completions"""
+
+    async def test_identical_requests_make_one_openai_call(self):
+        """Concurrent identical prompts share one call even with caching off"""
+        async def slow_create(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content='{"ok": true}'))]
+            return response
+
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=slow_create)
+        llm = BaseLLMService(LLMConfig(cache_ttl=0), client=client)
+
+        results = await asyncio.gather(*[
+            llm.complete_json_async("system", "user") for _ in range(4)
+        ])
+
+        assert results == [{"ok": True}] * 4
+        assert client.chat.completions.create.await_count == 1
+        # Each caller owns its dict
+        results[0]["ok"] = False
+        assert results[1] == {"ok": True}
@@ -0,0 +1,237 @@
+"""Tests for streaming JSON completions and NDJSON/SSE endpoints"""
+
+import json
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.shared.json_stream import JSONArrayStreamParser
+from app.services.shared.llm_service import BaseLLMService, LLMConfig
+
+
+ARTICLE_RESULT = {
+    "sentences": [
+        {"id": 0, "original": "Hello world.", "translated": "안녕 세상."},
+        {"id": 1, "original": "It is \"fine\" [ok].", "translated": "괜찮다."},
+    ],
+    "expressions": [
+        {"expression": "it is fine", "meaning": "괜찮다", "category": "idiom"},
+    ],
+}
+
+VIDEO_RESULT = {
+    "summary": "테스트 요약입니다.",
+    "watchScore": 8,
+    "watchScoreReason": "테스트 이유",
+    "keywords": ["테스트", "키워드"],
+    "highlights": [{"timestamp": 0, "title": "시작", "description": "도입부"}],
+}
+
+
+class FakeStream:
+    """Async iterable of chat.completion.chunk-like objects"""
+
+    def __init__(self, text: str, chunk_size: int = 7):
+        self.chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for piece in self.chunks:
+            yield MagicMock(choices=[MagicMock(delta=MagicMock(content=piece))])
+
+    async def close(self):
+        self.closed = True
+
+
+def make_streaming_client(payload: dict) -> MagicMock:
+    """Mock OpenAI client whose create() returns a FakeStream when stream=True"""
+    text = json.dumps(payload, ensure_ascii=False)
+    client = MagicMock()
+
+    async def create(**kwargs):
+        if kwargs.get("stream"):
+            return FakeStream(text)
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=text))])
+
+    client.chat.completions.create = AsyncMock(side_effect=create)
+    return client
+
+
+class TestJSONArrayStreamParser:
+    """Incremental array element extraction"""
+
+    def test_elements_emitted_in_order(self):
+        text = json.dumps({**ARTICLE_RESULT, "tags": ["a", 1, None, True]})
+        parser = JSONArrayStreamParser({"sentences", "expressions", "tags"})
+        emitted = parser.feed(text)
+
+        assert [k for k, _ in emitted] == ["sentences", "sentences", "expressions", "tags", "tags", "tags", "tags"]
+        assert emitted[1][1] == ARTICLE_RESULT["sentences"][1]
+        assert [v for k, v in emitted if k == "tags"] == ["a", 1, None, True]
+        assert parser.result()["sentences"] == ARTICLE_RESULT["sentences"]
+
+    def test_arbitrary_chunk_boundaries(self):
+        text = json.dumps(ARTICLE_RESULT, ensure_ascii=False, indent=2)
+        rng = random.Random(7)
+        for _ in range(50):
+            parser = JSONArrayStreamParser({"sentences", "expressions"})
+            emitted = []
+            pos = 0
+            while pos < len(text):
+                step = rng.randint(1, 9)
+                emitted.extend(parser.feed(text[pos:pos + step]))
+                pos += step
+            assert emitted == [("sentences", s) for s in ARTICLE_RESULT["sentences"]] + [
+                ("expressions", e) for e in ARTICLE_RESULT["expressions"]
+            ]
+
+    def test_element_emitted_before_document_ends(self):
+        parser = JSONArrayStreamParser({"sentences"})
+        emitted = parser.feed('{"sentences": [{"id": 0, "note": "a}b"}, {"id"')
+        assert emitted == [("sentences", {"id": 0, "note": "a}b"})]
+
+    def test_nested_arrays_with_same_key_ignored(self):
+        parser = JSONArrayStreamParser({"items"})
+        emitted = parser.feed('{"meta": {"items": [1, 2]}, "items": [3]}')
+        assert emitted == [("items", 3)]
+
+
+class TestStreamJson:
+    """BaseLLMService.stream_json"""
+
+    def _service(self, client):
+        return BaseLLMService(
+            default_config=LLMConfig(model="gpt-4o-mini", cache_ttl=60),
+            client=client,
+        )
+
+    async def test_yields_elements_then_result(self):
+        client = make_streaming_client(ARTICLE_RESULT)
+        events = [e async for e in self._service(client).stream_json("sys", "user", {"sentences"})]
+
+        assert events[:2] == [("sentences", s) for s in ARTICLE_RESULT["sentences"]]
+        assert events[-1] == (None, ARTICLE_RESULT)
+        assert client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    async def test_result_cached_and_replayed(self):
+        client = make_streaming_client(ARTICLE_RESULT)
+        service = self._service(client)
+        first = [e async for e in service.stream_json("sys", "user", {"sentences"})]
+        second = [e async for e in service.stream_json("sys", "user", {"sentences"})]
+
+        assert first == second
+        assert client.chat.completions.create.call_count == 1
+        # The non-streaming path shares the same cache entry
+        assert await service.complete_json_async("sys", "user") == ARTICLE_RESULT
+        assert client.chat.completions.create.call_count == 1
+
+    async def test_limiter_released_and_stream_closed_on_early_exit(self):
+        from app.services.shared.concurrency import get_llm_limiter
+
+        client = make_streaming_client(ARTICLE_RESULT)
+        stream_holder = {}
+        original = client.chat.completions.create.side_effect
+
+        async def create(**kwargs):
+            stream_holder["stream"] = await original(**kwargs)
+            return stream_holder["stream"]
+
+        client.chat.completions.create.side_effect = create
+        gen = self._service(client).stream_json("sys", "user", {"sentences"})
+        await gen.__anext__()
+        assert get_llm_limiter().snapshot()["in_use"] == 1
+        await gen.aclose()
+
+        assert get_llm_limiter().snapshot()["in_use"] == 0
+        assert stream_holder["stream"].closed
+
+    async def test_invalid_document_raises_after_elements(self):
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=FakeStream('{"sentences": [1, 2], "x": '))
+        gen = self._service(client).stream_json("sys", "user", {"sentences"})
+
+        assert [await gen.__anext__(), await gen.__anext__()] == [("sentences", 1), ("sentences", 2)]
+        with pytest.raises(json.JSONDecodeError):
+            await gen.__anext__()
+
+
+def _ndjson(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+class TestStreamingEndpoints:
+    """NDJSON / SSE variants of the analyze endpoints"""
+
+    def test_article_analyze_stream_ndjson(self, client):
+        with patch(
+            "app.services.shared.llm_service.get_openai_client",
+            return_value=make_streaming_client(ARTICLE_RESULT),
+        ):
+            response = client.post("/api/v1/article/analyze/stream", json={"text": "Hello world. It is fine."})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = _ndjson(response)
+        assert [e["type"] for e in events] == ["sentence", "sentence", "expression", "complete"]
+        assert events[0]["data"] == ARTICLE_RESULT["sentences"][0]
+        assert events[-1]["data"]["meta"]["sentenceCount"] == 2
+
+    def test_study_analyze_stream_sse(self, client):
+        with patch(
+            "app.services.shared.llm_service.get_openai_client",
+            return_value=make_streaming_client(ARTICLE_RESULT),
+        ):
+            response = client.post(
+                "/api/v1/study/analyze/stream",
+                json={"text": "안녕하세요. 반갑습니다.", "targetLanguage": "en"},
+                headers={"Accept": "text/event-stream"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [f for f in response.text.split("\n\n") if f]
+        assert frames[0].startswith("event: sentence\ndata: ")
+        last = json.loads(frames[-1].split("data: ", 1)[1])
+        assert last["type"] == "complete"
+        assert last["data"]["meta"]["targetLanguage"] == "en"
+
+    def test_video_analyze_stream(self, client, sample_analyze_request):
+        with patch(
+            "app.services.shared.llm_service.get_openai_client",
+            return_value=make_streaming_client(VIDEO_RESULT),
+        ):
+            response = client.post("/api/v1/analyze/stream", json=sample_analyze_request)
+
+        events = _ndjson(response)
+        assert [e["type"] for e in events] == ["keyword", "keyword", "highlight", "complete"]
+        assert events[-1]["data"]["watchScore"] == 8
+        assert events[-1]["data"]["highlights"][0]["timestamp"] == 0
+
+    def test_video_analyze_stream_skips_malformed_highlights(self, client, sample_analyze_request):
+        payload = {**VIDEO_RESULT, "highlights": ["시작", 42, {"timestamp": 30, "title": "끝", "description": "마무리"}]}
+        with patch(
+            "app.services.shared.llm_service.get_openai_client",
+            return_value=make_streaming_client(payload),
+        ):
+            response = client.post("/api/v1/analyze/stream", json=sample_analyze_request)
+
+        events = _ndjson(response)
+        assert [e["type"] for e in events] == ["keyword", "keyword", "highlight", "complete"]
+        # Corrected to the only segment, as analyze() would
+        assert events[2]["data"]["timestamp"] == 0
+        assert events[-1]["data"]["highlights"] == [events[2]["data"]]
+
+    def test_error_event_after_stream_start(self, client):
+        broken = MagicMock()
+        broken.chat.completions.create = AsyncMock(return_value=FakeStream('{"sentences": [{"id": 0}], '))
+        with patch("app.services.shared.llm_service.get_openai_client", return_value=broken):
+            response = client.post("/api/v1/article/analyze/stream", json={"text": "Hello world."})
+
+        events = _ndjson(response)
+        assert events[0]["type"] == "sentence"
+        assert events[-1]["type"] == "error"
+        assert events[-1]["error"]["code"] == "LLM_ERROR"
@@ -107,3 +107,252 @@ class TestSTTValidation:
             # Should not fail due to format validation
             # 429 is acceptable as rate limiting may kick in during test loop
             assert response.status_code in [200, 429, 500]  # 500 might be from mock
+
+
+class TestStreamingUpload:
+    """Uploads are spooled and streamed, never read whole"""
+
+    def test_file_streamed_to_backend(self, client, stt_backend):
+        audio = bytes(range(256)) * 8000  # ~2MB, past the 1MB in-memory spool
+        response = client.post(
+            "/stt/transcribe",
+            files={"audio": ("talk.mp3", BytesIO(audio), "audio/mpeg")},
+            data={"language": "ko"},
+        )
+
+        assert response.status_code == 200
+        request = stt_backend[0]
+        assert int(request["headers"]["content-length"]) == len(request["body"])
+        assert audio in request["body"]
+        assert b'filename="talk.mp3"' in request["body"]
+        assert b'name="language"\r\n\r\nko\r\n' in request["body"]
+
+    def test_declared_size_over_limit_rejected_before_reading(self, client, stt_backend, monkeypatch):
+        from app.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "max_file_size_mb", 1)
+        response = client.post(
+            "/stt/transcribe",
+            files={"audio": ("big.mp3", BytesIO(b"\0" * (2 * 1024 * 1024)), "audio/mpeg")},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["error"] == "FILE_TOO_LARGE"
+        assert stt_backend == []
+
+    def test_chunked_body_cut_off_at_limit(self, client, stt_backend, monkeypatch):
+        from app.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "max_file_size_mb", 1)
+        boundary = "xyz"
+
+        def body():
+            yield f'--{boundary}\r\nContent-Disposition: form-data; name="audio"; filename="a.mp3"\r\n\r\n'.encode()
+            for _ in range(64):  # 4MB in 64KB chunks, no Content-Length
+                yield b"\0" * 65536
+            yield f"\r\n--{boundary}--\r\n".encode()
+
+        response = client.post(
+            "/stt/transcribe",
+            content=body(),
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["error"] == "FILE_TOO_LARGE"
+        assert stt_backend == []
+
+    async def test_retry_resends_whole_file(self):
+        import httpx
+        from app.services.shared.stt import AudioSource
+        from app.services.shared.stt.whisperx_provider import WhisperXProvider
+
+        bodies = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(await request.aread())
+            if len(bodies) == 1:
+                raise httpx.ConnectError("refused")
+            return httpx.Response(200, json={"text": "ok", "language": "en", "segments": []})
+
+        provider = WhisperXProvider(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        with patch("app.services.shared.stt.whisperx_provider.get_settings") as settings:
+            settings.return_value.retry_max_attempts = 2
+            settings.return_value.retry_base_delay = 0
+            result = await provider.transcribe_source(AudioSource.from_bytes(b"abc" * 1000, "a.wav"))
+
+        assert result.text == "ok"
+        assert len(bodies) == 2
+        assert b"abc" * 1000 in bodies[1]
+
+
+class TestResultCache:
+    """Re-uploads of the same audio are served from the STT result cache"""
+
+    def _upload(self, client, audio: bytes, language: str = "ko", filename: str = "talk.mp3"):
+        return client.post(
+            "/stt/transcribe",
+            files={"audio": (filename, BytesIO(audio), "audio/mpeg")},
+            data={"language": language},
+        )
+
+    def test_same_audio_transcribed_once(self, client, stt_backend):
+        audio = bytes(range(256)) * 8000
+
+        first = self._upload(client, audio)
+        second = self._upload(client, audio, filename="retry.mp3")
+
+        assert first.status_code == second.status_code == 200
+        assert second.json() == first.json()
+        assert len(stt_backend) == 1
+        stats = client.get("/health/stats").json()["stt_result_cache"]
+        assert (stats["hits"], stats["misses"], stats["writes"]) == (1, 1, 1)
+
+    def test_language_hint_and_content_are_part_of_the_key(self, client, stt_backend):
+        self._upload(client, b"audio one", language="ko")
+        self._upload(client, b"audio one", language="en")
+        self._upload(client, b"audio two", language="ko")
+
+        assert len(stt_backend) == 3
+
+    async def test_provider_is_part_of_the_key(self, stt_backend, monkeypatch):
+        from app.config import get_settings
+        from app.services.video.stt_client import STTClient
+
+        await STTClient().transcribe(b"audio", "a.mp3")
+        monkeypatch.setattr(get_settings(), "stt_chunking_enabled", True)
+        chunked = STTClient()
+        monkeypatch.setattr(chunked, "_chunked", None)  # same backend call, different cache scope
+        await chunked.transcribe(b"audio", "a.mp3")
+
+        assert len(stt_backend) == 2
+
+    def test_disabled(self, client, stt_backend, monkeypatch):
+        from app.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "stt_cache_enabled", False)
+        self._upload(client, b"audio")
+        self._upload(client, b"audio")
+
+        assert len(stt_backend) == 2
+
+    async def test_hash_matches_whole_file_digest(self):
+        import hashlib
+        from app.services.shared.stt import AudioSource
+        from app.services.shared.stt.result_cache import HASH_CHUNK_SIZE, hash_audio
+
+        data = bytes(range(256)) * (HASH_CHUNK_SIZE // 100)
+        audio = AudioSource.from_bytes(data, "a.wav")
+        audio.file.seek(123)
+
+        assert await hash_audio(audio) == hashlib.sha256(data).hexdigest()
+        assert audio.file.tell() == 0
+
+    async def test_results_survive_restart_via_disk_tier(self, tmp_path, monkeypatch):
+        from app.config import get_settings
+        from app.services.shared.stt import AudioSource, STTResult
+        from app.services.shared.stt.result_cache import get_stt_result_cache, reset_stt_result_cache
+
+        monkeypatch.setattr(get_settings(), "stt_cache_sqlite_path", str(tmp_path / "stt.db"))
+        result = STTResult(text="안녕", language="ko", segments=[{"start": 0.0, "end": 1.0, "text": "안녕"}])
+        cache = get_stt_result_cache()
+        key = await cache.make_key(AudioSource.from_bytes(b"audio"), "whisperx", "auto")
+        await cache.set(key, result)
+        reset_stt_result_cache()
+
+        assert await get_stt_result_cache().get(key) == result
+
+
+class TestVideoTranscriptCache:
+    """/stt/video/{video_id} remembers transcripts and download failures"""
+
+    @pytest.fixture
+    def downloader(self):
+        from app.services.video.youtube_audio import YouTubeAudioDownloader
+
+        with patch.object(YouTubeAudioDownloader, "download_audio", autospec=True) as download:
+            yield download
+
+    def test_transcript_cached_per_language(self, client, stt_backend, downloader):
+        downloader.return_value = (b"audio", 60)
+
+        first = client.post("/stt/video/abc123")
+        second = client.post("/stt/video/abc123")
+        other_language = client.post("/stt/video/abc123?language=ko")
+
+        assert first.status_code == second.status_code == other_language.status_code == 200
+        assert second.json() == first.json()
+        assert downloader.await_count == 2
+        # The second language re-downloads but the audio itself is in the STT result cache
+        assert len(stt_backend) == 2
+
+    def test_stt_configuration_is_part_of_the_key(self, client, stt_backend, downloader, monkeypatch):
+        from app.config import get_settings
+        from app.services.shared.stt import chunking
+
+        async def no_ffmpeg(*args, **kwargs):
+            raise FileNotFoundError("ffmpeg")
+
+        downloader.return_value = (b"audio", 60)
+        client.post("/stt/video/abc123")
+        # Turning on chunking must not serve transcripts made without it
+        monkeypatch.setattr(get_settings(), "stt_chunking_enabled", True)
+        monkeypatch.setattr(chunking, "probe_audio", no_ffmpeg)
+        client.post("/stt/video/abc123")
+        client.post("/stt/video/abc123")
+
+        assert downloader.await_count == 2
+        assert len(stt_backend) == 2
+
+    def test_download_failure_cached(self, client, stt_backend, downloader):
+        async def private(self, video_id):
+            self.last_failure_permanent = True
+            return None, None
+
+        downloader.side_effect = private
+
+        responses = [client.post("/stt/video/private1") for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [400, 400, 400]
+        assert downloader.await_count == 1
+        stats = client.get("/health/stats").json()["video_transcript_cache"]
+        assert stats["failure_hits"] == 2
+
+    def test_transient_download_failure_not_cached(self, client, stt_backend, downloader):
+        downloader.return_value = (None, None)  # e.g. a timeout, after download_audio's own retries
+
+        responses = [client.post("/stt/video/flaky1") for _ in range(2)]
+
+        assert [r.status_code for r in responses] == [400, 400]
+        assert downloader.await_count == 2
+
+    def test_too_long_cached_with_duration(self, client, stt_backend, downloader, monkeypatch):
+        from app.services.video import youtube_audio
+
+        downloader.return_value = (None, 3 * 3600)
+        monkeypatch.setattr(youtube_audio.settings, "stt_max_duration_minutes", 120)
+
+        first = client.post("/stt/video/long1")
+        second = client.post("/stt/video/long1?language=ko")
+
+        assert first.status_code == second.status_code == 422
+        assert second.json() == first.json()
+        assert "180분" in second.json()["message"]
+        assert downloader.await_count == 1
+
+        # Raising the limit makes the remembered failure stale
+        monkeypatch.setattr(youtube_audio.settings, "stt_max_duration_minutes", 240)
+        downloader.return_value = (b"audio", 3 * 3600)
+        assert client.post("/stt/video/long1").status_code == 200
+        assert downloader.await_count == 2
+
+    def test_stt_errors_not_cached(self, client, downloader):
+        downloader.return_value = (b"audio", 60)
+
+        with patch("app.api.video.stt.STTClient.transcribe", new_callable=AsyncMock) as transcribe:
+            from app.core.exceptions import STTError
+            transcribe.side_effect = STTError(message="STT 서비스를 사용할 수 없습니다", unavailable=True)
+            client.post("/stt/video/abc123")
+            client.post("/stt/video/abc123")
+
+        assert downloader.await_count == 2
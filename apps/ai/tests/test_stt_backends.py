@@ -0,0 +1,211 @@
+"""Tests for load balancing across several STT backends"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.services.shared.stt import AudioSource, AudioStream
+from app.services.shared.stt.backends import STTBackendPool, parse_backend_urls
+from app.services.shared.stt.whisperx_provider import WhisperXProvider
+
+URLS = ["http://stt-a:12321", "http://stt-b:12321", "http://stt-c:12321"]
+
+
+class StandIns:
+    """Several fake WhisperX servers behind one transport, routed by host"""
+
+    def __init__(self):
+        self.received: dict[str, int] = {}
+        self.delay: dict[str, float] = {}
+        self.down: set[str] = set()
+        self.status: dict[str, int] = {}
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        await request.aread()
+        if host in self.down:
+            raise httpx.ConnectError("connection refused", request=request)
+        self.received[host] = self.received.get(host, 0) + 1
+        await asyncio.sleep(self.delay.get(host, 0))
+        status = self.status.get(host, 200)
+        return httpx.Response(status, json={"text": host, "language": "en", "segments": []})
+
+
+@pytest.fixture
+def stand_ins(monkeypatch):
+    monkeypatch.setattr(get_settings(), "retry_base_delay", 0.0)
+    return StandIns()
+
+
+def make_provider(stand_ins: StandIns, **kwargs) -> WhisperXProvider:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(stand_ins.handler))
+    return WhisperXProvider(http_client=client, backends=STTBackendPool(URLS, **kwargs))
+
+
+def audio(size: int) -> AudioSource:
+    return AudioSource.from_bytes(b"\0" * size, "a.mp3", "audio/mpeg")
+
+
+class TestBackendSelection:
+    """Least outstanding audio bytes"""
+
+    def test_parse_urls(self):
+        assert parse_backend_urls(" http://a:1, http://b:2/ ,") == ["http://a:1", "http://b:2/"]
+
+    def test_least_outstanding_bytes_wins(self):
+        pool = STTBackendPool(URLS)
+        pool.begin(pool.backends[0], 50 * 1024 * 1024)
+        pool.begin(pool.backends[1], 1024)
+
+        assert pool.pick().url == URLS[2]
+        pool.begin(pool.backends[2], 2048)
+        # One short clip weighs less than a long file, whatever the request count
+        assert pool.pick().url == URLS[1]
+
+    async def test_concurrent_requests_spread(self, stand_ins):
+        provider = make_provider(stand_ins)
+        stand_ins.delay = {host: 0.05 for host in ("stt-a", "stt-b", "stt-c")}
+
+        await asyncio.gather(*(provider.transcribe_source(audio(1000)) for _ in range(6)))
+
+        assert stand_ins.received == {"stt-a": 2, "stt-b": 2, "stt-c": 2}
+        assert all(b["outstanding"] == 0 for b in provider.backends.snapshot()["backends"])
+
+    async def test_slow_backend_gets_less_work(self, stand_ins):
+        provider = make_provider(stand_ins)
+        stand_ins.delay = {"stt-a": 0.5, "stt-b": 0.01, "stt-c": 0.01}
+
+        async def client_loop():
+            for _ in range(10):
+                await provider.transcribe_source(audio(1000))
+
+        await asyncio.gather(*(client_loop() for _ in range(3)))
+
+        assert stand_ins.received.get("stt-a", 0) <= 3
+        assert stand_ins.received["stt-b"] + stand_ins.received["stt-c"] >= 27
+
+
+class TestPassiveHealthChecks:
+    """Failures on real requests eject a backend for a while"""
+
+    async def test_failed_backend_retried_elsewhere_and_ejected(self, stand_ins):
+        provider = make_provider(stand_ins, max_failures=2, ejection_seconds=60)
+        stand_ins.down = {"stt-a"}
+
+        results = [await provider.transcribe_source(audio(1000)) for _ in range(6)]
+
+        assert all(r.text in ("stt-b", "stt-c") for r in results)
+        backend_a = provider.backends.snapshot()["backends"][0]
+        assert backend_a["ejected"] is True
+        assert backend_a["failures"] == 2
+
+    async def test_ejected_backend_returns_after_timeout(self, stand_ins):
+        provider = make_provider(stand_ins, max_failures=1, ejection_seconds=0.05)
+        pool = provider.backends
+        # Busy b and c so the request tries a first
+        for backend in pool.backends[1:]:
+            pool.begin(backend, 10_000)
+        stand_ins.down = {"stt-a"}
+        await provider.transcribe_source(audio(1000))
+        stand_ins.down = set()
+        for backend in pool.backends[1:]:
+            pool.end(backend, 10_000, ok=True, seconds=0.01)
+        assert provider.backends.snapshot()["backends"][0]["ejected"] is True
+
+        await asyncio.sleep(0.06)
+        await asyncio.gather(*(provider.transcribe_source(audio(1000)) for _ in range(3)))
+
+        assert stand_ins.received["stt-a"] == 1
+
+    def test_success_resets_ejection_backoff(self):
+        pool = STTBackendPool(URLS, max_failures=1, ejection_seconds=30, max_ejection_seconds=300)
+        backend = pool.backends[0]
+
+        def fail() -> float:
+            pool.begin(backend, 1000)
+            pool.end(backend, 1000, ok=False, seconds=0.1)
+            return backend.ejected_until - time.monotonic()
+
+        assert fail() == pytest.approx(30, abs=1)
+        assert fail() == pytest.approx(60, abs=1)
+        pool.begin(backend, 1000)
+        pool.end(backend, 1000, ok=True, seconds=0.1)
+
+        # An isolated ejection after a success starts from the base duration again
+        assert fail() == pytest.approx(30, abs=1)
+
+    async def test_cancelled_requests_do_not_eject(self, stand_ins):
+        provider = make_provider(stand_ins, max_failures=1)
+        stand_ins.delay = {host: 10 for host in ("stt-a", "stt-b", "stt-c")}
+
+        # e.g. sibling chunks cancelled after one failed, or the client went away
+        tasks = [asyncio.ensure_future(provider.transcribe_source(audio(1000))) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        backends = provider.backends.snapshot()["backends"]
+        assert not any(b["ejected"] for b in backends)
+        assert all(b["failures"] == 0 and b["outstanding"] == 0 for b in backends)
+        assert sum(stand_ins.received.values()) == 3
+
+    async def test_cancelled_stream_does_not_eject(self, stand_ins):
+        provider = make_provider(stand_ins, max_failures=1)
+        stand_ins.delay = {host: 10 for host in ("stt-a", "stt-b", "stt-c")}
+
+        async def chunks():
+            yield b"\0" * 1000
+
+        stream = AudioStream(chunks(), 1000, "a.mp3", "audio/mpeg")
+        task = asyncio.ensure_future(provider.transcribe_stream(stream))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        backends = provider.backends.snapshot()["backends"]
+        assert not any(b["ejected"] for b in backends)
+        assert all(b["failures"] == 0 and b["outstanding"] == 0 for b in backends)
+
+    async def test_client_errors_do_not_eject(self, stand_ins):
+        provider = make_provider(stand_ins, max_failures=1)
+        stand_ins.status = {host: 400 for host in ("stt-a", "stt-b", "stt-c")}
+
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await provider.transcribe_source(audio(1000))
+
+        assert not any(b["ejected"] for b in provider.backends.snapshot()["backends"])
+
+    async def test_server_errors_eject(self, stand_ins):
+        provider = make_provider(stand_ins, max_failures=1)
+        stand_ins.status = {"stt-a": 503, "stt-b": 503, "stt-c": 503}
+
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await provider.transcribe_source(audio(1000))
+
+        assert all(b["ejected"] for b in provider.backends.snapshot()["backends"])
+
+    def test_all_ejected_still_routes(self):
+        pool = STTBackendPool(URLS[:2], max_failures=1, ejection_seconds=10)
+        for backend in pool.backends:
+            pool.begin(backend, 0)
+            pool.end(backend, 0, ok=False, seconds=1.0)
+        # Ejected again: twice as long, so the other one comes back first
+        pool.begin(pool.backends[0], 0)
+        pool.end(pool.backends[0], 0, ok=False, seconds=1.0)
+
+        assert pool.pick().url == URLS[1]
+
+
+def test_backend_stats_exposed(client, stt_backend):
+    client.post("/stt/transcribe", files={"audio": ("a.mp3", b"ID3" + b"\0" * 64, "audio/mpeg")})
+
+    stats = client.get("/health/stats").json()["stt_backends"]
+
+    assert stats["backends"][0]["requests"] == 1
+    assert stats["backends"][0]["url"] == get_settings().stt_api_url
@@ -0,0 +1,185 @@
+"""Tests for chunked parallel transcription"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.services.shared.stt import AudioSource, STTProvider, STTResult
+from app.services.shared.stt import chunking
+from app.services.shared.stt.chunking import (
+    AudioChunk,
+    ChunkedTranscriber,
+    parse_silencedetect,
+    plan_chunks,
+    stitch_segments,
+)
+
+FFMPEG_STDERR = """Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'talk.m4a':
+  Duration: 00:21:40.52, start: 0.000000, bitrate: 129 kb/s
+[silencedetect @ 0x5581] silence_start: -0.0123
+[silencedetect @ 0x5581] silence_end: 0.85 | silence_duration: 0.86
+[silencedetect @ 0x5581] silence_start: 590.2
+[silencedetect @ 0x5581] silence_end: 591.0 | silence_duration: 0.8
+[silencedetect @ 0x5581] silence_start: 1300.1
+size=N/A time=00:21:40.52 bitrate=N/A speed= 512x
+"""
+
+
+class TestPlanning:
+    """ffmpeg output parsing and cut placement"""
+
+    def test_parse_silencedetect(self):
+        duration, silences = parse_silencedetect(FFMPEG_STDERR)
+
+        assert duration == pytest.approx(1300.52)
+        assert silences == [(0.0, 0.85), (590.2, 591.0), (1300.1, pytest.approx(1300.52))]
+
+    def test_cut_moved_to_silence_without_overlap(self):
+        chunks = plan_chunks(1300.0, [(590.2, 591.0)], chunk_seconds=600, overlap_seconds=2, search_seconds=30)
+
+        assert [(c.start, c.end) for c in chunks] == [(0.0, pytest.approx(590.6)), (pytest.approx(590.6), 1300.0)]
+
+    def test_hard_cut_overlaps_both_sides(self):
+        chunks = plan_chunks(1200.0, [], chunk_seconds=600, overlap_seconds=2, search_seconds=30)
+
+        assert [(c.start, c.end) for c in chunks] == [(0.0, 602.0), (598.0, 1200.0)]
+
+    def test_short_audio_single_chunk(self):
+        assert len(plan_chunks(740.0, [], chunk_seconds=600, overlap_seconds=2, search_seconds=30)) == 1
+
+
+class TestStitching:
+    """Offsets and seam dedupe"""
+
+    def test_segments_offset_by_chunk_start(self):
+        chunks = [AudioChunk(0, 0.0, 10.0), AudioChunk(1, 10.0, 20.0)]
+        merged = stitch_segments(chunks, [
+            [{"start": 1.0, "end": 2.0, "text": "a"}],
+            [{"start": 1.0, "end": 2.0, "text": "b", "words": [{"start": 1.0, "end": 1.5, "word": "b"}]}],
+        ])
+
+        assert [(s["start"], s["end"], s["text"]) for s in merged] == [(1.0, 2.0, "a"), (11.0, 12.0, "b")]
+        assert merged[1]["words"][0]["start"] == 11.0
+
+    def test_overlap_resolved_at_seam(self):
+        # Chunks overlap on [98, 102]; the seam is at 100
+        chunks = [AudioChunk(0, 0.0, 102.0), AudioChunk(1, 98.0, 200.0)]
+        merged = stitch_segments(chunks, [
+            [
+                {"start": 95.0, "end": 98.5, "text": "before the cut"},
+                {"start": 99.0, "end": 101.5, "text": "Across the cut"},
+            ],
+            [
+                {"start": 0.5, "end": 3.5, "text": "across the  cut"},  # 98.5-101.5
+                {"start": 4.0, "end": 6.0, "text": "after"},
+            ],
+        ])
+
+        assert [s["text"] for s in merged] == ["before the cut", "across the  cut", "after"]
+
+
+class StandInProvider(STTProvider):
+    """Local stand-in for the STT backend: one segment per chunk, text = chunk file content"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def transcribe(self, audio_data: bytes, filename: str = "audio.webm", language: str = "auto") -> STTResult:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        chunk = json.loads(audio_data)
+        return STTResult(
+            text=f"chunk {chunk['index']}",
+            language="ko" if chunk["index"] else "en",
+            language_probability=0.9,
+            segments=[{"start": 5.0, "end": 6.0, "text": f"chunk {chunk['index']}"}],
+        )
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """probe/extract without ffmpeg: 2500s of audio, no silences; chunks are tiny JSON files"""
+    async def probe(path, noise_db, min_silence):
+        return 2500.0, []
+
+    async def extract(path, chunk, dest):
+        with open(dest, "w") as f:
+            json.dump({"index": chunk.index, "start": chunk.start}, f)
+
+    monkeypatch.setattr(chunking, "probe_audio", probe)
+    monkeypatch.setattr(chunking, "extract_chunk", extract)
+
+
+class TestChunkedTranscriber:
+    """Split, transcribe in parallel, stitch"""
+
+    async def test_chunks_transcribed_in_parallel_and_stitched(self, fake_ffmpeg):
+        provider = StandInProvider()
+        transcriber = ChunkedTranscriber(provider, chunk_seconds=600, overlap_seconds=2, parallelism=2)
+
+        result = await transcriber.transcribe(AudioSource.from_bytes(b"audio", "talk.m4a"))
+
+        # Hard cuts at 600/1200/1800, the last 700s stay one chunk
+        assert provider.calls == 4
+        assert provider.max_in_flight == 2
+        assert [s["text"] for s in result.segments] == [f"chunk {i}" for i in range(4)]
+        assert [s["start"] for s in result.segments] == [5.0, 603.0, 1203.0, 1803.0]
+        assert result.language == "ko"
+        assert result.text == "chunk 0 chunk 1 chunk 2 chunk 3"
+
+    async def test_failed_chunk_stops_the_others_before_cleanup(self, fake_ffmpeg):
+        cancelled = []
+
+        class FailingProvider(StandInProvider):
+            async def transcribe(self, audio_data, filename="audio.webm", language="auto"):
+                index = json.loads(audio_data)["index"]
+                if index == 0:
+                    raise RuntimeError("backend down")
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(index)
+                    raise
+
+        transcriber = ChunkedTranscriber(FailingProvider(), chunk_seconds=600, overlap_seconds=2, parallelism=4)
+
+        with pytest.raises(RuntimeError, match="backend down"):
+            await transcriber.transcribe(AudioSource.from_bytes(b"audio", "talk.m4a"))
+
+        # Already wound down, not left to fail on a deleted workdir later
+        assert sorted(cancelled) == [1, 2, 3]
+
+    async def test_short_audio_sent_whole(self, monkeypatch):
+        async def probe(path, noise_db, min_silence):
+            return 30.0, []
+
+        monkeypatch.setattr(chunking, "probe_audio", probe)
+        provider = StandInProvider()
+        result = await ChunkedTranscriber(provider, chunk_seconds=600).transcribe(
+            AudioSource.from_bytes(b'{"index": 0}', "short.wav")
+        )
+
+        assert provider.calls == 1
+        assert result.text == "chunk 0"
+
+    async def test_stt_client_falls_back_without_ffmpeg(self, monkeypatch, stt_backend):
+        from app.config import get_settings
+        from app.services.video.stt_client import STTClient
+
+        async def missing(*args, **kwargs):
+            raise FileNotFoundError("ffmpeg")
+
+        monkeypatch.setattr(get_settings(), "stt_chunking_enabled", True)
+        monkeypatch.setattr(chunking, "probe_audio", missing)
+
+        result = await STTClient().transcribe(b"audio", "talk.mp3")
+
+        assert result.text == "hello"
+        assert len(stt_backend) == 1
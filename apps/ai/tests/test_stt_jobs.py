@@ -0,0 +1,227 @@
+"""Tests for asynchronous STT jobs"""
+
+import asyncio
+import sqlite3
+import time
+from io import BytesIO
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.video import stt_jobs
+from app.services.video.stt_jobs import STTJob, STTJobRunner, STTJobStore
+
+DOWNLOAD = "app.services.video.youtube_audio.YouTubeAudioDownloader.download_audio"
+
+
+def make_runner(tmp_path, **kwargs) -> STTJobRunner:
+    options = {"workers": 1, "queue_size": 10, "lease_seconds": 30, "poll_interval": 0.05}
+    options.update(kwargs)
+    return STTJobRunner(STTJobStore(str(tmp_path / "jobs.db")), files_dir=str(tmp_path / "files"), **options)
+
+
+@pytest.fixture
+async def runner(tmp_path, monkeypatch):
+    runner = make_runner(tmp_path, queue_size=1)
+    monkeypatch.setattr(stt_jobs, "_stt_job_runner", runner)
+    yield runner
+    await stt_jobs.reset_stt_job_runner()
+
+
+async def wait_for(client, job_id: str, *statuses: str) -> dict:
+    for _ in range(200):
+        body = (await client.get(f"/stt/jobs/{job_id}")).json()
+        if body["status"] in statuses:
+            return body
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"job {job_id} stuck in {body['status']}")
+
+
+class TestSTTJobsAPI:
+    """POST /stt/jobs and GET /stt/jobs/{id}"""
+
+    async def test_upload_job_succeeds(self, async_client, runner, stt_backend, tmp_path):
+        response = await async_client.post(
+            "/stt/jobs",
+            files={"audio": ("talk.mp3", BytesIO(b"ID3" + b"\0" * 1024), "audio/mpeg")},
+            data={"language": "en"},
+        )
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "queued"
+
+        job = await wait_for(async_client, job["jobId"], "succeeded", "failed")
+        assert job["status"] == "succeeded"
+        assert job["stage"] == "done"
+        assert job["result"]["text"] == "hello"
+        assert len(stt_backend) == 1
+        # The stored upload is removed once the job is finished
+        assert list((tmp_path / "files").iterdir()) == []
+
+    async def test_video_job_reports_download_failure(self, async_client, runner):
+        with patch(DOWNLOAD, new_callable=AsyncMock, return_value=(None, None)):
+            response = await async_client.post("/stt/jobs", json={"videoId": "abc123"})
+            assert response.status_code == 202
+
+            job = await wait_for(async_client, response.json()["jobId"], "succeeded", "failed")
+
+        assert job["status"] == "failed"
+        assert job["error"]["code"] == "STT_ERROR"
+        assert job["error"]["details"] == {"video_id": "abc123"}
+
+    async def test_invalid_video_id_rejected(self, async_client, runner):
+        response = await async_client.post("/stt/jobs", json={"videoId": "../etc"})
+
+        assert response.status_code == 400
+
+    async def test_unknown_job_404(self, async_client, runner):
+        response = await async_client.get("/stt/jobs/missing")
+
+        assert response.status_code == 404
+        assert response.json()["error"] == "JOB_NOT_FOUND"
+
+    async def test_queue_full_rejected(self, async_client, runner):
+        release = asyncio.Event()
+
+        async def download(video_id):
+            await release.wait()
+            return None, None
+
+        with patch(DOWNLOAD, side_effect=download):
+            first = (await async_client.post("/stt/jobs", json={"videoId": "a"})).json()
+            await wait_for(async_client, first["jobId"], "running")
+            # One running, one queued: the queue (size 1) is full
+            assert (await async_client.post("/stt/jobs", json={"videoId": "b"})).status_code == 202
+
+            response = await async_client.post("/stt/jobs", json={"videoId": "c"})
+
+            assert response.status_code == 503
+            assert response.json()["error"] == "STT_UNAVAILABLE"
+            release.set()
+
+
+class TestSTTJobRecovery:
+    """Jobs survive the process that was running them"""
+
+    async def test_expired_lease_claimed_again(self, tmp_path):
+        store = STTJobStore(str(tmp_path / "jobs.db"))
+        # Claimed by a process that died: still running, lease in the past
+        store.create(STTJob(
+            id="j1", kind="video", params={"video_id": "abc", "language": "auto"},
+            status="running", stage="transcribing", attempts=1, lease_until=time.time() - 1,
+        ))
+        store.close()
+
+        runner = make_runner(tmp_path)
+        try:
+            with patch(DOWNLOAD, new_callable=AsyncMock, return_value=(None, None)) as download:
+                await runner.start()
+                for _ in range(100):
+                    job = await runner.get("j1")
+                    if job.status == "failed":
+                        break
+                    await asyncio.sleep(0.02)
+        finally:
+            await runner.close()
+
+        assert job.status == "failed"
+        assert job.attempts == 2
+        download.assert_awaited_once()
+
+    async def test_live_lease_left_alone(self, tmp_path):
+        store = STTJobStore(str(tmp_path / "jobs.db"))
+        store.create(STTJob(
+            id="j1", kind="video", params={"video_id": "abc"},
+            status="running", attempts=1, lease_until=time.time() + 60,
+        ))
+
+        assert store.claim(lease_seconds=30) is None
+        store.close()
+
+    async def test_repeatedly_interrupted_job_failed(self, tmp_path):
+        store = STTJobStore(str(tmp_path / "jobs.db"))
+        store.create(STTJob(
+            id="j1", kind="video", params={"video_id": "abc"},
+            status="running", attempts=2, lease_until=time.time() - 1,
+        ))
+        store.close()
+
+        runner = make_runner(tmp_path, max_attempts=2)
+        try:
+            with patch(DOWNLOAD, new_callable=AsyncMock) as download:
+                await runner.start()
+                for _ in range(100):
+                    job = await runner.get("j1")
+                    if job.status == "failed":
+                        break
+                    await asyncio.sleep(0.02)
+        finally:
+            await runner.close()
+
+        assert job.status == "failed"
+        assert "반복적으로 중단" in job.error["message"]
+        download.assert_not_awaited()
+
+    async def test_finished_jobs_expire_while_running(self, tmp_path):
+        runner = make_runner(tmp_path, ttl=0, sweep_interval=0.05)
+        await runner.start()
+        try:
+            # Finished after startup, so only the periodic sweep can remove it
+            await asyncio.to_thread(runner.store.create, STTJob(
+                id="j1", kind="video", params={"video_id": "abc"}, status="succeeded", stage="done",
+            ))
+            for _ in range(100):
+                if await runner.get("j1") is None:
+                    break
+                await asyncio.sleep(0.02)
+            assert await runner.get("j1") is None
+        finally:
+            await runner.close()
+
+    async def test_heartbeat_survives_store_errors(self, tmp_path):
+        started = asyncio.Event()
+
+        async def download(video_id):
+            started.set()
+            await asyncio.Event().wait()
+
+        runner = make_runner(tmp_path, lease_seconds=0.06)
+        update = runner.store.update
+        renewals = []
+
+        def flaky_update(job_id, **values):
+            if "lease_until" in values and values.get("status") is None:
+                renewals.append(values["lease_until"])
+                if len(renewals) == 1:
+                    raise sqlite3.OperationalError("database is locked")
+            update(job_id, **values)
+
+        runner.store.update = flaky_update
+        with patch(DOWNLOAD, side_effect=download):
+            await runner.submit_video("abc")
+            await asyncio.wait_for(started.wait(), 5)
+            await asyncio.sleep(0.1)
+            await runner.close()
+
+        # Kept renewing after the failed write
+        assert len(renewals) >= 3
+
+    async def test_shutdown_requeues_running_job(self, tmp_path):
+        started = asyncio.Event()
+
+        async def download(video_id):
+            started.set()
+            await asyncio.Event().wait()
+
+        runner = make_runner(tmp_path)
+        with patch(DOWNLOAD, side_effect=download):
+            job = await runner.submit_video("abc")
+            await asyncio.wait_for(started.wait(), 5)
+            await runner.close()
+
+        store = STTJobStore(str(tmp_path / "jobs.db"))
+        job = store.get(job.id)
+        store.close()
+        assert job.status == "queued"
+        assert job.attempts == 0
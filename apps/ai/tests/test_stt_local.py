@@ -0,0 +1,112 @@
+"""Tests for the local faster-whisper provider"""
+
+import asyncio
+
+import pytest
+
+from app.core.exceptions import STTError
+from app.services.shared.stt import AudioSource, get_stt_provider
+from app.services.shared.stt import local_provider
+from app.services.shared.stt.local_provider import LocalWhisperPool, LocalWhisperProvider
+
+# Importable in spawned workers through sys.path. Loading is logged to a
+# file next to the package so the test can count it across processes.
+FAKE_FASTER_WHISPER = '''
+import os
+import time
+from types import SimpleNamespace
+
+LOG = os.path.join(os.path.dirname(__file__), "loads.log")
+
+
+class WhisperModel:
+    def __init__(self, model, device, compute_type, cpu_threads, download_root=None):
+        with open(LOG, "a") as f:
+            f.write(f"{os.getpid()} {model} {compute_type} {cpu_threads}\\n")
+
+    def transcribe(self, path, language=None, beam_size=5):
+        data = open(path, "rb").read()
+        delay = float(data.decode() or 0)
+        time.sleep(delay)
+
+        def segments():
+            yield SimpleNamespace(start=0.0, end=1.5, text=" hello")
+            yield SimpleNamespace(start=1.5, end=3.0, text=" world ")
+
+        info = SimpleNamespace(language=language or "en", language_probability=0.8, duration=30.0)
+        return segments(), info
+'''
+
+
+@pytest.fixture
+def fake_faster_whisper(tmp_path, monkeypatch):
+    package = tmp_path / "faster_whisper"
+    package.mkdir()
+    (package / "__init__.py").write_text(FAKE_FASTER_WHISPER)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield package / "loads.log"
+    local_provider.reset_local_whisper_pool()
+
+
+@pytest.fixture
+async def pool(fake_faster_whisper):
+    pool = LocalWhisperPool("tiny", compute_type="int8", workers=2, cpu_threads=3, queue_size=1)
+    await pool.start()
+    yield pool
+    pool.close()
+
+
+class TestLocalWhisperPool:
+    """Preloaded workers, bounded queue"""
+
+    async def test_model_loaded_once_per_worker(self, pool, fake_faster_whisper):
+        provider = LocalWhisperProvider(pool)
+        for _ in range(4):
+            await provider.transcribe(b"0", "a.wav", "ko")
+
+        loads = fake_faster_whisper.read_text().splitlines()
+        assert len(loads) == 2
+        assert len({line.split()[0] for line in loads}) == 2
+        assert all(line.endswith("tiny int8 3") for line in loads)
+
+    async def test_result_mapping(self, pool):
+        result = await LocalWhisperProvider(pool).transcribe(b"0", "a.wav", "ko")
+
+        assert result.text == "hello world"
+        assert result.language == "ko"
+        assert result.segments == [
+            {"start": 0.0, "end": 1.5, "text": "hello"},
+            {"start": 1.5, "end": 3.0, "text": "world"},
+        ]
+        assert pool.snapshot()["audio_seconds"] == 30.0
+
+    async def test_queue_full_rejected(self, pool):
+        provider = LocalWhisperProvider(pool)
+        jobs = [asyncio.ensure_future(provider.transcribe(b"0.5", "a.wav")) for _ in range(3)]
+        await asyncio.sleep(0.1)
+
+        with pytest.raises(STTError) as exc_info:
+            await provider.transcribe(b"0", "a.wav")
+
+        assert exc_info.value.status_code == 503
+        assert len(await asyncio.gather(*jobs)) == 3
+        assert pool.snapshot()["rejected"] == 1
+
+    async def test_file_on_disk_passed_by_path(self, pool, tmp_path):
+        path = tmp_path / "talk.wav"
+        path.write_bytes(b"0")
+
+        result = await LocalWhisperProvider(pool).transcribe_source(AudioSource.from_path(str(path)))
+
+        assert result.text == "hello world"
+
+
+class TestFactory:
+    def test_local_provider_selected(self, fake_faster_whisper):
+        assert isinstance(get_stt_provider("local"), LocalWhisperProvider)
+
+    def test_missing_dependency_reported(self, monkeypatch):
+        monkeypatch.setattr(local_provider.importlib.util, "find_spec", lambda name: None)
+
+        with pytest.raises(RuntimeError, match="faster-whisper"):
+            LocalWhisperProvider().pool
@@ -0,0 +1,150 @@
+"""Tests for pre-STT transcoding to Opus"""
+
+import os
+import stat
+import sys
+
+import pytest
+
+from app.services.shared.stt import AudioSource, AudioStream, AudioStreamError, STTProvider, STTResult
+from app.services.shared.stt.chunking import FFmpegError
+from app.services.shared.stt.transcode import TranscodingProvider, transcode_to_opus
+
+# Stand-in ffmpeg: keeps every 4th byte of the input ("pipe:0" = stdin), fails on input starting with "bad"
+FAKE_FFMPEG = """#!{python}
+import sys
+args = sys.argv[1:]
+source = args[args.index("-i") + 1]
+data = sys.stdin.buffer.read() if source == "pipe:0" else open(source, "rb").read()
+if data.startswith(b"bad"):
+    sys.stderr.write("Invalid data found when processing input\\n")
+    sys.exit(1)
+sys.stdout.buffer.write(data[::4])
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    script = tmp_path / "ffmpeg"
+    script.write_text(FAKE_FFMPEG.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+
+class RecordingProvider(STTProvider):
+    def __init__(self):
+        self.sent: list[tuple[str, str, bytes]] = []
+
+    async def transcribe(self, audio_data: bytes, filename: str = "audio.webm", language: str = "auto") -> STTResult:
+        raise AssertionError("transcribe_source expected")
+
+    async def transcribe_source(self, audio: AudioSource, language: str = "auto") -> STTResult:
+        self.sent.append((audio.filename, audio.content_type, await audio.read()))
+        return STTResult(text="ok", language="en")
+
+
+class TestTranscode:
+    """ffmpeg is fed and drained as streams"""
+
+    async def test_piped_input(self, fake_ffmpeg):
+        data = bytes(range(256)) * 4096  # 1MB, several pipe buffers
+        result = await transcode_to_opus(AudioSource.from_bytes(data, "talk.m4a"), 24)
+
+        assert (result.filename, result.content_type, result.size) == ("talk.ogg", "audio/ogg", len(data) // 4)
+        assert await result.read() == data[::4]
+
+    async def test_file_input_read_by_path(self, fake_ffmpeg, tmp_path):
+        path = tmp_path / "talk.webm"
+        path.write_bytes(b"x" * 4000)
+        audio = AudioSource.from_path(str(path))
+        audio.close()  # ffmpeg opens the path itself
+
+        result = await transcode_to_opus(audio, 24)
+
+        assert result.size == 1000
+
+    async def test_spooled_upload_opened_through_its_descriptor(self, fake_ffmpeg):
+        import tempfile
+
+        spool = tempfile.SpooledTemporaryFile(max_size=1024)
+        spool.write(b"y" * 8000)  # past max_size: rolled over to disk
+        audio = AudioSource(spool, 8000, "upload.mp3")
+
+        result = await transcode_to_opus(audio, 24)
+
+        assert result.size == 2000
+
+    async def test_undecodable_input(self, fake_ffmpeg):
+        with pytest.raises(FFmpegError, match="Invalid data"):
+            await transcode_to_opus(AudioSource.from_bytes(b"bad" * 100_000), 24)
+
+
+class TestTranscodingProvider:
+    """Compact audio is sent when it helps, the original otherwise"""
+
+    async def test_sends_transcoded_audio(self, fake_ffmpeg):
+        inner = RecordingProvider()
+        await TranscodingProvider(inner).transcribe_source(AudioSource.from_bytes(b"abcd" * 1000, "a.mp3"))
+
+        assert inner.sent == [("a.ogg", "audio/ogg", b"a" * 1000)]
+
+    async def test_falls_back_to_original(self, fake_ffmpeg):
+        inner = RecordingProvider()
+        await TranscodingProvider(inner).transcribe_source(AudioSource.from_bytes(b"bad audio", "a.mp3"))
+
+        assert inner.sent == [("a.mp3", "application/octet-stream", b"bad audio")]
+
+    async def test_without_ffmpeg(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("PATH", str(tmp_path))
+        inner = RecordingProvider()
+        await TranscodingProvider(inner).transcribe_source(AudioSource.from_bytes(b"audio", "a.mp3"))
+
+        assert inner.sent[0][2] == b"audio"
+
+    async def test_stt_client_uploads_opus(self, fake_ffmpeg, stt_backend, monkeypatch):
+        from app.config import get_settings
+        from app.services.video.stt_client import STTClient
+
+        monkeypatch.setattr(get_settings(), "stt_transcode_enabled", True)
+        await STTClient().transcribe(b"abcd" * 1000, "talk.mp3")
+
+        body = stt_backend[0]["body"]
+        assert b'filename="talk.ogg"' in body
+        assert b"a" * 1000 in body and b"abcd" not in body
+
+
+def stream_of(*chunks: bytes, filename: str = "a.webm") -> AudioStream:
+    async def generate():
+        for chunk in chunks:
+            yield chunk
+
+    return AudioStream(generate(), None, filename)
+
+
+class TestTranscodingStream:
+    """Streams are piped through ffmpeg as they arrive"""
+
+    async def test_stream_transcoded(self, fake_ffmpeg):
+        inner = RecordingProvider()
+        await TranscodingProvider(inner).transcribe_stream(stream_of(b"abcd" * 500, b"abcd" * 500))
+
+        assert inner.sent == [("a.ogg", "audio/ogg", b"a" * 1000)]
+
+    async def test_undecodable_stream_fails(self, fake_ffmpeg):
+        with pytest.raises(AudioStreamError, match="Invalid data"):
+            await TranscodingProvider(RecordingProvider()).transcribe_stream(stream_of(b"bad audio"))
+
+    async def test_source_failure_reported(self, fake_ffmpeg):
+        async def broken():
+            yield b"abcd" * 100
+            raise AudioStreamError("connection reset")
+
+        with pytest.raises(AudioStreamError, match="connection reset"):
+            await TranscodingProvider(RecordingProvider()).transcribe_stream(AudioStream(broken(), None, "a.webm"))
+
+    async def test_stream_without_ffmpeg(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("PATH", str(tmp_path))
+        inner = RecordingProvider()
+        await TranscodingProvider(inner).transcribe_stream(stream_of(b"au", b"dio"))
+
+        assert inner.sent == [("a.webm", "application/octet-stream", b"audio")]
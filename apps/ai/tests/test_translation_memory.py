@@ -0,0 +1,132 @@
+"""Tests for the segment-level translation memory"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.shared.cache import TieredCache
+from app.services.shared.translation import TranslationStats, translate_segments
+from app.services.shared.translation_memory import (
+    TranslationMemory,
+    get_translation_memory,
+    make_memory_key,
+    normalize_text,
+)
+
+
+def _echo_create(calls: list[list[str]]):
+    """Fake completion translating each prompt segment to "T:<text>" and recording the batch"""
+    async def create(*args, **kwargs):
+        user_content = kwargs["messages"][-1]["content"]
+        items = json.loads(user_content.split("번역할 자막:\n", 1)[1])
+        calls.append([it["text"] for it in items])
+        content = json.dumps({"translations": [{"id": it["id"], "text": f"T:{it['text']}"} for it in items]})
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+    return create
+
+
+@pytest.fixture
+def echo_openai():
+    calls: list[list[str]] = []
+    with patch("app.services.shared.llm_service.get_openai_client") as mock:
+        mock.return_value.chat.completions.create = AsyncMock(side_effect=_echo_create(calls))
+        yield calls
+
+
+def _segments(texts: list[str]) -> list[dict]:
+    return [{"start": float(i), "end": float(i + 1), "text": t} for i, t in enumerate(texts)]
+
+
+class TestMemoryKey:
+    """Tests for normalization and key composition"""
+
+    def test_whitespace_and_unicode_form_normalized(self):
+        assert normalize_text("  Thanks \n for\twatching ") == "Thanks for watching"
+        assert normalize_text("cafe\u0301") == normalize_text("caf\u00e9")
+
+    def test_case_is_significant(self):
+        assert make_memory_key("Hello", "en", "ko") != make_memory_key("hello", "en", "ko")
+
+    def test_key_depends_on_languages_and_prompt_version(self):
+        key = make_memory_key("Hello", "en", "ko")
+        assert key == make_memory_key(" Hello ", "en", "ko")
+        assert key != make_memory_key("Hello", "en", "ja")
+        assert key != make_memory_key("Hello", "ko", "ko")
+        with patch("app.services.shared.translation_memory.TRANSLATION_PROMPT_VERSION", "v999"):
+            assert key != make_memory_key("Hello", "en", "ko")
+
+
+class TestTranslationMemory:
+    """Tests for lookup/store"""
+
+    async def test_store_then_lookup(self):
+        memory = TranslationMemory(TieredCache("translation_memory", 1024 * 1024), ttl=60)
+        await memory.store([("Hello", "안녕"), ("Bye", "잘가")], "en", "ko")
+
+        assert await memory.lookup(["Bye", "Nope", "Hello", "Hello"], "en", "ko") == ["잘가", None, "안녕", "안녕"]
+        assert await memory.lookup(["Hello"], "en", "ja") == [None]
+
+    async def test_sqlite_tier_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / "tm.db")
+        first = TranslationMemory(TieredCache("translation_memory", 1024, sqlite_path=path), ttl=60)
+        await first.store([("Thanks for watching", "시청해 주셔서 감사합니다")], "en", "ko")
+
+        second = TranslationMemory(TieredCache("translation_memory", 1024, sqlite_path=path), ttl=60)
+        assert await second.lookup(["Thanks for watching"], "en", "ko") == ["시청해 주셔서 감사합니다"]
+
+
+class TestTranslateSegmentsWithMemory:
+    """translate_segments only sends memory misses to the LLM"""
+
+    async def test_second_request_served_from_memory(self, echo_openai):
+        await translate_segments(_segments(["Intro", "Line A"]))
+        stats = TranslationStats()
+        result = await translate_segments(_segments(["Intro", "Line B"]), stats=stats)
+
+        assert echo_openai == [["Intro", "Line A"], ["Line B"]]
+        assert [s["translated_text"] for s in result] == ["T:Intro", "T:Line B"]
+        assert (stats.memory_hits, stats.memory_misses) == (1, 1)
+        assert stats.memory_hit_rate == 0.5
+
+    async def test_full_hit_makes_no_llm_call(self, echo_openai):
+        await translate_segments(_segments(["Hello", "World"]))
+        stats = TranslationStats()
+        result = await translate_segments(_segments(["Hello ", "World"]), stats=stats)
+
+        assert len(echo_openai) == 1
+        assert [s["original_text"] for s in result] == ["Hello ", "World"]
+        assert stats.memory_hits == 2
+
+    async def test_fallback_to_source_text_not_remembered(self):
+        response = MagicMock(choices=[MagicMock(message=MagicMock(content='{"translations": []}'))])
+        with patch("app.services.shared.llm_service.get_openai_client") as mock:
+            mock.return_value.chat.completions.create = AsyncMock(return_value=response)
+            await translate_segments(_segments(["Untranslated"]))
+
+        assert await get_translation_memory().lookup(["Untranslated"], "en", "ko") == [None]
+
+    async def test_disabled_memory(self, echo_openai):
+        with patch("app.services.shared.translation_memory.get_settings") as settings:
+            settings.return_value.translation_memory_enabled = False
+            await translate_segments(_segments(["Hello"]))
+            stats = TranslationStats()
+            await translate_segments(_segments(["Hello"]), stats=stats)
+
+        assert stats.memory_hits == 0
+        # The second call is still served by the LLM response cache
+        assert len(echo_openai) == 1
+
+
+class TestTranslateEndpointMeta:
+    """Memory counters are reported in TranslationMeta"""
+
+    def test_meta_reports_memory_hits(self, client, echo_openai):
+        body = {"segments": [{"start": 0.0, "end": 1.0, "text": "Hello"}, {"start": 1.0, "end": 2.0, "text": "Again"}]}
+        client.post("/api/v1/translate", json=body)
+        body["segments"][1]["text"] = "Something new"
+        meta = client.post("/api/v1/translate", json=body).json()["meta"]
+
+        assert meta["memoryHits"] == 1
+        assert meta["memoryMisses"] == 1
+        assert meta["memoryHitRate"] == 0.5
@@ -0,0 +1,117 @@
+"""Tests for the pre-translation dedupe / fragment merging pass"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.shared.translation import TranslationStats, translate_segments
+from app.services.shared.translation_units import build_units, split_translation
+
+
+def _segments(texts: list[str], gap: float = 0.0) -> list[dict]:
+    return [{"start": i * (1 + gap), "end": i * (1 + gap) + 1, "text": t} for i, t in enumerate(texts)]
+
+
+class TestBuildUnits:
+    """Grouping and dedupe"""
+
+    def test_identical_texts_share_a_unit(self):
+        units = build_units(_segments(["Thank you.", "Hi", "thank you.", " Thank  you. "]))
+
+        assert [u["text"] for u in units.units] == ["Thank you.", "Hi", "thank you."]
+        assert [units.unit_of(i) for i in range(4)] == [0, 1, 2, 0]
+        assert (units.merged, units.duplicates) == (0, 1)
+
+    def test_fragments_merged_until_sentence_end(self):
+        units = build_units(
+            _segments(["So I went", "to the store", "yesterday.", "It was \"closed.\"", "Then"]),
+            merge=True,
+        )
+
+        assert units.groups == [[0, 1, 2], [3], [4]]
+        assert units.units[0] == {"start": 0.0, "end": 3.0, "text": "So I went to the store yesterday."}
+        assert units.merged == 2
+
+    def test_merge_stops_at_pause_and_length(self):
+        assert build_units(_segments(["a", "b", "c"], gap=2.0), merge=True, max_gap=1.0).groups == [[0], [1], [2]]
+        assert build_units(_segments(["aaaa", "bbbb", "cccc"]), merge=True, max_chars=9).groups == [[0, 1], [2]]
+
+    def test_merged_repeats_deduped(self):
+        units = build_units(_segments(["Thank", "you.", "Thank you."]), merge=True)
+
+        assert units.groups == [[0, 1], [2]]
+        assert units.group_unit == [0, 0]
+
+
+class TestSplitTranslation:
+    """Redistribution over the original segments"""
+
+    def test_split_on_words_proportionally(self):
+        assert split_translation("나는 어제 가게에 갔는데 문이 닫혀 있었다", [10, 30]) == [
+            "나는 어제",
+            "가게에 갔는데 문이 닫혀 있었다",
+        ]
+
+    def test_split_on_characters_without_spaces(self):
+        parts = split_translation("私は今日学校に行きました", [1, 1, 1])
+        assert "".join(parts) == "私は今日学校に行きました"
+        assert all(parts)
+
+    @pytest.mark.parametrize("text,weights", [("하나", [1, 1, 1]), ("", [2, 3]), ("one two", [0, 0])])
+    def test_every_part_returned(self, text, weights):
+        parts = split_translation(text, weights)
+        assert len(parts) == len(weights)
+        assert "".join(parts).replace(" ", "") == text.replace(" ", "")
+
+
+def _echo_create(calls: list[list[str]]):
+    async def create(*args, **kwargs):
+        items = json.loads(kwargs["messages"][-1]["content"].split("번역할 자막:\n", 1)[1])
+        calls.append([it["text"] for it in items])
+        content = json.dumps({"translations": [{"id": it["id"], "text": f"T {it['text']}"} for it in items]})
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+    return create
+
+
+class TestTranslateSegmentsPrePass:
+    """translate_segments sends units, returns one output per input segment"""
+
+    async def test_repeats_translated_once(self):
+        calls: list[list[str]] = []
+        stats = TranslationStats()
+        with patch("app.services.shared.llm_service.get_openai_client") as mock:
+            mock.return_value.chat.completions.create = AsyncMock(side_effect=_echo_create(calls))
+            result = await translate_segments(_segments(["Yeah.", "OK", "Yeah.", "Yeah."]), stats=stats)
+
+        assert calls == [["Yeah.", "OK"]]
+        assert [s["translated_text"] for s in result] == ["T Yeah.", "T OK", "T Yeah.", "T Yeah."]
+        assert [s["start"] for s in result] == [0.0, 1.0, 2.0, 3.0]
+        assert (stats.units, stats.duplicates) == (2, 2)
+
+    async def test_merged_sentence_spread_over_timings(self):
+        calls: list[list[str]] = []
+        segments = _segments(["So I went", "to the store.", "Bye."])
+        with patch("app.services.shared.llm_service.get_openai_client") as mock:
+            mock.return_value.chat.completions.create = AsyncMock(side_effect=_echo_create(calls))
+            result = await translate_segments(segments, merge_fragments=True)
+
+        assert calls == [["So I went to the store.", "Bye."]]
+        assert [(s["start"], s["end"], s["original_text"]) for s in result] == [
+            (seg["start"], seg["end"], seg["text"]) for seg in segments
+        ]
+        assert " ".join(s["translated_text"] for s in result[:2]) == "T So I went to the store."
+        assert all(s["translated_text"] for s in result)
+
+    def test_endpoint_reports_units(self, client):
+        body = {
+            "segments": _segments(["Hello", "there.", "Hello there."]),
+            "mergeFragments": True,
+        }
+        with patch("app.services.shared.llm_service.get_openai_client") as mock:
+            mock.return_value.chat.completions.create = AsyncMock(side_effect=_echo_create([]))
+            response = client.post("/api/v1/translate", json=body)
+
+        meta = response.json()["meta"]
+        assert (meta["unitCount"], meta["mergedCount"], meta["duplicateCount"]) == (1, 1, 1)
+        assert len(response.json()["data"]["segments"]) == 3
@@ -0,0 +1,138 @@
+"""Tests for the compact translation wire format"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.shared.llm_service import BaseLLMService, LLMConfig
+from app.services.shared.translation import translate_batch
+from app.services.shared.translation_wire import (
+    CompactFormatError,
+    ReplyIssues,
+    encode_compact,
+    parse_compact,
+    parse_json_translations,
+)
+
+
+def _reply(content: str) -> MagicMock:
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+
+def _segments(texts: list[str]) -> list[dict]:
+    return [{"start": float(i), "end": float(i + 1), "text": t} for i, t in enumerate(texts)]
+
+
+class TestCompactCodec:
+    """Encoding and tolerant parsing"""
+
+    def test_encode_one_line_per_segment(self):
+        assert encode_compact(["Hello", "two\nlines"]) == "0|Hello\n1|two lines"
+
+    def test_parse_exact(self):
+        assert parse_compact("0|안녕\n1|세상", 2) == {0: "안녕", 1: "세상"}
+
+    def test_parse_tolerates_fences_spacing_and_separators(self):
+        reply = "```\n0 | 하나\n\n[1] 둘\n2: 셋\n3. 넷\n4) 다섯\n```"
+        assert parse_compact(reply, 5) == {0: "하나", 1: "둘", 2: "셋", 3: "넷", 4: "다섯"}
+
+    def test_wrapped_line_continues_previous_entry(self):
+        assert parse_compact("0|긴 문장이\n줄바꿈됨\n1|짧음", 2) == {0: "긴 문장이 줄바꿈됨", 1: "짧음"}
+
+    def test_text_may_contain_separators(self):
+        assert parse_compact("0|3.5% | 증가", 1) == {0: "3.5% | 증가"}
+
+    def test_out_of_range_and_repeated_ids_dropped(self):
+        assert parse_compact("0|a\n7|x\n0|again\n1|b", 2) == {0: "a", 1: "b"}
+
+    def test_json_reply_accepted(self):
+        assert parse_compact('{"translations": [{"id": 0, "text": "안녕"}]}', 1) == {0: "안녕"}
+
+    def test_unreadable_reply_raises(self):
+        with pytest.raises(CompactFormatError):
+            parse_compact("Sorry, I can't help with that.", 2)
+        with pytest.raises(CompactFormatError):
+            parse_compact('{"translations": [', 2)
+
+    def test_parse_json_translations_reports_bad_items(self):
+        result = {"translations": [
+            {"id": 0, "text": "a"}, {"id": "1", "text": "b"}, {"text": "c"},
+            {"id": 5, "text": "d"}, {"id": 0, "text": "again"}, "junk",
+        ]}
+        issues = ReplyIssues()
+
+        assert parse_json_translations(result, 2, issues) == {0: "a", 1: "b"}
+        assert issues.duplicate_ids == [0]
+        assert issues.out_of_range_ids == [5]
+        assert issues.malformed_items == 2
+
+    def test_parse_compact_reports_bad_ids(self):
+        issues = ReplyIssues()
+        parse_compact("0|a\n7|x\n0|again", 2, issues)
+        assert (issues.duplicate_ids, issues.out_of_range_ids) == ([0], [7])
+
+
+class TestTranslateBatchCompact:
+    """translate_batch with the compact wire format"""
+
+    def _llm(self, client):
+        return BaseLLMService(default_config=LLMConfig(model="gpt-4o-mini", cache_ttl=60), client=client)
+
+    async def test_compact_round_trip(self):
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=_reply("0|안녕\n1|세상"))
+
+        result = await translate_batch(self._llm(client), _segments(["Hello", "World"]), "en", "ko", "Before", "compact")
+
+        assert result == ["안녕", "세상"]
+        kwargs = client.chat.completions.create.call_args.kwargs
+        assert "response_format" not in kwargs
+        assert kwargs["messages"][-1]["content"] == '이전 문맥: "Before"\n\n번역할 자막:\n0|Hello\n1|World'
+
+    async def test_missing_line_falls_back_to_original(self):
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=_reply("1|세상"))
+
+        result = await translate_batch(self._llm(client), _segments(["Hello", "World"]), "en", "ko", wire_format="compact")
+        assert result == ["Hello", "세상"]
+
+    async def test_unreadable_reply_retried_with_json_and_not_cached(self):
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=[
+            _reply("I cannot do that"),
+            _reply('{"translations": [{"id": 0, "text": "안녕"}]}'),
+            _reply("0|안녕"),
+        ])
+        llm = self._llm(client)
+
+        assert await translate_batch(llm, _segments(["Hello"]), "en", "ko", wire_format="compact") == ["안녕"]
+        assert client.chat.completions.create.call_args_list[1].kwargs["response_format"] == {"type": "json_object"}
+
+        # The unreadable compact reply was not cached, so compact is asked again
+        assert await translate_batch(llm, _segments(["Hello"]), "en", "ko", wire_format="compact") == ["안녕"]
+        assert client.chat.completions.create.await_count == 3
+
+
+class TestTranslateEndpointWireFormat:
+    """wireFormat is selectable per request"""
+
+    def test_compact_request(self, client):
+        with patch("app.services.shared.llm_service.get_openai_client") as mock:
+            mock.return_value.chat.completions.create = AsyncMock(return_value=_reply("0|안녕\n1|세상"))
+            response = client.post(
+                "/api/v1/translate",
+                json={
+                    "segments": [{"start": 0.0, "end": 1.0, "text": "Hello"}, {"start": 1.0, "end": 2.0, "text": "World"}],
+                    "wireFormat": "compact",
+                },
+            )
+
+        assert response.status_code == 200
+        assert [s["translatedText"] for s in response.json()["data"]["segments"]] == ["안녕", "세상"]
+
+    def test_unknown_format_rejected(self, client):
+        response = client.post(
+            "/api/v1/translate",
+            json={"segments": [{"start": 0.0, "end": 1.0, "text": "Hello"}], "wireFormat": "xml"},
+        )
+        assert response.status_code == 422
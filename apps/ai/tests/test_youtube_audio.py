@@ -0,0 +1,140 @@
+"""Tests for the yt-dlp download path and its extraction cache"""
+
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+import yt_dlp
+
+from app.config import get_settings
+from app.services.video.youtube_audio import YouTubeAudioDownloader
+from app.services.video.youtube_info_cache import YouTubeInfoCache, get_youtube_info_cache
+
+
+class FakeYouTube:
+    """Stands in for YouTube behind the real YoutubeDL; counts the work done"""
+
+    def __init__(self, duration: int = 60):
+        self.duration = duration
+        self.extractions: list[tuple] = []
+        self.downloads: list[dict] = []
+        self.instances: set[int] = set()
+        self.fail_download = False
+        self.private = False
+
+    def extract_info(self, ydl, url, download=True, process=True):
+        self.instances.add(id(ydl))
+        self.extractions.append((url, download, process))
+        if self.private:
+            # As YoutubeDL reports an expected extractor error
+            try:
+                raise yt_dlp.utils.ExtractorError("Private video", expected=True)
+            except yt_dlp.utils.ExtractorError:
+                raise yt_dlp.utils.DownloadError("ERROR: Private video", sys.exc_info())
+        return {"id": url[-11:], "duration": self.duration, "formats": [{"format_id": "140", "ext": "m4a"}]}
+
+    def process_ie_result(self, ydl, info, download=True):
+        self.instances.add(id(ydl))
+        if self.fail_download:
+            raise yt_dlp.utils.DownloadError("HTTP Error 403: Forbidden")
+        self.downloads.append(dict(info))
+        info["requested_formats"] = ["mutated"]
+        path = ydl.params["outtmpl"]["default"].replace("%(ext)s", "m4a")
+        with open(path, "wb") as f:
+            f.write(b"audio-bytes")
+        return info
+
+
+@pytest.fixture
+def youtube():
+    fake = FakeYouTube()
+    with patch.object(yt_dlp.YoutubeDL, "extract_info", autospec=True, side_effect=fake.extract_info), \
+            patch.object(yt_dlp.YoutubeDL, "process_ie_result", autospec=True, side_effect=fake.process_ie_result):
+        yield fake
+
+
+class TestDownloadAudio:
+    """One extraction per video, processed for download"""
+
+    async def test_single_extraction_reused_for_download(self, youtube):
+        audio, duration = await YouTubeAudioDownloader().download_audio("dQw4w9WgXcQ")
+
+        assert audio == b"audio-bytes"
+        assert duration == 60
+        assert youtube.extractions == [("https://www.youtube.com/watch?v=dQw4w9WgXcQ", False, False)]
+        assert len(youtube.downloads) == 1
+        # Both phases on the same YoutubeDL instance
+        assert len(youtube.instances) == 1
+
+    async def test_extraction_cached_per_video(self, youtube):
+        downloader = YouTubeAudioDownloader()
+        await downloader.download_audio("dQw4w9WgXcQ")
+        audio, _ = await downloader.download_audio("dQw4w9WgXcQ")
+        await downloader.download_audio("9bZkp7q19f0")
+
+        assert audio == b"audio-bytes"
+        assert len(youtube.extractions) == 2
+        assert len(youtube.downloads) == 3
+        # yt-dlp's changes to the info dict don't leak into the cache
+        assert "requested_formats" not in youtube.downloads[1]
+        assert get_youtube_info_cache().snapshot()["hits"] == 1
+
+    async def test_too_long_not_downloaded(self, youtube):
+        youtube.duration = 10 * 3600
+
+        audio, duration = await YouTubeAudioDownloader().download_audio("dQw4w9WgXcQ")
+
+        assert audio is None
+        assert duration == 10 * 3600
+        assert youtube.downloads == []
+
+    async def test_failed_download_drops_cached_info(self, youtube, monkeypatch):
+        monkeypatch.setattr(get_settings(), "retry_max_attempts", 1)
+        youtube.fail_download = True
+        downloader = YouTubeAudioDownloader()
+
+        assert await downloader.download_audio("dQw4w9WgXcQ") == (None, None)
+        await downloader.download_audio("dQw4w9WgXcQ")
+
+        assert len(youtube.extractions) == 2
+
+    async def test_transient_failure_retried(self, youtube, monkeypatch):
+        monkeypatch.setattr(get_settings(), "retry_base_delay", 0.0)
+        youtube.fail_download = True
+        downloader = YouTubeAudioDownloader()
+
+        assert await downloader.download_audio("dQw4w9WgXcQ") == (None, None)
+
+        # Extracted afresh for each of the 3 attempts (the cached media URLs may be what failed)
+        assert len(youtube.extractions) == 3
+        assert downloader.last_failure_permanent is False
+
+    async def test_permanent_failure_not_retried(self, youtube):
+        youtube.private = True
+        downloader = YouTubeAudioDownloader()
+
+        assert await downloader.download_audio("dQw4w9WgXcQ") == (None, None)
+
+        assert len(youtube.extractions) == 1
+        assert downloader.last_failure_permanent is True
+
+
+class TestYouTubeInfoCache:
+    def test_expired_entry_dropped(self):
+        cache = YouTubeInfoCache(max_entries=4, ttl=60)
+        cache.set("a", {"id": "a"})
+
+        with patch("app.services.video.youtube_info_cache.time.time", return_value=time.time() + 120):
+            assert cache.get("a") is None
+
+        assert cache.snapshot()["expirations"] == 1
+
+    def test_oldest_entry_evicted(self):
+        cache = YouTubeInfoCache(max_entries=2, ttl=60)
+        for video_id in ("a", "b", "c"):
+            cache.set(video_id, {"id": video_id})
+
+        assert cache.get("a") is None
+        assert cache.get("c") == {"id": "c"}
+        assert cache.snapshot()["evictions"] == 1
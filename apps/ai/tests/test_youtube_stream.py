@@ -0,0 +1,195 @@
+"""Tests for streaming YouTube audio into the STT upload"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import yt_dlp
+
+from app.config import get_settings
+from app.services.shared.stt import AudioStreamError
+from app.services.video import youtube_stream
+from app.services.video.youtube_stream import open_media_stream
+
+MEDIA_URL = "https://media.example/videoplayback?id=abc"
+AUDIO = bytes(range(256)) * 12 * 1024  # 3MB
+
+
+class MediaServer:
+    """Stand-in media host answering range requests"""
+
+    def __init__(self, data: bytes = AUDIO):
+        self.data = data
+        self.ranges: list[str] = []
+        self.served = 0
+        self.honour_ranges = True
+        self.fail_from = None  # Byte offset from which requests get 500
+        self.report_total = True
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        header = request.headers.get("range", "")
+        self.ranges.append(header)
+        if not (self.honour_ranges and header):
+            self.served += len(self.data)
+            return httpx.Response(200, content=self.data)
+        start, end = (int(x) for x in header.removeprefix("bytes=").split("-"))
+        if self.fail_from is not None and start >= self.fail_from:
+            return httpx.Response(500)
+        part = self.data[start:end + 1]
+        self.served += len(part)
+        return httpx.Response(
+            206,
+            content=part,
+            headers={
+                "Content-Range": f"bytes {start}-{start + len(part) - 1}/{len(self.data) if self.report_total else '*'}"
+            },
+        )
+
+
+@pytest.fixture
+def media(monkeypatch):
+    server = MediaServer()
+    monkeypatch.setattr(
+        youtube_stream,
+        "_build_media_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(server.handler)),
+    )
+    return server
+
+
+async def read_all(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream.iter_chunks()])
+
+
+class TestMediaStream:
+    """Range requests, bounded read-ahead"""
+
+    async def test_read_in_ranges(self, media):
+        stream = await open_media_stream(MEDIA_URL, {"User-Agent": "x"}, "abc.m4a", "audio/mp4", range_bytes=1024 * 1024)
+        try:
+            assert stream.size == len(AUDIO)
+            assert await read_all(stream) == AUDIO
+        finally:
+            await stream.aclose()
+
+        assert media.ranges == ["bytes=0-1048575", "bytes=1048576-2097151", "bytes=2097152-3145727"]
+
+    async def test_read_ahead_bounded(self, media):
+        buffer_bytes = range_bytes = 256 * 1024
+        stream = await open_media_stream(
+            MEDIA_URL, {}, "abc.m4a", "audio/mp4", range_bytes=range_bytes, buffer_bytes=buffer_bytes
+        )
+        try:
+            await asyncio.sleep(0.1)
+            # The buffer, the chunk waiting to be queued and the rest of its response
+            assert media.served <= buffer_bytes + 2 * range_bytes
+            assert await read_all(stream) == AUDIO
+        finally:
+            await stream.aclose()
+
+    async def test_server_ignoring_ranges(self, media):
+        media.honour_ranges = False
+        stream = await open_media_stream(MEDIA_URL, {}, "abc.m4a", "audio/mp4", range_bytes=1024 * 1024)
+        try:
+            assert stream.size == len(AUDIO)
+            assert await read_all(stream) == AUDIO
+        finally:
+            await stream.aclose()
+
+        assert len(media.ranges) == 1
+
+    async def test_partial_response_without_total_rejected(self, media):
+        media.report_total = False
+
+        # Reading on would silently stop after the first range
+        with pytest.raises(AudioStreamError, match="total size"):
+            await open_media_stream(MEDIA_URL, {}, "abc.m4a", "audio/mp4", range_bytes=1024 * 1024)
+
+    async def test_failure_mid_stream(self, media):
+        media.fail_from = 1024 * 1024
+        stream = await open_media_stream(MEDIA_URL, {}, "abc.m4a", "audio/mp4", range_bytes=1024 * 1024)
+        try:
+            with pytest.raises(AudioStreamError, match="500"):
+                await read_all(stream)
+        finally:
+            await stream.aclose()
+
+    async def test_first_request_failure_raised(self, media):
+        media.fail_from = 0
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await open_media_stream(MEDIA_URL, {}, "abc.m4a", "audio/mp4")
+
+
+class FakeYouTube:
+    """yt-dlp's network side: extraction and format selection without download"""
+
+    def __init__(self, protocol: str = "https"):
+        self.protocol = protocol
+        self.extractions = 0
+
+    def extract_info(self, ydl, url, download=True, process=True):
+        self.extractions += 1
+        return {"id": url[-11:], "duration": 60, "formats": []}
+
+    def process_ie_result(self, ydl, info, download=True):
+        assert download is False, "streaming must not download through yt-dlp"
+        return {
+            **info,
+            "url": MEDIA_URL,
+            "protocol": self.protocol,
+            "ext": "m4a",
+            "format_id": "140",
+            "http_headers": {"User-Agent": "yt-dlp"},
+        }
+
+
+@pytest.fixture
+def streaming(monkeypatch, media):
+    monkeypatch.setattr(get_settings(), "youtube_stream_enabled", True)
+    monkeypatch.setattr(get_settings(), "youtube_stream_range_bytes", 1024 * 1024)
+    fake = FakeYouTube()
+    with patch.object(yt_dlp.YoutubeDL, "extract_info", autospec=True, side_effect=fake.extract_info), \
+            patch.object(yt_dlp.YoutubeDL, "process_ie_result", autospec=True, side_effect=fake.process_ie_result):
+        yield fake
+
+
+DOWNLOAD = "app.services.video.youtube_audio.YouTubeAudioDownloader.download_audio"
+
+
+class TestVideoStreaming:
+    """/stt/video with YOUTUBE_STREAM_ENABLED"""
+
+    async def test_audio_streamed_to_stt(self, async_client, streaming, media, stt_backend):
+        with patch(DOWNLOAD, new_callable=AsyncMock) as download:
+            response = await async_client.post("/stt/video/dQw4w9WgXcQ")
+
+        assert response.status_code == 200
+        assert response.json()["text"] == "hello"
+        download.assert_not_awaited()
+        upload = stt_backend[0]
+        assert AUDIO in upload["body"]
+        assert b'filename="dQw4w9WgXcQ.m4a"' in upload["body"]
+        assert int(upload["headers"]["content-length"]) == len(upload["body"])
+
+    async def test_failure_mid_stream(self, async_client, streaming, media, stt_backend):
+        media.fail_from = 1024 * 1024
+
+        response = await async_client.post("/stt/video/dQw4w9WgXcQ")
+
+        assert response.status_code == 400
+        assert response.json()["error"] == "STT_ERROR"
+        # Not remembered as a failed video: the next request tries again
+        media.fail_from = None
+        assert (await async_client.post("/stt/video/dQw4w9WgXcQ")).status_code == 200
+
+    async def test_manifest_formats_downloaded_instead(self, async_client, streaming, stt_backend):
+        streaming.protocol = "m3u8_native"
+
+        with patch(DOWNLOAD, new_callable=AsyncMock, return_value=(b"downloaded", 60)) as download:
+            response = await async_client.post("/stt/video/dQw4w9WgXcQ")
+
+        assert response.status_code == 200
+        download.assert_awaited_once()
+        assert b"downloaded" in stt_backend[0]["body"]